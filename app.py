@@ -8,7 +8,11 @@ from network_generator import (
     criar_grafo_barabasi_albert,
     criar_grafo_watts_strogatz
 )
+from roteamento import PROTOCOLOS
+from metricas_estruturais import TODAS
+from remocao_incremental import remover_no
 from simulation import executar_simulacao
+from topologia import Topologia
 from visualization import plotar_rede, plotar_metricas, plotar_comparacao_betweenness, plotar_metricas_interativo, plotar_comparacao_betweenness_interativo, plotar_rede_com_pontos_criticos
 
 st.set_page_config(layout="wide", page_title="Simulador RSSF")
@@ -19,29 +23,32 @@ if 'performance_mode' not in st.session_state:
 
 st.title("Simulador de Roteamento em Redes Complexas")
 
+# Métricas estruturais exibidas no dashboard (a centralidade de autovetor não é usada)
+METRICAS_DO_APP = tuple(nome for nome in TODAS if nome != 'centralidade_de_autovetor')
+# Tempo máximo (s) de cada cálculo de conectividade; se acabar, o painel mostra "≥k"
+ORCAMENTO_CONECTIVIDADE_DO_APP = 5.0
+
 # --- Funções Auxiliares ---
-@st.cache_data(ttl=300)  # Cache por 5 minutos
-def calcular_metricas_cached(grafo_edges, grafo_nodes, tempo_simulacao):
-    """Função auxiliar para cache das métricas computacionalmente caras."""
-    import networkx as nx
-    # Recriar o grafo a partir dos dados
-    G = nx.Graph()
-    G.add_edges_from(grafo_edges)
-    for node, data in grafo_nodes:
-        G.add_node(node, **data)
-    
-    return executar_simulacao(G, tempo_simulacao)
+def rodar_simulacao(G, tempo_simulacao, protocolo='inundacao', topologia=None):
+    """
+    Executa a simulação e armazena os resultados no estado da sessão.
 
-def rodar_simulacao(G, tempo_simulacao):
-    """Executa a simulação e armazena os resultados no estado da sessão."""
+    A Topologia fica na sessão junto com o grafo: as métricas estruturais
+    ficam memorizadas nela, e remoções de nós partem delas (ver remocao_incremental.py).
+    """
     with st.spinner("Executando a simulação..."):
-        # Converter grafo para formato serializável para cache
-        grafo_edges = list(G.edges())
-        grafo_nodes = [(node, data) for node, data in G.nodes(data=True)]
-        
-        metricas = calcular_metricas_cached(grafo_edges, grafo_nodes, tempo_simulacao)
+        if topologia is None:
+            topologia = Topologia.de_grafo(G)
+        # Com "Métricas Aproximadas" marcado, as métricas de caminhos mínimos são estimadas
+        # (o limite de nós do app fica abaixo de LIMIAR_APROXIMACAO, então 'auto' nunca ligaria)
+        aproximacao = True if st.session_state.get('metricas_aproximadas') else None
+        metricas = executar_simulacao(topologia, tempo_simulacao, protocolo=protocolo,
+                                      metricas_estruturais=METRICAS_DO_APP, aproximacao=aproximacao,
+                                      orcamento_conectividade=ORCAMENTO_CONECTIVIDADE_DO_APP,
+                                      perfil=st.session_state.get('perfil', False))
         st.session_state['resultados'] = {
             'G': G,
+            'topologia': topologia,
             'metricas': metricas
         }
 
@@ -53,15 +60,18 @@ with st.sidebar.expander("⚙️ Configurações de Performance"):
     performance_mode = st.checkbox("Modo Performance", value=st.session_state.get('performance_mode', True),
                                  help="Reduz complexidade dos gráficos para melhor performance")
     st.session_state['performance_mode'] = performance_mode
+    st.session_state['perfil'] = st.checkbox("Perfil de Execução", value=st.session_state.get('perfil', False),
+                                             help="Mede o tempo e as alocações de cada fase da simulação")
     
     if performance_mode:
         st.info("✅ Gráficos otimizados ativos")
     else:
         st.warning("⚠️ Modo completo pode ser mais lento")
     
-    if st.button("🔄 Limpar Cache"):
-        st.cache_data.clear()
-        st.success("Cache limpo! Recarregue a página se necessário.")
+    if st.button("🔄 Limpar Cache", help="Descarta as métricas estruturais memorizadas na topologia atual"):
+        if 'resultados' in st.session_state:
+            st.session_state['resultados']['topologia']._metricas_estruturais = None  # Ver metricas_de
+        st.success("Cache limpo! As métricas serão recalculadas na próxima simulação.")
 
 tipo_rede_map = {
     "RSSF (Proximidade)": "rssf",
@@ -80,6 +90,16 @@ num_nos = st.sidebar.slider("Número de Nós", 5, 500, 100)
 tam_area = st.sidebar.slider("Tamanho da Área", 50, 200, 100)
 num_estacoes_base = st.sidebar.slider("Número de Estações Base", 0, 10, 1)
 tempo_simulacao = st.sidebar.slider("Tempo de Simulação", 0, 500, 100)
+protocolo = st.sidebar.selectbox(
+    "Protocolo de Roteamento",
+    options=list(PROTOCOLOS.keys()),
+    format_func=PROTOCOLOS.get,
+    help="A inundação transmite por todas as arestas; os demais seguem tabelas de próximo salto"
+)
+st.sidebar.checkbox(
+    "Métricas Aproximadas", key='metricas_aproximadas',
+    help="Estima intermediação, proximidade, diâmetro e distância média por amostragem, com limites de erro"
+)
 
 params = {}
 
@@ -109,7 +129,7 @@ if st.sidebar.button("Iniciar Nova Simulação"):
         elif tipo_rede == 'watts_strogatz':
             G = criar_grafo_watts_strogatz(num_nos, params['k_vizinhos'], params['p_reconectar'], tam_area, num_estacoes_base)
 
-        rodar_simulacao(G, tempo_simulacao)
+        rodar_simulacao(G, tempo_simulacao, protocolo)
         st.session_state['no_selecionado'] = None # Limpa a seleção de nó
 
 # --- Exibição dos Resultados ---
@@ -173,10 +193,12 @@ if 'resultados' in st.session_state:
         if metricas.get('pacotes_gerados', 0) > 0:
             taxa_entrega = (metricas.get('pacotes_entregues', 0) / metricas['pacotes_gerados']) * 100
             st.metric("Taxa de Entrega", f"{taxa_entrega:.2f}%")
-            latencia_media = sum(metricas.get('latencias', [0])) / len(metricas.get('latencias', [1]))
-            st.metric("Latência Média", f"{latencia_media:.2f}s")
-            saltos_medios = sum(metricas.get('contagens_de_saltos', [0])) / len(metricas.get('contagens_de_saltos', [1]))
-            st.metric("Média de Saltos", f"{saltos_medios:.2f}")
+            latencia = metricas['latencias'].resumo()
+            st.metric("Latência Média", f"{latencia['media']:.2f}s",
+                      help=f"p50 {latencia['p50']:.2f}s · p95 {latencia['p95']:.2f}s · p99 {latencia['p99']:.2f}s")
+            saltos = metricas['contagens_de_saltos'].resumo()
+            st.metric("Média de Saltos", f"{saltos['media']:.2f}",
+                      help=f"p50 {saltos['p50']} · p95 {saltos['p95']} · p99 {saltos['p99']}")
         else:
             st.info("A simulação de pacotes não foi executada.")
         
@@ -187,9 +209,15 @@ if 'resultados' in st.session_state:
         with col_m1:
             st.metric("Ordem (Nós)", f"{metricas.get('ordem', 'N/A')}")
             st.metric("Tamanho (Arestas)", f"{metricas.get('tamanho', 'N/A')}")
+        erros = metricas.get('erros_aproximacao')
         with col_m2:
-            st.metric("Diâmetro da Rede", f"{metricas.get('diametro_rede', 'N/A')}")
-            if metricas.get('distancia_media'):
+            if erros and erros['diametro_rede']:
+                st.metric("Diâmetro da Rede", f"{metricas['diametro_rede']}–{metricas['diametro_rede'] + erros['diametro_rede']}")
+            else:
+                st.metric("Diâmetro da Rede", f"{metricas.get('diametro_rede', 'N/A')}")
+            if metricas.get('distancia_media') and erros:
+                st.metric("Distância Média", f"{metricas['distancia_media']:.2f} ± {erros['distancia_media']:.2f}")
+            elif metricas.get('distancia_media'):
                 st.metric("Distância Média", f"{metricas.get('distancia_media', 'N/A'):.2f}")
             else:
                 st.metric("Distância Média", "N/A")
@@ -202,6 +230,10 @@ if 'resultados' in st.session_state:
                 st.metric("Assortatividade", f"{metricas.get('assortatividade', 0):.3f}")
             else:
                 st.metric("Assortatividade", "N/A")
+        if erros:
+            st.caption(f"Métricas de caminhos mínimos estimadas com {erros['pivos']} pivôs "
+                       f"(confiança {erros['confianca']:.0%}): intermediação ±{erros['centralidade_de_intermediacao']:.4f}, "
+                       f"proximidade ±{erros['centralidade_de_proximidade']:.4f}.")
         
         # Métricas de comunidade
         col_m4, col_m5 = st.columns(2)
@@ -217,8 +249,14 @@ if 'resultados' in st.session_state:
         st.subheader("Métricas de Robustez")
         col_r1, col_r2, col_r3 = st.columns(3)
         with col_r1:
-            st.metric("Edge Connectivity", f"{metricas.get('edge_connectivity', 'N/A')}")
-            st.metric("Node Connectivity", f"{metricas.get('node_connectivity', 'N/A')}")
+            limites = metricas.get('limites_conectividade', {})
+            for nome, rotulo in (('edge_connectivity', "Edge Connectivity"), ('node_connectivity', "Node Connectivity")):
+                inferior, superior = limites.get(nome, (None, None))
+                if inferior is not None and inferior < superior:
+                    # Orçamento esgotado: só o limite inferior é garantido
+                    st.metric(rotulo, f"≥{inferior}", help=f"Cálculo interrompido; no máximo {superior}")
+                else:
+                    st.metric(rotulo, f"{metricas.get(nome, 'N/A')}")
         with col_r2:
             st.metric("Pontos de Articulação", f"{metricas.get('numero_pontos_articulacao', 'N/A')}")
             st.metric("Pontes Críticas", f"{metricas.get('numero_pontes', 'N/A')}")
@@ -318,6 +356,20 @@ if 'resultados' in st.session_state:
             - **Deployment**: Evitar topologias com muitos pontos críticos
             - **Manutenção**: Priorizar reparo de nós/enlaces críticos
             """)
+
+        if 'perfil' in metricas:
+            with st.expander("⏱️ Perfil de Execução"):
+                perfil = metricas['perfil']
+                st.metric("Tempo Total", f"{perfil['segundos_total']:.3f}s")
+                if 'eventos' in perfil:
+                    st.metric("Eventos por Segundo", f"{perfil['eventos_por_segundo']:,.0f}",
+                              help=f"{perfil['eventos']} eventos · pico de {perfil['pico_pacotes_em_transito']} "
+                                   f"pacotes em trânsito")
+                    st.caption(" · ".join(f"{nome}: {contagem}" for nome, contagem in perfil['processos'].items()))
+                fases = pd.DataFrame([{'Fase': nome, 'Segundos': fase['segundos'], 'Blocos Alocados': fase['blocos_alocados'],
+                                       'Memorizada': fase.get('memorizada', False)}
+                                      for nome, fase in perfil['fases'].items()])
+                st.dataframe(fases.sort_values('Segundos', ascending=False), hide_index=True)
         
 
         # --- Interatividade com o Grafo ---
@@ -378,10 +430,12 @@ if 'resultados' in st.session_state:
                     st.metric(nome, valor)
 
             if st.button(f"Remover Nó {no_selecionado} e Refazer Simulação"):
+                # Atualiza só as métricas afetadas pela remoção, em vez de recalcular tudo
+                topologia = remover_no(resultados['topologia'], no_selecionado)
                 G.remove_node(no_selecionado)
                 st.session_state['no_selecionado'] = None # Limpa a seleção
                 st.success(f"Nó {no_selecionado} removido.")
-                rodar_simulacao(G, tempo_simulacao)
+                rodar_simulacao(G, tempo_simulacao, protocolo, topologia)
                 st.rerun() # Força a atualização da UI
         else:
             st.info("Clique em um nó no grafo para ver suas informações detalhadas.")
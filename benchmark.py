@@ -0,0 +1,564 @@
+import copy
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+
+import networkx as nx
+import numpy as np
+
+import simulation
+from energia import ModeloDeEnergia
+from estatisticas import EstatisticasIncrementais
+from inundacao_analitica import executar_inundacao_analitica
+from metricas_aproximadas import resolver_aproximacao
+from metricas_estruturais import MetricasEstruturais, metricas_de
+from mobilidade import ModeloGaussMarkov, ModeloWaypointAleatorio, TopologiaDinamica
+from motor_eventos import AmbienteSimPyContador, MotorLeve
+from network_generator import _arestas_por_grade, criar_grafo_rssf, criar_grafo_watts_strogatz, criar_topologia_rssf
+from remocao_incremental import remover_no
+from telemetria import carregar_telemetria
+from topologia import Topologia, TIPO_ESTACAO_BASE, TIPO_SENSOR
+
+def _grafo_rssf_forca_bruta(G_referencia, raio_comunicacao):
+    """Reconstrói as arestas com o laço duplo O(n²) original, para conferência."""
+    nos = list(G_referencia.nodes())
+    H = nx.Graph()
+    H.add_nodes_from(nos)
+    for i in range(len(nos)):
+        for j in range(i + 1, len(nos)):
+            x1, y1 = G_referencia.nodes[nos[i]]['pos']
+            x2, y2 = G_referencia.nodes[nos[j]]['pos']
+            if math.sqrt((x1 - x2)**2 + (y1 - y2)**2) <= raio_comunicacao:
+                H.add_edge(nos[i], nos[j])
+    return H
+
+def benchmark_geracao(tamanhos=(1000, 10000, 100000), grau_medio=10, raio_comunicacao=15, num_estacoes_base=1):
+    """
+    Mede o tempo de criar_grafo_rssf para diferentes números de nós.
+
+    A área cresce junto com o número de nós para manter o grau médio constante;
+    caso contrário, 100k nós em uma área 100x100 formariam um grafo quase completo.
+    """
+    print("--- Benchmark de Geração (RSSF) ---")
+    for num_nos in tamanhos:
+        tam_area = raio_comunicacao * math.sqrt(math.pi * num_nos / grau_medio)
+        random.seed(num_nos)
+        inicio = time.perf_counter()
+        G = criar_grafo_rssf(num_nos, tam_area, raio_comunicacao, num_estacoes_base)
+        duracao = time.perf_counter() - inicio
+        print(f"{num_nos:>7} nós: {duracao:8.3f}s  ({G.number_of_edges()} arestas)")
+
+        if num_nos <= 1000:
+            referencia = _grafo_rssf_forca_bruta(G, raio_comunicacao)
+            # Compara as listas de vizinhos, incluindo a ordem (que define a ordem de inundação)
+            assert {no: list(G.neighbors(no)) for no in G} == {no: list(referencia.neighbors(no)) for no in referencia}, \
+                "Grade espacial divergiu do laço O(n²)"
+            print("         grafo idêntico ao do laço O(n²)")
+
+class _PacoteLegado:
+    """Pacote com __dict__ e id em string, como antes da representação compacta."""
+
+    def __init__(self, id_pacote, origem, destino, tempo_de_criacao):
+        self.id = id_pacote
+        self.origem = origem
+        self.destino = destino
+        self.tempo_de_criacao = tempo_de_criacao
+        self.contagem_de_saltos = 0
+
+def _gerador_legado(contexto, no):
+    env, metricas, rng = contexto.env, contexto.metricas, contexto.rng
+    while True:
+        yield env.timeout(rng.expovariate(1.0 / 10))
+        metricas['pacotes_gerados'] += 1
+        pacote = _PacoteLegado(f'{no}-{metricas["pacotes_gerados"]}', no, rng.choice(contexto.estacoes_base), env.now)
+        env.process(_roteador_legado(contexto, no, pacote))
+
+def _roteador_legado(contexto, no, pacote):
+    """Roteador original: copia o pacote inteiro para cada vizinho."""
+    env, metricas = contexto.env, contexto.metricas
+    encaminhados = metricas['pacotes_encaminhados_por_no']
+    if pacote.id in encaminhados.get(no, set()):
+        return
+    encaminhados.setdefault(no, set()).add(pacote.id)
+    if no == pacote.destino:
+        metricas['pacotes_entregues'] += 1
+        metricas['latencias'].adicionar(env.now - pacote.tempo_de_criacao)
+        metricas['contagens_de_saltos'].adicionar(pacote.contagem_de_saltos)
+        return
+    metricas['contagens_de_encaminhamento'][no] += 1
+    for vizinho in contexto.vizinhos[no]:
+        yield env.timeout(1)
+        novo_pacote = copy.copy(pacote)
+        novo_pacote.contagem_de_saltos += 1
+        env.process(_roteador_legado(contexto, vizinho, novo_pacote))
+
+def _rodar_pacotes(topologia, tempo_simulacao, semente, gerador, env=None):
+    """Executa só a fase de pacotes (sem métricas estruturais) e mede eventos por segundo."""
+    metricas = {
+        'pacotes_gerados': 0, 'pacotes_entregues': 0, 'latencias': EstatisticasIncrementais(),
+        'contagens_de_saltos': EstatisticasIncrementais(discreta=True),
+        'contagens_de_encaminhamento': [0] * topologia.num_nos,
+        'memoria_dedup_bytes': 0, 'memoria_dedup_pico_bytes': 0, 'pacotes_em_transito': 0,
+        'pacotes_encaminhados_por_no': {},
+    }
+    env = AmbienteSimPyContador() if env is None else env
+    contexto = simulation.ContextoSimulacao(
+        env, metricas, topologia.listas_de_vizinhos(),
+        topologia.indices_do_tipo(TIPO_ESTACAO_BASE).tolist(), random.Random(semente)
+    )
+    for no in topologia.indices_do_tipo(TIPO_SENSOR).tolist():
+        env.process(gerador(contexto, no))
+    inicio = time.perf_counter()
+    env.run(until=tempo_simulacao)
+    duracao = time.perf_counter() - inicio
+    return env.eventos_processados, duracao, metricas
+
+def benchmark_pacotes(num_nos=150, raio_comunicacao=15, tempo_simulacao=30, semente=1):
+    """Compara eventos/segundo do roteador original (cópia por vizinho) com o atual."""
+    print("--- Benchmark de Pacotes (inundação) ---")
+    topologia = criar_topologia_rssf(num_nos, 100, raio_comunicacao, 2, semente=semente)
+    eventos_antes, duracao_antes, metricas_antes = _rodar_pacotes(topologia, tempo_simulacao, semente, _gerador_legado)
+    eventos_depois, duracao_depois, metricas_depois = _rodar_pacotes(
+        topologia, tempo_simulacao, semente, simulation.gerador_de_pacotes)
+    assert metricas_antes['latencias'] == metricas_depois['latencias'], "Os roteadores divergiram"
+    print(f"Antes : {eventos_antes / duracao_antes:12,.0f} eventos/s ({eventos_antes} eventos em {duracao_antes:.2f}s)")
+    print(f"Depois: {eventos_depois / duracao_depois:12,.0f} eventos/s ({eventos_depois} eventos em {duracao_depois:.2f}s)")
+
+def benchmark_modo_analitico(num_nos=150, raio_comunicacao=15, tempo_simulacao=30, semente=1):
+    """Valida o modo analítico contra o modo por eventos e compara os tempos da fase de pacotes."""
+    print("--- Modo Analítico x Modo por Eventos ---")
+    topologia = criar_topologia_rssf(num_nos, 100, raio_comunicacao, 2, semente=semente)
+    _, duracao_eventos, metricas_eventos = _rodar_pacotes(
+        topologia, tempo_simulacao, semente, simulation.gerador_de_pacotes)
+
+    metricas_analitico = {'pacotes_gerados': 0, 'pacotes_entregues': 0, 'latencias': EstatisticasIncrementais(),
+                          'contagens_de_saltos': EstatisticasIncrementais(discreta=True)}
+    inicio = time.perf_counter()
+    contagens = executar_inundacao_analitica(
+        topologia.listas_de_vizinhos(), topologia.indices_do_tipo(TIPO_SENSOR).tolist(),
+        topologia.indices_do_tipo(TIPO_ESTACAO_BASE).tolist(), tempo_simulacao,
+        random.Random(semente), metricas_analitico
+    )
+    duracao_analitico = time.perf_counter() - inicio
+
+    for chave in ('pacotes_gerados', 'pacotes_entregues', 'latencias', 'contagens_de_saltos'):
+        assert metricas_eventos[chave] == metricas_analitico[chave], f"Divergência em {chave}"
+    assert metricas_eventos['contagens_de_encaminhamento'] == contagens.tolist(), "Divergência nos encaminhamentos"
+    print(f"Eventos  : {duracao_eventos * 1000:10.1f} ms")
+    print(f"Analítico: {duracao_analitico * 1000:10.1f} ms ({metricas_analitico['tabelas_de_inundacao']} tabelas)")
+    print("Resultados idênticos (entregas, latências, saltos e encaminhamentos)")
+
+def benchmark_motores(num_nos=150, raio_comunicacao=15, tempo_simulacao=30, semente=1):
+    """
+    Verifica a equivalência entre os motores SimPy e leve e compara a vazão.
+
+    O SimPy também conta eventos de término de processo, que o motor leve não
+    cria; por isso a vazão é comparada pela mesma carga (eventos do SimPy).
+    """
+    print("--- Motor SimPy x Motor Leve ---")
+    topologia = criar_topologia_rssf(num_nos, 100, raio_comunicacao, 2, semente=semente)
+    eventos_simpy, duracao_simpy, metricas_simpy = _rodar_pacotes(
+        topologia, tempo_simulacao, semente, simulation.gerador_de_pacotes)
+    eventos_leve, duracao_leve, metricas_leve = _rodar_pacotes(
+        topologia, tempo_simulacao, semente, simulation.gerador_de_pacotes, env=MotorLeve())
+
+    for chave in ('pacotes_gerados', 'pacotes_entregues', 'latencias', 'contagens_de_saltos', 'contagens_de_encaminhamento'):
+        assert metricas_simpy[chave] == metricas_leve[chave], f"Os motores divergiram em {chave}"
+    print(f"SimPy: {eventos_simpy / duracao_simpy:12,.0f} eventos/s ({duracao_simpy:.2f}s)")
+    print(f"Leve : {eventos_simpy / duracao_leve:12,.0f} eventos/s ({duracao_leve:.2f}s, {eventos_leve} entradas na fila)")
+    print("Resultados idênticos nos dois motores")
+
+def benchmark_concorrencia(num_simulacoes=8, num_nos=60, raio_comunicacao=20, tempo_simulacao=40):
+    """
+    Teste de estresse: simulações concorrentes em threads devem dar exatamente o
+    mesmo resultado que as mesmas simulações executadas uma a uma.
+    """
+    print("--- Simulações Concorrentes (threads) ---")
+    cenarios = []
+    for i in range(num_simulacoes):
+        topologia = criar_topologia_rssf(num_nos + 10 * i, 100, raio_comunicacao, 1 + i % 3, semente=i)
+        cenarios.append({
+            'G': topologia, 'tempo_simulacao': tempo_simulacao, 'semente': 100 + i,
+            'motor': ('simpy', 'leve')[i % 2],
+            'protocolo': ('inundacao', 'caminho_minimo', 'gradiente', 'multicaminho')[i % 4],
+        })
+
+    inicio = time.perf_counter()
+    sequenciais = [simulation.executar_simulacao(**cenario) for cenario in cenarios]
+    duracao_sequencial = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    concorrentes = simulation.executar_simulacoes_concorrentes(cenarios, max_threads=num_simulacoes)
+    duracao_concorrente = time.perf_counter() - inicio
+
+    chaves = ('pacotes_gerados', 'pacotes_entregues', 'latencias', 'contagens_de_saltos',
+              'contagens_de_encaminhamento', 'memoria_dedup_pico_bytes', 'protocolo')
+    for i, (sequencial, concorrente) in enumerate(zip(sequenciais, concorrentes)):
+        assert sequencial is not concorrente
+        for chave in chaves:
+            assert sequencial[chave] == concorrente[chave], f"Interferência entre simulações no cenário {i} ({chave})"
+    print(f"Sequencial : {duracao_sequencial:.2f}s")
+    print(f"Concorrente: {duracao_concorrente:.2f}s ({num_simulacoes} threads)")
+    print("Nenhuma interferência entre as simulações")
+
+def benchmark_mobilidade(num_nos=2000, tam_area=300, raio_comunicacao=12, passos=20, semente=1):
+    """
+    Passo da TopologiaDinamica contra a reconstrução completa das listas de
+    vizinhos a cada passo: as adjacências devem ser idênticas em todos os passos.
+    """
+    print("--- Mobilidade: passo incremental x reconstrução completa ---")
+    topologia = criar_topologia_rssf(num_nos, tam_area, raio_comunicacao, 3, semente=semente)
+    for modelo in (ModeloWaypointAleatorio(tam_area=tam_area, semente=semente),
+                   ModeloGaussMarkov(tam_area=tam_area, semente=semente)):
+        dinamica = TopologiaDinamica(topologia, modelo)
+        duracao_passo = duracao_reconstrucao = 0.0
+        for _ in range(passos):
+            inicio = time.perf_counter()
+            dinamica.passo(modelo.intervalo)
+            duracao_passo += time.perf_counter() - inicio
+            inicio = time.perf_counter()
+            reconstruidos = [[] for _ in range(topologia.num_nos)]
+            for u, v in _arestas_por_grade(dinamica.posicoes, raio_comunicacao).tolist():
+                reconstruidos[u].append(v)
+                reconstruidos[v].append(u)
+            duracao_reconstrucao += time.perf_counter() - inicio
+            assert [sorted(lista) for lista in dinamica.vizinhos] == reconstruidos, "Adjacência divergiu da reconstrução"
+        print(f"{type(modelo).__name__}: passo {duracao_passo:.2f}s, reconstrução {duracao_reconstrucao:.2f}s "
+              f"({passos} passos, {dinamica.enlaces_criados} enlaces criados, {dinamica.enlaces_desfeitos} desfeitos)")
+    print("Adjacências idênticas em todos os passos")
+
+def benchmark_caminhos_minimos(num_nos=300, raio_comunicacao=12, num_estacoes_base=3, semente=1):
+    """
+    Compara as seis travessias separadas do networkx com o kernel fundido de
+    caminhos mínimos (uma BFS por fonte) e confere que os valores são idênticos.
+    """
+    print("--- Métricas de Distância: networkx x Kernel Fundido ---")
+    G = criar_grafo_rssf(num_nos, 100, raio_comunicacao, num_estacoes_base, semente=semente)
+    bases = [n for n, d in G.nodes(data=True) if d.get('type') == 'base_station']
+    sensores = [n for n, d in G.nodes(data=True) if d.get('type') != 'base_station']
+
+    inicio = time.perf_counter()
+    maior = G.subgraph(max(nx.connected_components(G), key=len))
+    referencia = {
+        'centralidade_de_intermediacao': nx.betweenness_centrality(G),
+        'betweenness_sensores_para_bases': nx.betweenness_centrality_subset(G, sensores, bases, normalized=True),
+        'betweenness_bases_para_sensores': nx.betweenness_centrality_subset(G, bases, sensores, normalized=True),
+        'centralidade_de_proximidade': nx.closeness_centrality(G),
+        'diametro_rede': nx.diameter(maior),
+        'distancia_media': nx.average_shortest_path_length(maior),
+    }
+    duracao_networkx = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    fundido = MetricasEstruturais(Topologia.de_grafo(G)).calcular(referencia)
+    duracao_fundido = time.perf_counter() - inicio
+
+    for chave, valor in referencia.items():
+        assert fundido[chave] == valor, f"Divergência em {chave}"
+    print(f"networkx (6 travessias): {duracao_networkx:.2f}s")
+    print(f"Kernel fundido         : {duracao_fundido:.2f}s")
+    print("Valores idênticos aos do networkx")
+
+def benchmark_metricas_aproximadas(num_nos=6000, raio_comunicacao=3, num_estacoes_base=5, erro=0.05, semente=3):
+    """
+    Compara o modo exato com o aproximado das métricas de caminhos mínimos e
+    confere que o erro real de cada métrica fica dentro do limite informado.
+    """
+    print("--- Métricas de Distância: Exato x Aproximado ---")
+    G = criar_grafo_rssf(num_nos, 100, raio_comunicacao, num_estacoes_base, semente=semente)
+    topologia = Topologia.de_grafo(G)
+    nomes = ('centralidade_de_intermediacao', 'betweenness_sensores_para_bases', 'centralidade_de_proximidade',
+             'diametro_rede', 'distancia_media')
+
+    inicio = time.perf_counter()
+    exato = MetricasEstruturais(topologia).calcular(nomes)
+    duracao_exato = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    aproximacao = resolver_aproximacao({'erro': erro}, topologia.num_nos)
+    aproximado = MetricasEstruturais(topologia, aproximacao).calcular(nomes + ('erros_aproximacao',))
+    duracao_aproximado = time.perf_counter() - inicio
+    erros = aproximado['erros_aproximacao']
+
+    print(f"Exato     : {duracao_exato:.2f}s")
+    print(f"Aproximado: {duracao_aproximado:.2f}s ({erros['pivos']} pivôs)")
+    for nome in nomes:
+        if isinstance(exato[nome], dict):
+            real = max(abs(exato[nome][no] - aproximado[nome][no]) for no in exato[nome])
+        else:
+            real = abs(exato[nome] - aproximado[nome])
+        print(f"{nome}: erro real {real:.2e}, limite {erros[nome]:.2e}")
+        assert real <= erros[nome] + 1e-12, f"Erro acima do limite em {nome}"
+
+def benchmark_metricas_esparsas(num_nos=3000, raio_comunicacao=5, num_estacoes_base=3, semente=1):
+    """
+    Compara grau, agrupamento, assortatividade, autovetor e PageRank do networkx
+    com o backend de álgebra linear esparsa e confere que os valores coincidem
+    (até o arredondamento de ponto flutuante).
+    """
+    print("--- Métricas Espectrais e Locais: networkx x Backend Esparso ---")
+    G = criar_grafo_rssf(num_nos, 100, raio_comunicacao, num_estacoes_base, semente=semente)
+
+    inicio = time.perf_counter()
+    referencia = {
+        'centralidade_de_grau': nx.degree_centrality(G),
+        'centralidade_de_clique': nx.clustering(G),
+        'coeficiente_clusterizacao': nx.average_clustering(G),
+        'assortatividade': nx.degree_assortativity_coefficient(G),
+        'centralidade_de_autovetor': nx.eigenvector_centrality(G, max_iter=1000, tol=1e-05),
+        'centralidade_de_pagerank': nx.pagerank(G),
+    }
+    duracao_networkx = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    esparso = MetricasEstruturais(Topologia.de_grafo(G)).calcular(referencia)
+    duracao_esparso = time.perf_counter() - inicio
+
+    for chave, valor in referencia.items():
+        if isinstance(valor, dict):
+            assert esparso[chave].keys() == valor.keys(), f"Nós diferentes em {chave}"
+            assert np.allclose([esparso[chave][no] for no in valor], list(valor.values()), rtol=1e-9, atol=1e-12), \
+                f"Divergência em {chave}"
+        else:
+            assert math.isclose(esparso[chave], valor, rel_tol=1e-9), f"Divergência em {chave}"
+    print(f"networkx       : {duracao_networkx:.2f}s")
+    print(f"Backend esparso: {duracao_esparso:.2f}s")
+    print("Valores iguais aos do networkx")
+
+def benchmark_remocao_incremental(num_nos=20000, raio_comunicacao=1.2, num_estacoes_base=3, remocoes=10, semente=1):
+    """
+    Remove nós um a um (como o botão do app) e compara a atualização
+    incremental das métricas com o recálculo do zero, conferindo que coincidem.
+    """
+    print("--- Remoção de Nós: Recálculo x Atualização Incremental ---")
+    # Caminhos mínimos ficam de fora: numa rede conexa o componente afetado é a rede inteira
+    nomes = ('is_connected', 'pontos_articulacao', 'numero_pontos_articulacao', 'pontes', 'numero_pontes',
+             'centralidade_de_clique', 'coeficiente_clusterizacao')
+    topologia = Topologia.de_grafo(criar_grafo_rssf(num_nos, 100, raio_comunicacao, num_estacoes_base,
+                                                    semente=semente))
+    metricas_de(topologia).calcular(nomes)
+    rng = random.Random(semente)
+    duracao_recalculo = duracao_incremental = 0.0
+    for _ in range(remocoes):
+        rotulo = rng.choice(topologia.rotulos)
+        inicio = time.perf_counter()
+        topologia = remover_no(topologia, rotulo)
+        incremental = metricas_de(topologia).calcular(nomes)
+        duracao_incremental += time.perf_counter() - inicio
+
+        G = topologia.grafo
+        inicio = time.perf_counter()
+        recalculo = MetricasEstruturais(Topologia.de_grafo(G)).calcular(nomes)
+        duracao_recalculo += time.perf_counter() - inicio
+        assert incremental == recalculo, f"Divergência após remover {rotulo}"
+    print(f"Recálculo  : {duracao_recalculo:.2f}s ({remocoes} remoções)")
+    print(f"Incremental: {duracao_incremental:.2f}s")
+    print("Métricas idênticas às do recálculo")
+
+def benchmark_conectividade(num_nos=1000, k_vizinhos=10, p_reconectar=0.1, semente=1):
+    """
+    Compara edge/node connectivity do networkx com as rotinas de conectividade.py
+    (fluxos com corte, vizinhos comuns e parada antecipada) e confere os valores.
+    """
+    print("--- Conectividade: networkx x conectividade.py ---")
+    G = criar_grafo_watts_strogatz(num_nos, k_vizinhos, p_reconectar, 100, semente=semente)
+
+    inicio = time.perf_counter()
+    referencia = {'edge_connectivity': nx.edge_connectivity(G), 'node_connectivity': nx.node_connectivity(G)}
+    duracao_networkx = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    rapido = MetricasEstruturais(Topologia.de_grafo(G)).calcular(referencia)
+    duracao_rapido = time.perf_counter() - inicio
+
+    assert rapido == referencia, f"Divergência: {rapido} x {referencia}"
+    print(f"networkx        : {duracao_networkx:.2f}s")
+    print(f"conectividade.py: {duracao_rapido:.2f}s")
+    print(f"Valores idênticos aos do networkx: {referencia}")
+
+class _ValoresRegistrados(list):
+    """Coletor de referência: guarda todos os valores, como as antigas listas de latências."""
+    adicionar = list.append
+
+def benchmark_estatisticas(num_nos=300, raio_comunicacao=12, tempo_simulacao=2000, particoes=4, semente=1):
+    """
+    Compara as estatísticas incrementais com as listas completas de latências e
+    saltos: memória, média, quantis (exatos nos saltos, erro relativo α nas
+    latências) e mesclagem exata de esboços de partes separadas do fluxo.
+    """
+    print("--- Estatísticas Incrementais x Listas Completas ---")
+    topologia = criar_topologia_rssf(num_nos, 100, raio_comunicacao, 3, semente=semente)
+    metricas = {'pacotes_gerados': 0, 'pacotes_entregues': 0,
+                'latencias': _ValoresRegistrados(), 'contagens_de_saltos': _ValoresRegistrados()}
+    executar_inundacao_analitica(
+        topologia.listas_de_vizinhos(), topologia.indices_do_tipo(TIPO_SENSOR).tolist(),
+        topologia.indices_do_tipo(TIPO_ESTACAO_BASE).tolist(), tempo_simulacao, random.Random(semente), metricas
+    )
+
+    for chave, discreta in (('latencias', False), ('contagens_de_saltos', True)):
+        valores = metricas[chave]
+        inicio = time.perf_counter()
+        unica = EstatisticasIncrementais(discreta=discreta)
+        for valor in valores:
+            unica.adicionar(valor)
+        duracao = time.perf_counter() - inicio
+        partes = [EstatisticasIncrementais(discreta=discreta) for _ in range(particoes)]
+        for i, valor in enumerate(valores):
+            partes[i * particoes // len(valores)].adicionar(valor)
+        mesclada = partes[0]
+        for parte in partes[1:]:
+            mesclada.mesclar(parte)
+        assert mesclada.contagens == unica.contagens and mesclada.n == unica.n, f"Mesclagem inexata em {chave}"
+        assert math.isclose(mesclada.media, sum(valores) / len(valores), rel_tol=1e-9)
+
+        ordenados = sorted(valores)
+        for q in (0.5, 0.95, 0.99):
+            exato = ordenados[math.floor(q * (len(ordenados) - 1))]
+            estimado = unica.quantil(q)
+            tolerancia = 0 if discreta else unica.precisao_relativa * exato
+            assert abs(estimado - exato) <= tolerancia + 1e-12, f"Quantil {q} de {chave}: {estimado} x {exato}"
+        memoria_lista = sys.getsizeof(valores) + sum(sys.getsizeof(v) for v in valores)
+        memoria_esboco = sys.getsizeof(unica.contagens) + sum(
+            sys.getsizeof(k) + sys.getsizeof(c) for k, c in unica.contagens.items())
+        print(f"{chave:20s}: {len(valores):8d} valores, lista {memoria_lista / 1024:9.1f} KiB, "
+              f"esboço {memoria_esboco / 1024:6.1f} KiB ({len(unica.contagens)} compartimentos), "
+              f"{duracao / len(valores) * 1e9:.0f} ns/valor")
+    print("Quantis dentro do erro garantido; mesclagem idêntica ao fluxo único")
+
+def benchmark_telemetria(num_nos=150, raio_comunicacao=15, tempo_simulacao=40, intervalo=1.0, semente=1):
+    """
+    Custo da telemetria por janelas (motor leve, uma janela por unidade de
+    tempo): os resultados devem ser idênticos e as séries devem somar os totais.
+    """
+    print("--- Telemetria: desligada x ligada ---")
+    topologia = criar_topologia_rssf(num_nos, 100, raio_comunicacao, 2, semente=semente)
+    opcoes = {'semente': semente, 'motor': 'leve', 'metricas_estruturais': ()}
+    inicio = time.perf_counter()
+    sem = simulation.executar_simulacao(topologia, tempo_simulacao, **opcoes)
+    duracao_sem = time.perf_counter() - inicio
+    with tempfile.TemporaryDirectory() as diretorio:
+        inicio = time.perf_counter()
+        com = simulation.executar_simulacao(topologia, tempo_simulacao, **opcoes,
+                                            telemetria={'diretorio': diretorio, 'intervalo': intervalo})
+        duracao_com = time.perf_counter() - inicio
+        resumo = com.pop('telemetria')
+        assert sem == com, "A telemetria alterou o resultado da simulação"
+        series = carregar_telemetria(diretorio)
+        assert series['janelas']['pacotes_entregues'].sum() == sem['pacotes_entregues']
+        assert series['nos']['encaminhamentos'].sum() == sum(sem['contagens_de_encaminhamento'].values())
+    print(f"Sem telemetria: {duracao_sem:.2f}s")
+    print(f"Com telemetria: {duracao_com:.2f}s ({resumo['janelas']} janelas, "
+          f"{resumo['segundos_escrita'] * 1000:.1f} ms de amostragem e escrita)")
+    print("Resultados idênticos; séries somam os totais")
+
+def benchmark_energia(num_nos=100, raio_comunicacao=18, tempo_simulacao=400, fracao_de_mortes=0.1, semente=1):
+    """
+    Modo de vida útil com o modelo de energia: os dois motores devem parar no
+    mesmo instante com o mesmo estado, e o custo do modelo é comparado com a
+    mesma janela de tempo sem energia.
+    """
+    print("--- Energia e Vida Útil ---")
+    topologia = criar_topologia_rssf(num_nos, 100, raio_comunicacao, 2, semente=semente)
+    opcoes = {'semente': semente, 'metricas_estruturais': ()}
+    resultados = {}
+    for motor in ('simpy', 'leve'):
+        inicio = time.perf_counter()
+        resultados[motor] = simulation.executar_simulacao(
+            topologia, tempo_simulacao, motor=motor, energia=ModeloDeEnergia(fracao_de_mortes=fracao_de_mortes), **opcoes)
+        duracao_energia = time.perf_counter() - inicio
+    leve = resultados['leve']
+    assert resultados['simpy'] == leve, "Os motores divergiram com o modelo de energia"
+    inicio = time.perf_counter()
+    simulation.executar_simulacao(topologia, leve['tempo_simulado'], motor='leve', **opcoes)
+    duracao_sem = time.perf_counter() - inicio
+    print(f"Vida útil ({fracao_de_mortes:.0%} dos sensores mortos): t = {leve['vida_util']:.2f} "
+          f"(primeira morte em t = {leve['primeira_morte']:.2f}, {leve['nos_mortos']} mortos)")
+    print(f"Sem energia: {duracao_sem:.2f}s")
+    print(f"Com energia: {duracao_energia:.2f}s (motor leve, mesma janela de tempo)")
+    print("Resultados idênticos nos dois motores")
+
+def benchmark_checkpoint(num_nos=100, raio_comunicacao=15, tempo_simulacao=100, intervalo=10.0, semente=1):
+    """
+    Custo do checkpoint periódico e retomada após uma interrupção: a execução
+    interrompida e retomada deve dar o mesmo resultado que a contínua.
+    """
+    print("--- Checkpoint e Retomada ---")
+    topologia = criar_topologia_rssf(num_nos, 100, raio_comunicacao, 2, semente=semente)
+    opcoes = {'semente': semente, 'motor': 'leve', 'metricas_estruturais': ()}
+    inicio = time.perf_counter()
+    continua = simulation.executar_simulacao(topologia, tempo_simulacao, **opcoes)
+    duracao_sem = time.perf_counter() - inicio
+
+    class Interrupcao(Exception):
+        pass
+
+    salvar = simulation.salvar_checkpoint
+    gravacoes = []
+
+    def salvar_e_interromper(arquivo, assinatura, estado):
+        salvar(arquivo, assinatura, estado)
+        gravacoes.append(os.path.getsize(arquivo))
+        if len(gravacoes) == 3:
+            raise Interrupcao
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        checkpoint = {'arquivo': os.path.join(diretorio, 'simulacao.ckpt'), 'intervalo': intervalo}
+        inicio = time.perf_counter()
+        assert simulation.executar_simulacao(topologia, tempo_simulacao, checkpoint=checkpoint, **opcoes) == continua
+        duracao_com = time.perf_counter() - inicio
+        simulation.salvar_checkpoint = salvar_e_interromper
+        try:
+            simulation.executar_simulacao(topologia, tempo_simulacao, checkpoint=checkpoint, **opcoes)
+        except Interrupcao:
+            pass
+        finally:
+            simulation.salvar_checkpoint = salvar
+        retomada = simulation.executar_simulacao(topologia, tempo_simulacao, checkpoint=checkpoint, **opcoes)
+        assert retomada == continua, "A execução retomada divergiu da contínua"
+        assert not os.path.exists(checkpoint['arquivo'])
+    print(f"Sem checkpoint: {duracao_sem:.2f}s")
+    print(f"Com checkpoint: {duracao_com:.2f}s (a cada {intervalo:g} unidades de tempo; "
+          f"arquivo de {max(gravacoes) / 1024:.1f} KiB)")
+    print(f"Interrompida em t = {3 * intervalo:g} e retomada: resultado idêntico ao da execução contínua")
+
+def benchmark_perfil(num_nos=100, raio_comunicacao=15, tempo_simulacao=100, semente=1):
+    """
+    Custo do perfil de execução em cada motor: os resultados devem ser
+    idênticos com e sem perfil.
+    """
+    print("--- Perfil de Execução: desligado x ligado ---")
+    topologia = criar_topologia_rssf(num_nos, 100, raio_comunicacao, 2, semente=semente)
+    for motor in ('simpy', 'leve'):
+        opcoes = {'semente': semente, 'motor': motor, 'metricas_estruturais': ()}
+        inicio = time.perf_counter()
+        sem = simulation.executar_simulacao(topologia, tempo_simulacao, **opcoes)
+        duracao_sem = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        com = simulation.executar_simulacao(topologia, tempo_simulacao, perfil=True, **opcoes)
+        duracao_com = time.perf_counter() - inicio
+        perfil = com.pop('perfil')
+        assert sem == com, "O perfil alterou o resultado da simulação"
+        print(f"{motor}: {duracao_sem:.2f}s sem perfil, {duracao_com:.2f}s com perfil "
+              f"({perfil['eventos']} eventos, {perfil['eventos_por_segundo']:,.0f}/s, "
+              f"pico de {perfil['pico_pacotes_em_transito']} pacotes em trânsito)")
+    print("Resultados idênticos com e sem perfil")
+
+if __name__ == "__main__":
+    benchmark_geracao()
+    benchmark_pacotes()
+    benchmark_modo_analitico()
+    benchmark_motores()
+    benchmark_concorrencia()
+    benchmark_mobilidade()
+    benchmark_caminhos_minimos()
+    benchmark_metricas_aproximadas()
+    benchmark_metricas_esparsas()
+    benchmark_remocao_incremental()
+    benchmark_conectividade()
+    benchmark_estatisticas()
+    benchmark_telemetria()
+    benchmark_energia()
+    benchmark_checkpoint()
+    benchmark_perfil()
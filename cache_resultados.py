@@ -0,0 +1,144 @@
+import hashlib
+import json
+import os
+import pickle
+
+from ensemble import sementes_das_replicas
+from network_generator import GERADORES
+from simulation import executar_simulacao
+from topologia import Topologia
+
+# Módulos cujo código influencia o resultado de um cenário
+_MODULOS_DO_CENARIO = ('network_generator.py', 'topologia.py', 'mobilidade.py', 'roteamento.py',
+                       'metricas_estruturais.py', 'caminhos_minimos.py', 'metricas_aproximadas.py',
+                       'metricas_esparsas.py', 'conectividade.py', 'estatisticas.py', 'energia.py',
+                       'inundacao_analitica.py', 'motor_eventos.py', 'simulation.py')
+_versao_codigo = None
+
+def versao_do_codigo():
+    """Hash do código-fonte dos módulos de geração e simulação (muda a cada alteração)."""
+    global _versao_codigo
+    if _versao_codigo is None:
+        diretorio = os.path.dirname(os.path.abspath(__file__))
+        resumo = hashlib.sha256()
+        for nome in _MODULOS_DO_CENARIO:
+            with open(os.path.join(diretorio, nome), 'rb') as arquivo:
+                resumo.update(arquivo.read())
+        _versao_codigo = resumo.hexdigest()[:16]
+    return _versao_codigo
+
+def chave_do_cenario(tipo_rede, params, semente, tempo_simulacao, opcoes=None):
+    """
+    Chave de conteúdo de um cenário: hash de (gerador, parâmetros, semente,
+    tempo de simulação, opções extras e versão do código).
+
+    Opções que não são JSON (ex.: um modelo de mobilidade) entram pelo repr;
+    se o repr não for estável, o cenário simplesmente não é reaproveitado.
+    """
+    descricao = json.dumps(
+        {'gerador': tipo_rede, 'params': params, 'semente': semente, 'tempo_simulacao': tempo_simulacao,
+         'opcoes': opcoes or {}, 'versao': versao_do_codigo()},
+        sort_keys=True, default=repr
+    )
+    return hashlib.sha256(descricao.encode('utf-8')).hexdigest()
+
+class CacheResultados:
+    """
+    Cache persistente em disco, endereçado por conteúdo, com limite de tamanho.
+
+    Cada resultado é um arquivo `<chave>.pkl`. A data de modificação do arquivo
+    é atualizada a cada leitura, então, ao passar de `tamanho_maximo` bytes, os
+    arquivos menos usados recentemente (LRU) são removidos primeiro.
+    """
+
+    def __init__(self, diretorio='.cache_resultados', tamanho_maximo=512 * 1024 * 1024):
+        self.diretorio = diretorio
+        self.tamanho_maximo = tamanho_maximo
+        os.makedirs(diretorio, exist_ok=True)
+
+    def _caminho(self, chave):
+        return os.path.join(self.diretorio, chave + '.pkl')
+
+    def obter(self, chave):
+        """
+        Retorna o resultado guardado para `chave`, ou None.
+
+        Uma entrada que não pode ser carregada (truncada, ou gravada por outra
+        versão do código, que pode levantar AttributeError, ImportError,
+        ValueError...) conta como ausente e é apagada.
+        """
+        caminho = self._caminho(chave)
+        try:
+            with open(caminho, 'rb') as arquivo:
+                resultado = pickle.load(arquivo)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            try:
+                os.remove(caminho)
+            except FileNotFoundError:
+                pass  # Outro processo já apagou a entrada
+            return None
+        os.utime(caminho)  # Marca como usado recentemente
+        return resultado
+
+    def guardar(self, chave, resultado):
+        caminho = self._caminho(chave)
+        temporario = caminho + '.tmp'
+        with open(temporario, 'wb') as arquivo:
+            pickle.dump(resultado, arquivo, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporario, caminho)
+        self._aplicar_limite()
+
+    def limpar(self):
+        for nome in os.listdir(self.diretorio):
+            if nome.endswith('.pkl'):
+                os.remove(os.path.join(self.diretorio, nome))
+
+    def tamanho(self):
+        return sum(tamanho for _, tamanho, _ in self._entradas())
+
+    def _entradas(self):
+        entradas = []
+        for nome in os.listdir(self.diretorio):
+            if nome.endswith('.pkl'):
+                info = os.stat(os.path.join(self.diretorio, nome))
+                entradas.append((info.st_mtime, info.st_size, nome))
+        return entradas
+
+    def _aplicar_limite(self):
+        """Remove as entradas menos usadas recentemente até caber em `tamanho_maximo`."""
+        entradas = sorted(self._entradas())
+        total = sum(tamanho for _, tamanho, _ in entradas)
+        for _, tamanho, nome in entradas:
+            if total <= self.tamanho_maximo:
+                break
+            try:
+                os.remove(os.path.join(self.diretorio, nome))
+            except FileNotFoundError:
+                pass
+            total -= tamanho
+
+def executar_cenario(tipo_rede, params, tempo_simulacao, semente, cache=None, **opcoes):
+    """
+    Gera a topologia e executa a simulação de um cenário de forma determinística.
+
+    A semente mestre é dividida em duas sementes independentes, uma para o
+    gerador e outra para a simulação. Com `cache`, um cenário já executado é
+    devolvido direto do disco. Retorna (topologia, metricas).
+    """
+    chave = None
+    if cache is not None:
+        chave = chave_do_cenario(tipo_rede, params, semente, tempo_simulacao, opcoes)
+        resultado = cache.obter(chave)
+        if resultado is not None:
+            return resultado
+
+    semente_rede, semente_simulacao = sementes_das_replicas(semente, 2)
+    topologia = Topologia.de_grafo(GERADORES[tipo_rede](**params, semente=semente_rede))
+    metricas = executar_simulacao(topologia, tempo_simulacao, semente=semente_simulacao, **opcoes)
+    resultado = (topologia, metricas)
+
+    if cache is not None:
+        cache.guardar(chave, resultado)
+    return resultado
@@ -0,0 +1,224 @@
+def percorrer_fontes(vizinhos, fontes, eh_base):
+    """
+    Kernel fundido de caminhos mínimos: uma BFS por fonte (Brandes) sobre listas de vizinhos.
+
+    Numa única passada por fonte acumula:
+    - `intermediacao`: betweenness bruta (todas as fontes para todos os alvos)
+    - `sensores_para_bases`/`bases_para_sensores`: betweenness bruta restrita a
+      fontes sensores e alvos estações base (e vice-versa)
+    - `soma_distancias`, `alcancados` e `excentricidade` de cada fonte
+    - `distancias_recebidas`: para cada nó, a soma das distâncias das fontes até
+      ele (igual a `soma_distancias` quando todas as fontes são percorridas)
+    - `componente`: para cada nó, o menor índice do seu componente conexo (só
+      para nós alcançados a partir de alguma fonte; -1 nos demais)
+
+    A fila é um array (a ordem de retirada é a pilha S de Brandes) e os arrays
+    de trabalho são zerados só nos nós visitados. Vizinhos são percorridos na
+    mesma ordem do networkx e as somas seguem a mesma ordem, então os valores
+    coincidem com os de networkx.betweenness_centrality e afins.
+    """
+    n = len(vizinhos)
+    intermediacao = [0.0] * n
+    sensores_para_bases = [0.0] * n
+    bases_para_sensores = [0.0] * n
+    soma_distancias = [0] * n
+    alcancados = [0] * n
+    excentricidade = [0] * n
+    distancias_recebidas = [0] * n
+    componente = [-1] * n
+
+    distancia = [-1] * n
+    sigma = [0.0] * n
+    delta = [0.0] * n
+    delta_subconjunto = [0.0] * n
+    fila = [0] * n
+
+    for s in fontes:
+        distancia[s] = 0
+        sigma[s] = 1.0
+        fila[0] = s
+        inicio, fim = 0, 1
+        soma = 0
+        while inicio < fim:
+            v = fila[inicio]
+            inicio += 1
+            proxima = distancia[v] + 1
+            sigma_v = sigma[v]
+            for w in vizinhos[v]:
+                dw = distancia[w]
+                if dw < 0:
+                    distancia[w] = proxima
+                    fila[fim] = w
+                    fim += 1
+                    soma += proxima
+                    distancias_recebidas[w] += proxima
+                    sigma[w] += sigma_v
+                elif dw == proxima:
+                    sigma[w] += sigma_v
+
+        soma_distancias[s] = soma
+        alcancados[s] = fim
+        excentricidade[s] = distancia[fila[fim - 1]]
+        if componente[s] < 0:
+            representante = min(fila[:fim])
+            for i in range(fim):
+                componente[fila[i]] = representante
+
+        # Acumulação de dependências em ordem reversa de distância. Alvos do
+        # subconjunto: estações base se a fonte é sensor, sensores se é base.
+        alvo_e_base = not eh_base[s]
+        subconjunto = bases_para_sensores if eh_base[s] else sensores_para_bases
+        for i in range(fim - 1, -1, -1):
+            w = fila[i]
+            sigma_w = sigma[w]
+            coeficiente = (1 + delta[w]) / sigma_w
+            if eh_base[w] == alvo_e_base and w != s:
+                coeficiente_subconjunto = (delta_subconjunto[w] + 1.0) / sigma_w
+            else:
+                coeficiente_subconjunto = delta_subconjunto[w] / sigma_w
+            anterior = distancia[w] - 1
+            for v in vizinhos[w]:
+                if distancia[v] == anterior:
+                    delta[v] += sigma[v] * coeficiente
+                    delta_subconjunto[v] += sigma[v] * coeficiente_subconjunto
+            if w != s:
+                intermediacao[w] += delta[w]
+                subconjunto[w] += delta_subconjunto[w]
+
+        for i in range(fim):
+            w = fila[i]
+            distancia[w] = -1
+            sigma[w] = 0.0
+            delta[w] = 0.0
+            delta_subconjunto[w] = 0.0
+
+    return {
+        'intermediacao': intermediacao,
+        'sensores_para_bases': sensores_para_bases,
+        'bases_para_sensores': bases_para_sensores,
+        'soma_distancias': soma_distancias,
+        'alcancados': alcancados,
+        'excentricidade': excentricidade,
+        'distancias_recebidas': distancias_recebidas,
+        'componente': componente,
+    }
+
+def normalizar_intermediacao(valores, n):
+    """Mesma normalização do networkx para grafos não direcionados: 1 / ((n-1)(n-2))."""
+    if n - 1 < 2:
+        return list(valores)
+    escala = 1 / ((n - 1) * (n - 2))
+    return [valor * escala for valor in valores]
+
+def proximidade(soma_distancias, alcancados, n):
+    """Closeness com a correção de Wasserman-Faust (wf_improved) do networkx."""
+    resultado = []
+    for soma, alcance in zip(soma_distancias, alcancados):
+        valor = 0.0
+        if soma > 0.0 and n > 1:
+            valor = (alcance - 1.0) / soma
+            valor *= (alcance - 1.0) / (n - 1)
+        resultado.append(valor)
+    return resultado
+
+def maior_componente(componente, alcancados):
+    """
+    Índices do maior componente conexo (o primeiro, na ordem dos nós, em caso de empate),
+    como `max(nx.connected_components(G), key=len)`.
+    """
+    if not componente:
+        return []
+    tamanho = max(alcancados)
+    representante = min(componente[v] for v in range(len(componente)) if alcancados[v] == tamanho)
+    return [v for v in range(len(componente)) if componente[v] == representante]
+
+def bfs_distancias(vizinhos, fonte):
+    """Distâncias em saltos a partir de `fonte` (-1 se inalcançável) e os nós na ordem de visita."""
+    distancia = [-1] * len(vizinhos)
+    distancia[fonte] = 0
+    fila = [fonte]
+    for v in fila:
+        proxima = distancia[v] + 1
+        for w in vizinhos[v]:
+            if distancia[w] < 0:
+                distancia[w] = proxima
+                fila.append(w)
+    return distancia, fila
+
+def componentes_conexos(vizinhos, nos=None):
+    """
+    Para cada nó, o menor índice do seu componente conexo; e o tamanho de cada componente.
+
+    Com `nos` (em ordem crescente), só os componentes desses nós são
+    percorridos; os demais nós ficam com -1.
+    """
+    componente = [-1] * len(vizinhos)
+    tamanhos = {}
+    for s in (range(len(vizinhos)) if nos is None else nos):
+        if componente[s] >= 0:
+            continue
+        componente[s] = s
+        fila = [s]
+        for v in fila:
+            for w in vizinhos[v]:
+                if componente[w] < 0:
+                    componente[w] = s
+                    fila.append(w)
+        tamanhos[s] = len(fila)
+    return componente, tamanhos
+
+def blocos_biconexos(vizinhos, nos=None):
+    """
+    Componentes biconexos (blocos) como conjuntos de nós, por DFS iterativa de Hopcroft-Tarjan.
+
+    Com `nos`, considera só o subgrafo induzido por esses nós. Nós isolados
+    não formam bloco, como em networkx.biconnected_components.
+    """
+    n = len(vizinhos)
+    dentro = None
+    if nos is not None:
+        dentro = [False] * n
+        for v in nos:
+            dentro[v] = True
+    descoberta = [-1] * n
+    menor = [0] * n
+    blocos = []
+    tempo = 0
+    for raiz in (range(n) if nos is None else nos):
+        if descoberta[raiz] >= 0:
+            continue
+        descoberta[raiz] = menor[raiz] = tempo
+        tempo += 1
+        pilha = [(raiz, -1, iter(vizinhos[raiz]))]
+        arestas = []
+        while pilha:
+            v, pai, restantes = pilha[-1]
+            for w in restantes:
+                if dentro is not None and not dentro[w]:
+                    continue
+                if descoberta[w] < 0:
+                    descoberta[w] = menor[w] = tempo
+                    tempo += 1
+                    arestas.append((v, w))
+                    pilha.append((w, v, iter(vizinhos[w])))
+                    break
+                if w != pai and descoberta[w] < descoberta[v]:
+                    menor[v] = min(menor[v], descoberta[w])
+                    arestas.append((v, w))
+            else:
+                pilha.pop()
+                if not pilha:
+                    continue
+                u = pilha[-1][0]
+                menor[u] = min(menor[u], menor[v])
+                if menor[v] >= descoberta[u]:
+                    # Fecha o bloco: desempilha as arestas até (u, v)
+                    bloco = set()
+                    while True:
+                        a, b = arestas.pop()
+                        bloco.add(a)
+                        bloco.add(b)
+                        if a == u and b == v:
+                            break
+                    blocos.append(frozenset(bloco))
+    return blocos
@@ -0,0 +1,70 @@
+import hashlib
+import json
+import os
+import pickle
+import zlib
+
+# Parâmetros padrão do checkpoint (o arquivo é obrigatório)
+CHECKPOINT_PADRAO = {'intervalo': 100.0}
+
+def resolver_checkpoint(checkpoint):
+    """
+    Normaliza o parâmetro `checkpoint` de executar_simulacao.
+
+    None desliga; um caminho (str) grava nesse arquivo a cada
+    CHECKPOINT_PADRAO['intervalo'] unidades de tempo simulado; um dicionário
+    com 'arquivo' sobrescreve CHECKPOINT_PADRAO.
+    """
+    if checkpoint is None:
+        return None
+    if isinstance(checkpoint, (str, os.PathLike)):
+        checkpoint = {'arquivo': checkpoint}
+    if 'arquivo' not in checkpoint:
+        raise ValueError("O checkpoint precisa de um 'arquivo'.")
+    parametros = {**CHECKPOINT_PADRAO, **checkpoint}
+    if parametros['intervalo'] <= 0:
+        raise ValueError("O intervalo de checkpoint deve ser positivo.")
+    return parametros
+
+def assinatura_do_cenario(topologia, **opcoes):
+    """
+    Hash da topologia (adjacência e tipos) e das opções da simulação.
+
+    Um checkpoint só é retomado por uma execução com a mesma assinatura;
+    opções que não são JSON (ex.: um ModeloDeEnergia) entram pelo repr.
+    """
+    resumo = hashlib.sha256()
+    for array in (topologia.indptr, topologia.indices, topologia.tipos):
+        resumo.update(array.tobytes())
+    resumo.update(json.dumps(opcoes, sort_keys=True, default=repr).encode('utf-8'))
+    return resumo.hexdigest()
+
+def salvar_checkpoint(arquivo, assinatura, estado):
+    """
+    Grava `estado` (pickle comprimido com zlib) junto com a assinatura do cenário.
+
+    Grava em um arquivo temporário e renomeia, então uma interrupção no meio
+    da gravação mantém o checkpoint anterior intacto.
+    """
+    dados = zlib.compress(pickle.dumps((assinatura, estado), protocol=pickle.HIGHEST_PROTOCOL), 1)
+    temporario = arquivo + '.tmp'
+    with open(temporario, 'wb') as saida:
+        saida.write(dados)
+    os.replace(temporario, arquivo)
+
+def carregar_checkpoint(arquivo, assinatura):
+    """
+    Estado gravado em `arquivo`, ou None se não houver checkpoint.
+
+    Levanta ValueError se o checkpoint for de outro cenário (outra topologia
+    ou outras opções), em vez de retomar uma execução diferente.
+    """
+    try:
+        with open(arquivo, 'rb') as entrada:
+            dados = entrada.read()
+    except FileNotFoundError:
+        return None
+    assinatura_gravada, estado = pickle.loads(zlib.decompress(dados))
+    if assinatura_gravada != assinatura:
+        raise ValueError(f"O checkpoint {arquivo} é de outro cenário (topologia ou opções diferentes).")
+    return estado
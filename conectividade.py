@@ -0,0 +1,211 @@
+import itertools
+import time
+
+def _fluxo_de_arestas(vizinhos, s, t, limite):
+    """
+    Número de caminhos aresta-disjuntos entre s e t (fluxo máximo com capacidade
+    unitária), parando ao chegar a `limite`.
+    """
+    n = len(vizinhos)
+    saida = [()] * n  # saida[u]: conjunto dos w com uma unidade de fluxo u -> w
+    caminhos = 0
+
+    def enviar(u, w):
+        if u in saida[w]:
+            saida[w].discard(u)  # Cancela o fluxo no sentido contrário
+        else:
+            if not saida[u]:
+                saida[u] = set()
+            saida[u].add(w)
+
+    # Caminhos diretos e de dois saltos (vizinhos comuns) são disjuntos entre si: entram sem busca
+    adjacentes_t = set(vizinhos[t])
+    for c in vizinhos[s]:
+        if caminhos >= limite:
+            return caminhos
+        if c == t:
+            enviar(s, t)
+            caminhos += 1
+        elif c in adjacentes_t:
+            enviar(s, c)
+            enviar(c, t)
+            caminhos += 1
+
+    while caminhos < limite:
+        pai = [-1] * n
+        pai[s] = s
+        fila = [s]
+        for u in fila:
+            if pai[t] >= 0:
+                break
+            usadas = saida[u]
+            for w in vizinhos[u]:
+                if pai[w] < 0 and w not in usadas:
+                    pai[w] = u
+                    fila.append(w)
+        if pai[t] < 0:
+            break
+        w = t
+        while w != s:
+            u = pai[w]
+            enviar(u, w)
+            w = u
+        caminhos += 1
+    return caminhos
+
+def _fluxo_de_nos(vizinhos, s, t, limite):
+    """
+    Número de caminhos internamente disjuntos em nós entre s e t (não adjacentes),
+    parando ao chegar a `limite`.
+
+    É o fluxo máximo no grafo com cada nó v dividido em v_entrada -> v_saida
+    (capacidade 1), percorrido implicitamente: o estado 2v é v_entrada e 2v+1
+    é v_saida. Um nó intermediário usado tem exatamente um arco de fluxo
+    chegando (`entrada[v]`) e um saindo (`saida[v]`).
+    """
+    n = len(vizinhos)
+    entrada = [-1] * n
+    saida = [-1] * n
+    saida_s = set()
+    caminhos = 0
+
+    def enviar(u, w):
+        # Arco u_saida -> w_entrada passa a ter fluxo
+        if u == s:
+            saida_s.add(w)
+        else:
+            saida[u] = w
+        if w != t:
+            entrada[w] = u
+
+    def cancelar(u, w):
+        # Arco u_saida -> w_entrada deixa de ter fluxo (salvo se já foi substituído no mesmo caminho)
+        if u == s:
+            saida_s.discard(w)
+        elif saida[u] == w:
+            saida[u] = -1
+        if entrada[w] == u:
+            entrada[w] = -1
+
+    # Cada vizinho comum é um caminho de dois saltos disjunto dos demais: entra sem busca
+    adjacentes_t = set(vizinhos[t])
+    for c in vizinhos[s]:
+        if caminhos >= limite:
+            return caminhos
+        if c in adjacentes_t:
+            enviar(s, c)
+            enviar(c, t)
+            caminhos += 1
+
+    alvo = 2 * t
+    while caminhos < limite:
+        pai = [-1] * (2 * n)
+        pai[2 * s + 1] = 2 * s + 1
+        fila = [2 * s + 1]
+        for estado in fila:
+            if pai[alvo] >= 0:
+                break
+            v = estado >> 1
+            if estado & 1:
+                proibido = saida[v] if v != s else -1
+                for w in vizinhos[v]:
+                    if w != s and pai[2 * w] < 0 and w != proibido and not (v == s and w in saida_s):
+                        pai[2 * w] = estado
+                        fila.append(2 * w)
+                if entrada[v] >= 0 and pai[2 * v] < 0:
+                    pai[2 * v] = estado  # Devolve o fluxo de v_entrada -> v_saida
+                    fila.append(2 * v)
+            else:
+                if entrada[v] < 0 and pai[estado + 1] < 0:
+                    pai[estado + 1] = estado
+                    fila.append(estado + 1)
+                u = entrada[v]
+                if u >= 0 and pai[2 * u + 1] < 0:
+                    pai[2 * u + 1] = estado  # Devolve o fluxo de u_saida -> v_entrada
+                    fila.append(2 * u + 1)
+        if pai[alvo] < 0:
+            break
+        estado = alvo
+        while estado != 2 * s + 1:
+            anterior = pai[estado]
+            v, u = estado >> 1, anterior >> 1
+            if u != v:
+                if estado & 1:
+                    cancelar(v, u)
+                else:
+                    enviar(u, v)
+            estado = anterior
+        caminhos += 1
+    return caminhos
+
+def _esgotado(inicio, orcamento_segundos):
+    return orcamento_segundos is not None and time.perf_counter() - inicio >= orcamento_segundos
+
+def conectividade_de_arestas(vizinhos, limite_inferior=1, orcamento_segundos=None):
+    """
+    Limites (inferior, superior) da conectividade de arestas de um grafo conexo.
+
+    Algoritmo de Esfahanian-Hakimi: um conjunto dominante D que contém o nó v
+    de grau mínimo δ cobre algum corte mínimo, então λ = min(δ, λ(v, w) para w
+    em D). Cada fluxo para ao atingir o melhor valor atual, e a busca para
+    assim que o superior chega a `limite_inferior` (ex.: 2 quando não há
+    pontes). Se `orcamento_segundos` se esgota, devolve os limites até ali.
+    """
+    inicio = time.perf_counter()
+    graus = [len(viz) for viz in vizinhos]
+    v = min(range(len(vizinhos)), key=graus.__getitem__)
+    superior = graus[v]
+    # Conjunto dominante guloso a partir de v, em ordem de grau (cortes pequenos aparecem cedo)
+    dominados = [False] * len(vizinhos)
+    dominados[v] = True
+    for w in vizinhos[v]:
+        dominados[w] = True
+    dominante = []
+    for w in sorted(range(len(vizinhos)), key=graus.__getitem__):
+        if not dominados[w]:
+            dominante.append(w)
+            for x in vizinhos[w]:
+                dominados[x] = True
+    if not dominante and len(vizinhos) > 1:
+        dominante.append(vizinhos[v][0])
+    for w in dominante:
+        if superior <= limite_inferior:
+            break
+        if _esgotado(inicio, orcamento_segundos):
+            return limite_inferior, superior
+        superior = min(superior, _fluxo_de_arestas(vizinhos, v, w, superior))
+    return superior, superior
+
+def conectividade_de_nos(vizinhos, limite_inferior=1, limite_superior=None, orcamento_segundos=None):
+    """
+    Limites (inferior, superior) da conectividade de nós de um grafo conexo.
+
+    Algoritmo de Even (o mesmo do networkx): com v de grau mínimo, κ é o menor
+    valor entre δ, κ(v, w) para os não vizinhos w de v e κ(x, y) para os pares
+    de vizinhos de v não adjacentes. `limite_superior` (ex.: a conectividade
+    de arestas, já que κ ≤ λ) e `limite_inferior` (ex.: 2 sem pontos de
+    articulação) permitem parar antes, como em conectividade_de_arestas.
+    """
+    inicio = time.perf_counter()
+    graus = [len(viz) for viz in vizinhos]
+    v = min(range(len(vizinhos)), key=graus.__getitem__)
+    superior = graus[v] if limite_superior is None else min(graus[v], limite_superior)
+    vizinhos_v = set(vizinhos[v])
+    pares = [(v, w) for w in sorted(range(len(vizinhos)), key=graus.__getitem__)
+             if w != v and w not in vizinhos_v]
+
+    def pares_de_vizinhos():
+        lista = vizinhos[v]
+        for i, x in enumerate(lista):
+            adjacentes = set(vizinhos[x])
+            for y in lista[i + 1:]:
+                if y not in adjacentes:
+                    yield x, y
+
+    for x, y in itertools.chain(pares, pares_de_vizinhos()):
+        if superior <= limite_inferior:
+            break
+        if _esgotado(inicio, orcamento_segundos):
+            return limite_inferior, superior
+        superior = min(superior, _fluxo_de_nos(vizinhos, x, y, superior))
+    return superior, superior
@@ -0,0 +1,116 @@
+import math
+
+from topologia import TIPO_ESTACAO_BASE, TIPO_SENSOR
+
+class ModeloDeEnergia:
+    """
+    Modelo de rádio de primeira ordem (Heinzelman et al.) com bateria por sensor.
+
+    Transmitir `bits_por_pacote` bits a d metros custa E_elec·k + ε_amp·k·d²
+    e receber custa E_elec·k (joules). As estações base têm energia ilimitada.
+    As distâncias são as da área da topologia, tomadas como metros.
+
+    `fracao_de_mortes` liga o modo de vida útil: a simulação para quando essa
+    fração dos sensores morreu (0 para na primeira morte). A condição é
+    conferida a cada `intervalo_de_verificacao` unidades de tempo, e
+    'vida_util' registra o instante exato em que ela foi atingida.
+    """
+
+    def __init__(self, energia_inicial=0.5, bits_por_pacote=2000, e_eletronica=50e-9, e_amplificador=100e-12,
+                 fracao_de_mortes=None, intervalo_de_verificacao=1.0):
+        if fracao_de_mortes is not None and not 0 <= fracao_de_mortes <= 1:
+            raise ValueError("fracao_de_mortes deve estar entre 0 e 1.")
+        self.energia_inicial = energia_inicial
+        self.bits_por_pacote = bits_por_pacote
+        self.e_eletronica = e_eletronica
+        self.e_amplificador = e_amplificador
+        self.fracao_de_mortes = fracao_de_mortes
+        self.intervalo_de_verificacao = intervalo_de_verificacao
+
+    def __repr__(self):
+        # Estável, para entrar na chave de cenário do cache e da varredura
+        return (f"ModeloDeEnergia(energia_inicial={self.energia_inicial!r}, bits_por_pacote={self.bits_por_pacote!r}, "
+                f"e_eletronica={self.e_eletronica!r}, e_amplificador={self.e_amplificador!r}, "
+                f"fracao_de_mortes={self.fracao_de_mortes!r}, "
+                f"intervalo_de_verificacao={self.intervalo_de_verificacao!r})")
+
+class EstadoDeEnergia:
+    """
+    Estado de energia por nó durante uma simulação, em listas indexadas pelo id denso.
+
+    `bateria`, `transmissoes` e `recepcoes` são atualizadas a cada envio e
+    `vivos` a cada morte; o número de mortos e o instante de vida útil são
+    mantidos na hora, sem percorrer os nós. `posicoes` é lida a cada envio,
+    então pode ser o array vivo de TopologiaDinamica (nós móveis).
+    """
+
+    def __init__(self, modelo, topologia, env, posicoes=None):
+        n = topologia.num_nos
+        self.env = env
+        self.posicoes = topologia.posicoes.tolist() if posicoes is None else posicoes
+        self.custo_eletronica = modelo.e_eletronica * modelo.bits_por_pacote
+        self.custo_amplificador = modelo.e_amplificador * modelo.bits_por_pacote
+        self.energia_inicial = float(modelo.energia_inicial)
+        eh_base = (topologia.tipos == TIPO_ESTACAO_BASE).tolist()
+        self.bateria = [math.inf if base else self.energia_inicial for base in eh_base]
+        self.transmissoes = [0] * n
+        self.recepcoes = [0] * n
+        self.vivos = bytearray(b'\x01') * n
+        self.mortes = []  # (instante, nó), em ordem de morte
+        self.limite_de_mortes = None
+        if modelo.fracao_de_mortes is not None:
+            num_sensores = len(topologia.indices_do_tipo(TIPO_SENSOR))
+            self.limite_de_mortes = max(1, math.ceil(modelo.fracao_de_mortes * num_sensores))
+        self.vida_util = None
+
+    @property
+    def esgotada(self):
+        """True quando o critério de vida útil foi atingido."""
+        return self.vida_util is not None
+
+    def enviar(self, origem, destino):
+        """
+        Cobra a transmissão de um pacote de `origem` para `destino` e a recepção em `destino`.
+
+        Retorna True se o destino recebeu o pacote e continua vivo para
+        processá-lo. Um nó morto não transmite (e não é cobrado), e um destino
+        morto não recebe.
+        """
+        if not self.vivos[origem]:
+            return False
+        xo, yo = self.posicoes[origem]
+        xd, yd = self.posicoes[destino]
+        dx, dy = xo - xd, yo - yd
+        self.transmissoes[origem] += 1
+        self.bateria[origem] -= self.custo_eletronica + self.custo_amplificador * (dx * dx + dy * dy)
+        if self.bateria[origem] <= 0:
+            self._morrer(origem)
+        if not self.vivos[destino]:
+            return False
+        self.recepcoes[destino] += 1
+        self.bateria[destino] -= self.custo_eletronica
+        if self.bateria[destino] <= 0:
+            self._morrer(destino)
+            return False
+        return True
+
+    def _morrer(self, no):
+        self.vivos[no] = 0
+        self.bateria[no] = 0.0
+        self.mortes.append((self.env.now, no))
+        if self.limite_de_mortes is not None and self.vida_util is None and len(self.mortes) >= self.limite_de_mortes:
+            self.vida_util = self.env.now
+
+    def resumo(self, rotulos):
+        """Métricas de energia para executar_simulacao, com os ids originais dos nós."""
+        sensores = [no for no, bateria in enumerate(self.bateria) if bateria != math.inf]
+        return {
+            'energia_residual': {rotulos[no]: self.bateria[no] for no in sensores},
+            'energia_consumida': self.energia_inicial * len(sensores) - sum(self.bateria[no] for no in sensores),
+            'transmissoes': {rotulos[no]: contagem for no, contagem in enumerate(self.transmissoes) if contagem},
+            'recepcoes': {rotulos[no]: contagem for no, contagem in enumerate(self.recepcoes) if contagem},
+            'nos_mortos': len(self.mortes),
+            'mortes': [(instante, rotulos[no]) for instante, no in self.mortes],
+            'primeira_morte': self.mortes[0][0] if self.mortes else math.nan,
+            'vida_util': math.nan if self.vida_util is None else self.vida_util,
+        }
@@ -0,0 +1,93 @@
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from network_generator import GERADORES
+from topologia import Topologia
+
+def _nome_da_replica(indice):
+    return f'replica_{indice:05d}.npz'
+
+def _ler_manifesto(diretorio):
+    with open(os.path.join(diretorio, 'ensemble.json')) as arquivo:
+        return json.load(arquivo)
+
+def _gravar_manifesto(diretorio, manifesto):
+    temporario = os.path.join(diretorio, 'ensemble.json.tmp')
+    with open(temporario, 'w') as arquivo:
+        json.dump(manifesto, arquivo)
+    os.replace(temporario, os.path.join(diretorio, 'ensemble.json'))
+
+def _gerar_replica(tipo_rede, params, semente, caminho):
+    """Gera uma réplica em um processo trabalhador e grava seu shard em disco."""
+    G = GERADORES[tipo_rede](**params, semente=semente)
+    # Grava em um arquivo temporário e renomeia, para nunca deixar shards pela metade
+    temporario = caminho + '.tmp.npz'
+    Topologia.de_grafo(G).salvar(temporario)
+    os.replace(temporario, caminho)
+    return caminho
+
+def sementes_das_replicas(semente, num_replicas):
+    """
+    Deriva uma semente independente por réplica a partir de uma semente mestre.
+
+    Usa np.random.SeedSequence.spawn, então a réplica i recebe sempre a mesma
+    semente, independentemente de quantos processos participam da geração.
+    """
+    filhas = np.random.SeedSequence(semente).spawn(num_replicas)
+    return [int(filha.generate_state(1, dtype=np.uint64)[0]) for filha in filhas]
+
+def gerar_ensemble(tipo_rede, params, num_replicas, diretorio, semente=0, processos=None):
+    """
+    Gera `num_replicas` topologias independentes em paralelo, gravando cada uma em disco.
+
+    Cada réplica vira um shard `replica_NNNNN.npz` em `diretorio` assim que fica
+    pronta; nada é acumulado em memória. Shards já existentes são mantidos, o que
+    permite completar (ou estender) um ensemble interrompido; levanta
+    ValueError se o diretório já tem um ensemble de outro gerador, outros
+    parâmetros ou outra semente. Retorna os caminhos dos shards em ordem de
+    réplica.
+    """
+    if tipo_rede not in GERADORES:
+        raise ValueError(f"Tipo de rede desconhecido: {tipo_rede}")
+    os.makedirs(diretorio, exist_ok=True)
+    # Normaliza pelo JSON (tuplas viram listas) para comparar com o manifesto gravado
+    manifesto = json.loads(json.dumps({'tipo_rede': tipo_rede, 'params': params, 'semente': semente}))
+    if os.path.exists(os.path.join(diretorio, 'ensemble.json')):
+        anterior = _ler_manifesto(diretorio)
+        for chave, valor in manifesto.items():
+            if anterior.get(chave) != valor:
+                raise ValueError(f"{diretorio} já tem um ensemble com outro valor de '{chave}': "
+                                 f"{anterior.get(chave)!r} (pedido: {valor!r}).")
+    # O manifesto só fica 'completo' depois que todos os shards foram gravados
+    _gravar_manifesto(diretorio, {**manifesto, 'num_replicas': num_replicas, 'completo': False})
+
+    caminhos = [os.path.join(diretorio, _nome_da_replica(i)) for i in range(num_replicas)]
+    pendentes = [
+        (caminho, semente_replica)
+        for caminho, semente_replica in zip(caminhos, sementes_das_replicas(semente, num_replicas))
+        if not os.path.exists(caminho)
+    ]
+    if pendentes:
+        with ProcessPoolExecutor(max_workers=processos) as executor:
+            futuros = [executor.submit(_gerar_replica, tipo_rede, params, s, caminho) for caminho, s in pendentes]
+            for futuro in as_completed(futuros):
+                futuro.result()  # Propaga erros dos trabalhadores
+    _gravar_manifesto(diretorio, {**manifesto, 'num_replicas': num_replicas, 'completo': True})
+    return caminhos
+
+def iterar_ensemble(diretorio):
+    """
+    Percorre as réplicas do manifesto de `diretorio`, carregando uma Topologia por vez.
+
+    Só as `num_replicas` do último gerar_ensemble são lidas, mesmo que restem
+    shards de uma geração anterior com mais réplicas. Levanta ValueError se
+    esse gerar_ensemble não terminou.
+    """
+    manifesto = _ler_manifesto(diretorio)
+    if not manifesto.get('completo', False):
+        raise ValueError(f"O ensemble em {diretorio} está incompleto; rode gerar_ensemble de novo para terminá-lo.")
+    for indice in range(manifesto['num_replicas']):
+        yield Topologia.carregar(os.path.join(diretorio, _nome_da_replica(indice)))
@@ -0,0 +1,125 @@
+import math
+
+# Erro relativo padrão dos quantis de valores contínuos (ex.: latências)
+PRECISAO_RELATIVA = 0.01
+
+class EstatisticasIncrementais:
+    """
+    Estatísticas de um fluxo de valores em memória constante, atualizadas a cada valor.
+
+    Guarda contagem, média e variância (Welford), mínimo, máximo e um
+    histograma que também serve de esboço de quantis. Com `discreta=True`
+    (ex.: contagens de saltos) cada valor tem o seu próprio compartimento e os
+    quantis são exatos; senão os valores não negativos caem em compartimentos
+    logarítmicos de razão γ = (1 + α) / (1 - α), como no DDSketch, e cada
+    quantil tem erro relativo de no máximo α = `precisao_relativa`. O número
+    de compartimentos depende só da faixa dos valores, não de quantos são.
+
+    Os compartimentos são fixos, então mesclar os esboços de execuções
+    separadas dá exatamente o mesmo histograma que o de uma execução única.
+    """
+    __slots__ = ('discreta', 'precisao_relativa', 'n', 'media', 'm2', 'minimo', 'maximo',
+                 'contagens', '_inverso_log_gama', '_gama')
+
+    def __init__(self, discreta=False, precisao_relativa=PRECISAO_RELATIVA):
+        self.discreta = discreta
+        self.precisao_relativa = precisao_relativa
+        self.n = 0
+        self.media = 0.0
+        self.m2 = 0.0
+        self.minimo = math.inf
+        self.maximo = -math.inf
+        self.contagens = {}  # compartimento -> número de valores
+        self._gama = (1 + precisao_relativa) / (1 - precisao_relativa)
+        self._inverso_log_gama = 1 / math.log(self._gama)
+
+    def adicionar(self, valor):
+        """Registra um valor (uma entrega)."""
+        self.n += 1
+        delta = valor - self.media
+        self.media += delta / self.n
+        self.m2 += delta * (valor - self.media)
+        if valor < self.minimo:
+            self.minimo = valor
+        if valor > self.maximo:
+            self.maximo = valor
+        if self.discreta:
+            chave = valor
+        elif valor > 0:
+            chave = math.ceil(math.log(valor) * self._inverso_log_gama)
+        elif valor == 0:
+            chave = -math.inf
+        else:
+            raise ValueError(f"Valor negativo em estatística logarítmica: {valor}")
+        contagens = self.contagens
+        contagens[chave] = contagens.get(chave, 0) + 1
+
+    def mesclar(self, outra):
+        """Acrescenta os valores de `outra` (mesmos parâmetros) a estas estatísticas."""
+        if (outra.discreta, outra.precisao_relativa) != (self.discreta, self.precisao_relativa):
+            raise ValueError("Só é possível mesclar estatísticas com os mesmos parâmetros.")
+        if outra.n == 0:
+            return self
+        # Combinação de Chan et al. para média e soma dos quadrados dos desvios
+        n = self.n + outra.n
+        delta = outra.media - self.media
+        self.media += delta * outra.n / n
+        self.m2 += outra.m2 + delta * delta * self.n * outra.n / n
+        self.n = n
+        self.minimo = min(self.minimo, outra.minimo)
+        self.maximo = max(self.maximo, outra.maximo)
+        for chave, contagem in outra.contagens.items():
+            self.contagens[chave] = self.contagens.get(chave, 0) + contagem
+        return self
+
+    def __len__(self):
+        return self.n
+
+    def __eq__(self, outra):
+        if not isinstance(outra, EstatisticasIncrementais):
+            return NotImplemented
+        return all(getattr(self, nome) == getattr(outra, nome) for nome in self.__slots__)
+
+    @property
+    def variancia(self):
+        """Variância amostral (NaN com menos de dois valores)."""
+        return self.m2 / (self.n - 1) if self.n > 1 else math.nan
+
+    @property
+    def desvio(self):
+        return math.sqrt(self.variancia)
+
+    def _representante(self, chave):
+        if self.discreta:
+            return chave
+        if chave == -math.inf:
+            return 0.0
+        # Ponto do compartimento (γ^(i-1), γ^i] com erro relativo α para qualquer valor dele
+        valor = 2 * self._gama ** chave / (self._gama + 1)
+        return min(max(valor, self.minimo), self.maximo)
+
+    def quantil(self, q):
+        """Quantil inferior de ordem `q` (posição ⌊q·(n - 1)⌋ dos valores ordenados), NaN se vazio."""
+        if self.n == 0:
+            return math.nan
+        posicao = math.floor(q * (self.n - 1))
+        acumulado = 0
+        for chave in sorted(self.contagens):
+            acumulado += self.contagens[chave]
+            if acumulado > posicao:
+                return self._representante(chave)
+        return self.maximo
+
+    def histograma(self):
+        """(valores representativos, contagens) dos compartimentos, em ordem crescente."""
+        chaves = sorted(self.contagens)
+        return [self._representante(chave) for chave in chaves], [self.contagens[chave] for chave in chaves]
+
+    def resumo(self):
+        """Dicionário com contagem, média, desvio, extremos e os quantis p50, p95 e p99."""
+        vazio = self.n == 0
+        return {
+            'n': self.n, 'media': math.nan if vazio else self.media, 'desvio': self.desvio,
+            'minimo': math.nan if vazio else self.minimo, 'maximo': math.nan if vazio else self.maximo,
+            'p50': self.quantil(0.5), 'p95': self.quantil(0.95), 'p99': self.quantil(0.99),
+        }
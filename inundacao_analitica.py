@@ -0,0 +1,125 @@
+import heapq
+
+import numpy as np
+
+class TabelaDeInundacao:
+    """
+    Resultado determinístico da inundação de um pacote de `origem` até `destino`.
+
+    - `latencia`: atraso (em saltos de 1 unidade) até a primeira cópia chegar ao destino, ou None
+    - `saltos`: contagem de saltos dessa primeira cópia
+    - `deslocamentos`/`nos`: instante relativo (em unidades inteiras) em que cada nó
+      encaminhador recebe o pacote pela primeira vez, em ordem crescente
+    """
+    __slots__ = ('latencia', 'saltos', 'deslocamentos', 'nos')
+
+    def __init__(self, latencia, saltos, deslocamentos, nos):
+        self.latencia = latencia
+        self.saltos = saltos
+        self.deslocamentos = deslocamentos
+        self.nos = nos
+
+def calcular_tabela(vizinhos, origem, destino):
+    """
+    Reproduz a inundação do roteador SimPy sem executar o SimPy.
+
+    Cada enlace custa exatamente 1 unidade e um nó envia para seus vizinhos em
+    sequência, então o vizinho i de u é alcançado em chegada(u) + i + 1. Empates
+    no mesmo instante são resolvidos como no SimPy: eventos na ordem em que
+    foram agendados, e um roteador recém-criado roda logo após quem o criou
+    (Initialize tem prioridade URGENT). A fila abaixo usa (instante, ordem de
+    agendamento) como chave, portanto a primeira cópia a chegar em cada nó — e
+    com ela a contagem de saltos — é exatamente a mesma do modo por eventos.
+    """
+    saltos = {origem: 0}
+    deslocamentos, nos = [0], [origem]
+    latencia = saltos_destino = None
+    fila = [(1, 0, origem, 0)] if vizinhos[origem] else []
+    sequencia = 1
+    while fila:
+        instante, _, u, i = heapq.heappop(fila)
+        vizinhos_u = vizinhos[u]
+        # O roteador de u agenda o próximo envio antes de o filho começar a rodar
+        if i + 1 < len(vizinhos_u):
+            heapq.heappush(fila, (instante + 1, sequencia, u, i + 1))
+            sequencia += 1
+        v = vizinhos_u[i]
+        if v in saltos:
+            continue
+        saltos[v] = saltos[u] + 1
+        if v == destino:
+            latencia, saltos_destino = instante, saltos[v]
+            continue
+        deslocamentos.append(instante)
+        nos.append(v)
+        if vizinhos[v]:
+            heapq.heappush(fila, (instante + 1, sequencia, v, 0))
+            sequencia += 1
+    return TabelaDeInundacao(latencia, saltos_destino, np.array(deslocamentos), np.array(nos, dtype=np.int64))
+
+def _instantes(criacao, limite, maximo):
+    """
+    Instantes absolutos criacao, criacao+1, (criacao+1)+1, ... menores que
+    `limite`, com no máximo `maximo` saltos.
+
+    No SimPy cada timeout soma 1 ao instante atual, então o k-ésimo salto ocorre
+    em criacao+1+1+... (k somas), que em ponto flutuante nem sempre é igual a
+    criacao + k. Reproduzimos as mesmas somas para obter latências idênticas.
+    """
+    instantes = [criacao]
+    while len(instantes) <= maximo:
+        proximo = instantes[-1] + 1
+        if proximo >= limite:
+            break
+        instantes.append(proximo)
+    return instantes
+
+def executar_inundacao_analitica(vizinhos, sensores, estacoes_base, tempo_simulacao, rng, metricas):
+    """
+    Produz as mesmas métricas de entrega, latência, saltos e encaminhamentos do
+    modo por eventos, mas sem SimPy.
+
+    Os instantes de geração dos pacotes são sorteados na mesma ordem do modo por
+    eventos (uma fila de prioridade só com os geradores), e cada pacote é
+    resolvido com a tabela pré-calculada do par (origem, destino).
+    """
+    tabelas = {}
+    contagens = np.zeros(len(vizinhos), dtype=np.int64)
+    entregas = []
+
+    # Cada gerador sorteia seu primeiro intervalo ao iniciar, na ordem dos sensores
+    geradores = []
+    sequencia = 0
+    for no in sensores:
+        heapq.heappush(geradores, (0 + rng.expovariate(1.0 / 10), sequencia, no))
+        sequencia += 1
+
+    while geradores and geradores[0][0] < tempo_simulacao:
+        criacao, _, no = heapq.heappop(geradores)
+        metricas['pacotes_gerados'] += 1
+        destino = rng.choice(estacoes_base)
+        heapq.heappush(geradores, (criacao + rng.expovariate(1.0 / 10), sequencia, no))
+        sequencia += 1
+
+        tabela = tabelas.get((no, destino))
+        if tabela is None:
+            tabela = tabelas[(no, destino)] = calcular_tabela(vizinhos, no, destino)
+
+        ultimo = int(tabela.deslocamentos[-1])
+        if tabela.latencia is not None:
+            ultimo = max(ultimo, tabela.latencia)
+        instantes = _instantes(criacao, tempo_simulacao, ultimo)
+        alcance = np.searchsorted(tabela.deslocamentos, len(instantes) - 1, side='right')
+        np.add.at(contagens, tabela.nos[:alcance], 1)
+        if tabela.latencia is not None and tabela.latencia < len(instantes):
+            chegada = instantes[tabela.latencia]
+            entregas.append((chegada, chegada - criacao, tabela.saltos))
+
+    # As entregas são registradas na ordem temporal, como no modo por eventos
+    entregas.sort()
+    metricas['pacotes_entregues'] += len(entregas)
+    for _, latencia, saltos in entregas:
+        metricas['latencias'].adicionar(latencia)
+        metricas['contagens_de_saltos'].adicionar(saltos)
+    metricas['tabelas_de_inundacao'] = len(tabelas)
+    return contagens
@@ -1,14 +1,24 @@
+import argparse
+import math
+
 from network_generator import (
     criar_grafo_rssf,
     criar_grafo_aleatorio,
     criar_grafo_barabasi_albert,
     criar_grafo_watts_strogatz
 )
+from perfil import formatar_perfil
+from roteamento import PROTOCOLOS
 from simulation import executar_simulacao
 from visualization import plotar_rede, plotar_metricas
 
-def main():
+def main(argumentos=None):
     """Função principal para executar a simulação de RSSF."""
+    parser = argparse.ArgumentParser(description="Simulação de roteamento em RSSF e redes complexas.")
+    parser.add_argument('--profile', action='store_true',
+                        help="mede o tempo e as alocações de cada fase e os contadores do motor de eventos")
+    argumentos = parser.parse_args(argumentos)
+
     # --- CONFIGURAÇÃO DA SIMULAÇÃO ---
     # Altere os parâmetros aqui para diferentes simulações
     params = {
@@ -16,6 +26,26 @@ def main():
         'num_nos': 100,
         'tam_area': 100,
         'tempo_simulacao': 100,
+        'semente': None,  # Um inteiro torna a execução reprodutível
+        'modo': 'eventos',  # 'eventos' (SimPy) ou 'analitico' (tabelas de inundação, mesmo resultado)
+        'motor': 'simpy',  # Motor do modo 'eventos': 'simpy' ou 'leve' (mesmo resultado, mais rápido)
+        'protocolo': 'inundacao',  # 'inundacao', 'caminho_minimo', 'gradiente' ou 'multicaminho'
+        # Só as métricas estruturais impressas abaixo (ver metricas_estruturais.REGISTRO)
+        'metricas_estruturais': [
+            'is_connected', 'diametro_rede', 'centralidade_de_grau', 'centralidade_de_intermediacao',
+            'centralidade_de_proximidade', 'centralidade_de_autovetor', 'centralidade_de_clique',
+            'centralidade_de_pagerank',
+        ],
+        # Métricas de caminhos mínimos estimadas (com limites de erro) acima de 5000 nós; None: sempre exatas
+        'aproximacao': 'auto',
+        # Diretório para gravar séries temporais por janela (ver telemetria.py); None desliga
+        'telemetria': None,
+        # Bateria por sensor, ex.: ModeloDeEnergia(fracao_de_mortes=0) roda até a primeira morte; None desliga
+        'energia': None,
+        # Arquivo de checkpoint para retomar uma execução longa (exige motor 'leve' e semente); None desliga
+        'checkpoint': None,
+        # Perfil de execução (ver perfil.py): True, {'memoria': True} (tracemalloc) ou None; --profile liga
+        'perfil': None,
 
         # Parâmetros para RSSF
         'raio_comunicacao': 20,
@@ -32,9 +62,13 @@ def main():
         'p_reconectar': 0.1
     }
 
+    if argumentos.profile and not params['perfil']:
+        params['perfil'] = True
+
     print("--- Configuração da Simulação ---")
     print(f"Tipo de Rede: {params['tipo_rede']}")
     print(f"Número de Nós: {params['num_nos']}")
+    print(f"Protocolo de Roteamento: {PROTOCOLOS[params['protocolo']]}")
 
     # 1. Cria o grafo com base na escolha do usuário
     G = None
@@ -44,21 +78,24 @@ def main():
             num_nos=params['num_nos'],
             tam_area=params['tam_area'],
             raio_comunicacao=params['raio_comunicacao'],
-            num_estacoes_base=params['num_estacoes_base']
+            num_estacoes_base=params['num_estacoes_base'],
+            semente=params['semente']
         )
     elif params['tipo_rede'] == '2':
         print("Criando rede Aleatória...")
         G = criar_grafo_aleatorio(
             num_nos=params['num_nos'],
             p_conexao=params['p_conexao'],
-            tam_area=params['tam_area']
+            tam_area=params['tam_area'],
+            semente=params['semente']
         )
     elif params['tipo_rede'] == '3':
         print("Criando rede Barabási-Albert...")
         G = criar_grafo_barabasi_albert(
             num_nos=params['num_nos'],
             m_conexoes=params['m_conexoes'],
-            tam_area=params['tam_area']
+            tam_area=params['tam_area'],
+            semente=params['semente']
         )
     elif params['tipo_rede'] == '4':
         print("Criando rede Watts-Strogatz...")
@@ -66,7 +103,8 @@ def main():
             num_nos=params['num_nos'],
             k_vizinhos=params['k_vizinhos'],
             p_reconectar=params['p_reconectar'],
-            tam_area=params['tam_area']
+            tam_area=params['tam_area'],
+            semente=params['semente']
         )
 
     if G is None:
@@ -75,7 +113,12 @@ def main():
 
     # 2. Executa a simulação
     print("\nExecutando a simulação...")
-    metricas = executar_simulacao(G, params['tempo_simulacao'])
+    metricas = executar_simulacao(G, params['tempo_simulacao'], semente=params['semente'],
+                                  modo=params['modo'], motor=params['motor'], protocolo=params['protocolo'],
+                                  metricas_estruturais=params['metricas_estruturais'],
+                                  aproximacao=params['aproximacao'], telemetria=params['telemetria'],
+                                  energia=params['energia'], checkpoint=params['checkpoint'],
+                                  perfil=params['perfil'])
 
     # 3. Imprime as métricas de desempenho
     print("\n--- Resultados da Simulação ---")
@@ -86,12 +129,32 @@ def main():
         print("Nenhum pacote foi gerado na simulação (verifique se há estações base).")
 
     if metricas['latencias']:
-        latencia_media = sum(metricas['latencias']) / len(metricas['latencias'])
-        print(f"Latência Média: {latencia_media:.2f} unidades de tempo")
+        latencia = metricas['latencias'].resumo()
+        print(f"Latência Média: {latencia['media']:.2f} unidades de tempo "
+              f"(p50 {latencia['p50']:.2f}, p95 {latencia['p95']:.2f}, p99 {latencia['p99']:.2f})")
 
     if metricas['contagens_de_saltos']:
-        media_saltos = sum(metricas['contagens_de_saltos']) / len(metricas['contagens_de_saltos'])
-        print(f"Média de Saltos: {media_saltos:.2f}")
+        saltos = metricas['contagens_de_saltos'].resumo()
+        print(f"Média de Saltos: {saltos['media']:.2f} (p50 {saltos['p50']}, p95 {saltos['p95']}, p99 {saltos['p99']})")
+
+    if 'nos_mortos' in metricas:
+        print(f"Energia Consumida: {metricas['energia_consumida']:.3f} J ({metricas['nos_mortos']} sensores sem bateria)")
+        if metricas['nos_mortos']:
+            print(f"Primeira Morte: t = {metricas['primeira_morte']:.2f}")
+        if not math.isnan(metricas['vida_util']):
+            print(f"Vida Útil da Rede: t = {metricas['vida_util']:.2f}")
+
+    if 'telemetria' in metricas:
+        telemetria = metricas['telemetria']
+        print(f"Telemetria: {telemetria['janelas']} janelas em {telemetria['diretorio']} "
+              f"({telemetria['blocos']} blocos, {telemetria['segundos_escrita'] * 1000:.1f} ms de escrita)")
+
+    print(f"Pico de Memória de Deduplicação: {metricas['memoria_dedup_pico_bytes'] / 1024:.1f} KiB")
+
+    if 'perfil' in metricas:
+        print("\n--- Perfil de Execução ---")
+        for linha in formatar_perfil(metricas['perfil']):
+            print(linha)
 
     print(f"\n--- Metricas da Rede ---")
     if not metricas['is_connected']:
@@ -100,6 +163,14 @@ def main():
     else:
         print(f"Diâmetro da Rede: {metricas['diametro_rede']}")
 
+    if 'erros_aproximacao' in metricas:
+        erros = metricas['erros_aproximacao']
+        print(f"Métricas de caminhos mínimos aproximadas ({erros['pivos']} pivôs, "
+              f"{erros['segundos']:.1f}s, confiança {erros['confianca']:.0%}):")
+        print(f"  Diâmetro entre {metricas['diametro_rede']} e {metricas['diametro_rede'] + erros['diametro_rede']}")
+        print(f"  Intermediação: ±{erros['centralidade_de_intermediacao']:.4f}")
+        print(f"  Proximidade: ±{erros['centralidade_de_proximidade']:.4f}")
+
     if metricas['contagens_de_encaminhamento']:
         print("\n--- Nós de Gargalo ---")
         gargalos = sorted(metricas['contagens_de_encaminhamento'].items(), key=lambda x: x[1], reverse=True)[:5]
@@ -0,0 +1,279 @@
+import math
+import random
+import time
+
+import numpy as np
+
+from caminhos_minimos import bfs_distancias, componentes_conexos, percorrer_fontes
+
+# Acima deste número de nós, main.py e o app passam a usar o modo aproximado
+LIMIAR_APROXIMACAO = 5000
+
+# Parâmetros padrão: `erro` é a meia-largura desejada para a intermediação
+# normalizada (simultânea para todos os nós), com probabilidade `confianca`
+APROXIMACAO_PADRAO = {'erro': 0.05, 'confianca': 0.95, 'orcamento_segundos': None, 'semente': 0, 'max_bfs_diametro': 64}
+
+# Componentes até este tamanho são percorridos por completo (custo pequeno e resultado exato)
+_TAMANHO_EXATO = 32
+
+def resolver_aproximacao(aproximacao, num_nos):
+    """
+    Normaliza o parâmetro `aproximacao` de executar_simulacao.
+
+    None desliga; 'auto' liga com os parâmetros padrão só acima de
+    LIMIAR_APROXIMACAO nós; True ou um dicionário ligam (o dicionário
+    sobrescreve os parâmetros padrão).
+    """
+    if aproximacao is None or aproximacao is False:
+        return None
+    if aproximacao == 'auto':
+        return dict(APROXIMACAO_PADRAO) if num_nos > LIMIAR_APROXIMACAO else None
+    if aproximacao is True:
+        return dict(APROXIMACAO_PADRAO)
+    desconhecidos = set(aproximacao) - set(APROXIMACAO_PADRAO)
+    if desconhecidos:
+        raise ValueError(f"Parâmetros de aproximação desconhecidos: {sorted(desconhecidos)}")
+    return {**APROXIMACAO_PADRAO, **aproximacao}
+
+def _hoeffding(amplitude, log_falha, amostras):
+    """Meia-largura de Hoeffding para a média de `amostras` valores em um intervalo de largura `amplitude`."""
+    if amplitude <= 0:
+        return 0.0
+    if amostras <= 0:
+        return float('inf')
+    return amplitude * math.sqrt(log_falha / (2 * amostras))
+
+def limites_do_diametro(vizinhos, indices, max_bfs, limite_inferior=0, limite_superior=float('inf')):
+    """
+    Limites (inferior, superior) do diâmetro do componente formado por `indices`.
+
+    Faz uma varredura dupla a partir do nó de maior grau para achar um par
+    distante (limite inferior) e um nó central aproximado; depois aplica o iFUB
+    a partir desse nó: percorre os níveis da BFS do mais distante para o mais
+    próximo, e depois de esgotar o nível i o diâmetro é no máximo
+    max(inferior, 2(i-1)). Para com resposta exata ou ao atingir `max_bfs` BFS.
+    """
+    inicio = max(indices, key=lambda v: len(vizinhos[v]))
+    distancia_r, fila_r = bfs_distancias(vizinhos, inicio)
+    a = fila_r[-1]
+    distancia_a, fila_a = bfs_distancias(vizinhos, a)
+    b = fila_a[-1]
+    distancia_b, _ = bfs_distancias(vizinhos, b)
+    excentricidade_a = distancia_a[b]
+    limite_inferior = max(limite_inferior, distancia_r[a], excentricidade_a)
+    # Nó do meio de um caminho mínimo entre a e b
+    metade = excentricidade_a // 2
+    u = next(v for v in fila_a if distancia_a[v] == metade and distancia_b[v] == excentricidade_a - metade)
+    distancia_u, fila_u = bfs_distancias(vizinhos, u)
+    excentricidade_u = distancia_u[fila_u[-1]]
+    limite_inferior = max(limite_inferior, excentricidade_u)
+    limite_superior = min(limite_superior, 2 * excentricidade_u, 2 * distancia_r[a])
+    bfs_feitas = 4
+
+    nivel = excentricidade_u
+    posicao = len(fila_u) - 1
+    while nivel > 0 and limite_inferior < limite_superior:
+        while posicao >= 0 and distancia_u[fila_u[posicao]] == nivel:
+            if bfs_feitas >= max_bfs:
+                return limite_inferior, limite_superior
+            distancia_x, fila_x = bfs_distancias(vizinhos, fila_u[posicao])
+            limite_inferior = max(limite_inferior, distancia_x[fila_x[-1]])
+            bfs_feitas += 1
+            posicao -= 1
+        limite_superior = min(limite_superior, max(limite_inferior, 2 * (nivel - 1)))
+        nivel -= 1
+    return limite_inferior, max(limite_inferior, limite_superior)
+
+def estimar_caminhos(vizinhos, eh_base, erro=APROXIMACAO_PADRAO['erro'], confianca=APROXIMACAO_PADRAO['confianca'],
+                     orcamento_segundos=APROXIMACAO_PADRAO['orcamento_segundos'],
+                     semente=APROXIMACAO_PADRAO['semente'], max_bfs_diametro=APROXIMACAO_PADRAO['max_bfs_diametro'],
+                     lote=32):
+    """
+    Versão amostrada do kernel de caminhos mínimos, com limites de erro.
+
+    A amostragem é estratificada por componente conexo e por tipo de nó:
+    - estações base e componentes pequenos são percorridos por completo (exatos)
+    - nos demais componentes, sensores pivôs são sorteados sem reposição, em
+      lotes, e suas contribuições são escaladas por (sensores do componente /
+      pivôs do componente), um estimador não viesado
+
+    Para quando a meia-largura de Hoeffding da intermediação normalizada
+    (simultânea para todos os nós, por união) fica abaixo de `erro`, quando
+    `orcamento_segundos` se esgota, ou quando todos os sensores foram usados.
+
+    Retorna um dicionário no formato de caminhos_minimos.percorrer_fontes
+    (com estimativas) mais 'diametro', 'distancia_media' e 'erros' (limite de
+    erro absoluto de cada métrica com probabilidade `confianca`).
+    """
+    inicio = time.perf_counter()
+    n = len(vizinhos)
+    if n == 0:
+        # Como no modo exato: sem componentes, diâmetro e distância média infinitos e exatos
+        return {
+            'intermediacao': [], 'sensores_para_bases': [], 'bases_para_sensores': [], 'soma_distancias': [],
+            'alcancados': [], 'componente': [], 'diametro': (math.inf, math.inf), 'distancia_media': math.inf,
+            'erros': {
+                'centralidade_de_intermediacao': 0.0, 'betweenness_sensores_para_bases': 0.0,
+                'betweenness_bases_para_sensores': 0.0, 'centralidade_de_proximidade': 0.0,
+                'diametro_rede': 0, 'distancia_media': 0.0, 'confianca': confianca, 'pivos': 0,
+                'segundos': time.perf_counter() - inicio,
+            },
+        }
+    log_uniao = math.log(2 * max(n, 1) / (1 - confianca))
+    log_unico = math.log(2 / (1 - confianca))
+    escala = 1 / ((n - 1) * (n - 2)) if n >= 3 else 1.0
+
+    componente, tamanhos = componentes_conexos(vizinhos)
+    exatas = [v for v in range(n) if eh_base[v] or tamanhos[componente[v]] <= _TAMANHO_EXATO]
+    sensores_por_componente = {}
+    bases_por_componente = {}
+    for v in range(n):
+        destino = bases_por_componente if eh_base[v] else sensores_por_componente
+        destino[componente[v]] = destino.get(componente[v], 0) + 1
+    # Maior componente (o primeiro em caso de empate): diâmetro e distância média
+    maior = min(tamanhos, key=lambda c: (-tamanhos[c], c)) if n else None
+    amostrados = [c for c in sensores_por_componente if tamanhos[c] > _TAMANHO_EXATO]
+    amostrados.sort(key=lambda c: c != maior)  # Pivôs do maior componente vêm primeiro
+
+    # Ordem de sorteio: dois pivôs de cada componente amostrado, depois o resto ao acaso
+    rng = random.Random(semente)
+    membros = {c: [] for c in amostrados}
+    for v in range(n):
+        if not eh_base[v] and componente[v] in membros:
+            membros[componente[v]].append(v)
+    ordem, resto = [], []
+    for c in amostrados:
+        rng.shuffle(membros[c])
+        ordem.extend(membros[c][:2])
+        resto.extend(membros[c][2:])
+    rng.shuffle(resto)
+    ordem.extend(resto)
+
+    exato = percorrer_fontes(vizinhos, exatas, eh_base)
+    acumulado = None
+    pivos = {c: 0 for c in amostrados}
+
+    def erro_intermediacao():
+        maior = 0.0
+        for c in amostrados:
+            if pivos[c] < sensores_por_componente[c]:
+                amplitude = sensores_por_componente[c] * (tamanhos[c] - 2) * escala
+                maior = max(maior, _hoeffding(amplitude, log_uniao, pivos[c]))
+        return maior
+
+    usados = 0
+    while usados < len(ordem):
+        parte = ordem[usados:usados + lote]
+        resultado = percorrer_fontes(vizinhos, parte, eh_base)
+        if acumulado is None:
+            acumulado = resultado
+        else:
+            for chave in ('intermediacao', 'sensores_para_bases', 'distancias_recebidas'):
+                acumulado[chave] = [x + y for x, y in zip(acumulado[chave], resultado[chave])]
+            for s in parte:
+                acumulado['soma_distancias'][s] = resultado['soma_distancias'][s]
+                acumulado['excentricidade'][s] = resultado['excentricidade'][s]
+        for s in parte:
+            pivos[componente[s]] += 1
+        usados += len(parte)
+        if erro is not None and erro_intermediacao() <= erro:
+            break
+        if orcamento_segundos is not None and time.perf_counter() - inicio >= orcamento_segundos:
+            break
+    fontes_amostradas = set(ordem[:usados])
+
+    # Combina o estrato exato com o amostrado, nó a nó
+    componente_np = np.array(componente, dtype=np.int64)
+    tamanho_np = np.array([tamanhos[c] for c in componente], dtype=np.float64)
+    sensores_np = np.array([sensores_por_componente.get(c, 0) for c in componente], dtype=np.float64)
+    pivos_np = np.array([pivos.get(c, 0) for c in componente], dtype=np.float64)
+    eh_sensor = ~np.array(eh_base, dtype=bool)
+    amostrado = np.isin(componente_np, amostrados) if amostrados else np.zeros(n, dtype=bool)
+    fator = np.where(amostrado & (pivos_np > 0), sensores_np / np.maximum(pivos_np, 1), 0.0)
+
+    def combinar(chave):
+        valores = np.array(exato[chave], dtype=np.float64)
+        if acumulado is not None:
+            valores += fator * np.array(acumulado[chave], dtype=np.float64)
+        return valores
+
+    intermediacao = combinar('intermediacao')
+    sensores_para_bases = combinar('sensores_para_bases')
+
+    # Soma das distâncias até v: os outros sensores do componente são a população amostrada
+    e_pivo = np.zeros(n, dtype=bool)
+    e_pivo[list(fontes_amostradas)] = True
+    populacao = sensores_np - (amostrado & eh_sensor)
+    amostras_por_no = pivos_np - e_pivo
+    fator_distancia = np.where(amostrado & (amostras_por_no > 0), populacao / np.maximum(amostras_por_no, 1), 0.0)
+    soma_distancias = np.array(exato['distancias_recebidas'], dtype=np.float64)
+    if acumulado is not None:
+        soma_distancias += fator_distancia * np.array(acumulado['distancias_recebidas'], dtype=np.float64)
+
+    indices_maior = [v for v in range(n) if componente[v] == maior]
+    tamanho_maior = tamanhos[maior]
+    conjunto_exatas = set(exatas)
+    excentricidades = [exato['excentricidade'][s] for s in indices_maior if s in conjunto_exatas]
+    excentricidades += [acumulado['excentricidade'][s] for s in indices_maior if s in fontes_amostradas]
+    if tamanho_maior <= _TAMANHO_EXATO:
+        diametro = (max(excentricidades), max(excentricidades))
+    else:
+        diametro = limites_do_diametro(vizinhos, indices_maior, max_bfs_diametro, max(excentricidades),
+                                       2 * min(excentricidades))
+    if tamanho_maior > 1:
+        distancia_media = float(soma_distancias[indices_maior].sum()) / (tamanho_maior * (tamanho_maior - 1))
+    else:
+        distancia_media = 0
+    erro_distancia_media = 0.0
+    if maior in pivos and pivos[maior] < sensores_por_componente[maior]:
+        erro_distancia_media = (sensores_por_componente[maior] / tamanho_maior
+                                * _hoeffding(diametro[1] - 1, log_unico, pivos[maior]))
+
+    # Limite da proximidade por nó, a partir do limite da distância média até os outros nós
+    limite_superior_distancia = np.ones(n)
+    for c in amostrados:
+        pivos_c = [s for s in membros[c] if s in fontes_amostradas]
+        if c == maior:
+            limite_superior_distancia[componente_np == c] = diametro[1]
+        elif pivos_c:
+            limite_superior_distancia[componente_np == c] = 2 * min(acumulado['excentricidade'][s] for s in pivos_c)
+    com_amostra = amostrado & (amostras_por_no < populacao)
+    erro_media = np.zeros(n)
+    if com_amostra.any():
+        erro_media[com_amostra] = (
+            populacao[com_amostra] / (tamanho_np[com_amostra] - 1)
+            * (limite_superior_distancia[com_amostra] - 1)
+            * np.sqrt(log_uniao / (2 * np.maximum(amostras_por_no[com_amostra], 1)))
+        )
+    media = np.where(tamanho_np > 1, soma_distancias / np.maximum(tamanho_np - 1, 1), 1.0)
+    erro_proximidade = (tamanho_np - 1) / max(n - 1, 1) * (1 / np.maximum(media - erro_media, 1) - 1 / np.maximum(media, 1))
+    # Componentes sem nenhum pivô (orçamento esgotado antes de chegar a eles) ficam sem limite
+    erro_proximidade[amostrado & (pivos_np == 0)] = float('inf')
+
+    erro_subconjunto = 0.0
+    for c in amostrados:
+        if pivos[c] < sensores_por_componente[c]:
+            amplitude = sensores_por_componente[c] * bases_por_componente.get(c, 0) * escala
+            erro_subconjunto = max(erro_subconjunto, _hoeffding(amplitude, log_uniao, pivos[c]))
+
+    return {
+        'intermediacao': intermediacao.tolist(),
+        'sensores_para_bases': sensores_para_bases.tolist(),
+        'bases_para_sensores': list(exato['bases_para_sensores']),
+        'soma_distancias': soma_distancias.tolist(),
+        'alcancados': [tamanhos[c] for c in componente],
+        'componente': componente,
+        'diametro': diametro,
+        'distancia_media': distancia_media,
+        'erros': {
+            'centralidade_de_intermediacao': erro_intermediacao(),
+            'betweenness_sensores_para_bases': erro_subconjunto,
+            'betweenness_bases_para_sensores': 0.0,
+            'centralidade_de_proximidade': float(erro_proximidade.max()) if n else 0.0,
+            'diametro_rede': diametro[1] - diametro[0],
+            'distancia_media': erro_distancia_media,
+            'confianca': confianca,
+            'pivos': len(exatas) + usados,
+            'segundos': time.perf_counter() - inicio,
+        },
+    }
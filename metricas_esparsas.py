@@ -0,0 +1,87 @@
+import networkx
+import numpy as np
+
+try:
+    from scipy import sparse
+except ImportError:  # scipy é opcional: sem ele as métricas espectrais e locais usam o networkx
+    sparse = None
+# csr_array e diags_array só existem a partir do scipy 1.11; antes disso, usa o networkx
+if sparse is not None and not (hasattr(sparse, 'csr_array') and hasattr(sparse, 'diags_array')):
+    sparse = None
+
+def matriz_de_adjacencia(topologia):
+    """Matriz de adjacência esparsa (CSR, float64) montada direto do CSR da topologia."""
+    n = topologia.num_nos
+    dados = np.ones(len(topologia.indices), dtype=np.float64)
+    return sparse.csr_array((dados, topologia.indices, topologia.indptr), shape=(n, n))
+
+def centralidade_de_grau(graus):
+    """Grau / (n - 1), como networkx.degree_centrality (1 para o grafo de um nó só)."""
+    n = len(graus)
+    if n <= 1:
+        return np.ones(n)
+    return graus * (1 / (n - 1))
+
+def triangulos(A):
+    """Número de triângulos de cada nó: diag(A³) / 2, via (A @ A) ∘ A."""
+    return np.asarray((A @ A).multiply(A).sum(axis=1)).ravel() / 2
+
+def agrupamento(triangulos, graus):
+    """Coeficiente de agrupamento local 2T / (d(d - 1)), 0 para nós de grau < 2."""
+    possiveis = graus * (graus - 1.0)
+    resultado = np.zeros(len(graus))
+    np.divide(2 * triangulos, possiveis, out=resultado, where=possiveis > 0)
+    return resultado
+
+def assortatividade_de_grau(topologia):
+    """
+    Correlação de Pearson entre os graus das pontas de cada aresta (nos dois
+    sentidos), como networkx.degree_assortativity_coefficient. NaN se todos
+    os graus das pontas forem iguais ou não houver arestas.
+    """
+    graus = topologia.graus.astype(np.float64)
+    origem = np.repeat(graus, topologia.graus)
+    destino = graus[topologia.indices]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        if len(origem) == 0:
+            return float('nan')
+        x = origem - origem.mean()
+        y = destino - destino.mean()
+        return float((x * y).sum() / np.sqrt((x * x).sum() * (y * y).sum()))
+
+def autovetor(A, max_iter=1000, tol=1e-05):
+    """
+    Centralidade de autovetor por iteração de potência com (A + I), normalização
+    L2 e critério de parada em norma L1 < n·tol, a mesma iteração de
+    networkx.eigenvector_centrality.
+    """
+    n = A.shape[0]
+    if n == 0:
+        return np.zeros(0)
+    x = np.full(n, 1.0 / n)
+    for _ in range(max_iter):
+        anterior = x
+        x = anterior + A @ anterior
+        x /= np.linalg.norm(x) or 1
+        if np.abs(x - anterior).sum() < n * tol:
+            return x
+    raise networkx.PowerIterationFailedConvergence(max_iter)
+
+def pagerank(A, alpha=0.85, max_iter=100, tol=1e-06):
+    """PageRank com teleporte e nós sem vizinhos uniformes, a mesma iteração de networkx.pagerank."""
+    n = A.shape[0]
+    if n == 0:
+        return np.zeros(0)
+    graus = np.asarray(A.sum(axis=1)).ravel()
+    inverso = np.zeros(n)
+    np.divide(1.0, graus, out=inverso, where=graus != 0)
+    transicao = sparse.diags_array(inverso).tocsr() @ A
+    sem_saida = np.flatnonzero(graus == 0)
+    uniforme = np.full(n, 1.0 / n)
+    x = uniforme
+    for _ in range(max_iter):
+        anterior = x
+        x = alpha * (anterior @ transicao + anterior[sem_saida].sum() * uniforme) + (1 - alpha) * uniforme
+        if np.abs(x - anterior).sum() < n * tol:
+            return x
+    raise networkx.PowerIterationFailedConvergence(max_iter)
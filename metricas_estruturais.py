@@ -0,0 +1,330 @@
+import copy
+
+import networkx
+import numpy as np
+
+from caminhos_minimos import (
+    blocos_biconexos, componentes_conexos, maior_componente, normalizar_intermediacao, percorrer_fontes, proximidade
+)
+from conectividade import conectividade_de_arestas, conectividade_de_nos
+from metricas_aproximadas import estimar_caminhos
+import metricas_esparsas
+from topologia import Topologia, TIPO_ESTACAO_BASE
+
+# Registro de métricas estruturais: nome -> função que recebe MetricasEstruturais.
+# Nomes iniciados por '_' são resultados intermediários compartilhados, não
+# devolvidos por executar_simulacao.
+REGISTRO = {}
+# Substitutos usados no modo aproximado (ver metricas_aproximadas.py)
+REGISTRO_APROXIMADO = {}
+
+def metrica(nome, aproximada=False):
+    """Decorador que registra uma métrica estrutural com o nome da chave em `metricas`."""
+    def registrar(funcao):
+        (REGISTRO_APROXIMADO if aproximada else REGISTRO)[nome] = funcao
+        return funcao
+    return registrar
+
+class MetricasEstruturais:
+    """
+    Métricas estruturais de uma topologia, calculadas sob demanda e memorizadas.
+
+    `m['nome']` calcula a métrica na primeira vez e devolve o valor guardado
+    nas seguintes; métricas que dependem de outras (ex.: número de pontes)
+    reaproveitam o que já foi calculado.
+
+    Com `aproximacao` (parâmetros de metricas_aproximadas.estimar_caminhos),
+    as métricas de caminhos mínimos são estimadas por amostragem de pivôs e
+    'erros_aproximacao' traz o limite de erro de cada uma.
+
+    Com `orcamento_conectividade` (segundos), as conectividades de arestas e
+    de nós param ao esgotá-lo e valem o limite inferior conhecido; os dois
+    limites ficam em 'limites_conectividade'.
+    """
+
+    def __init__(self, topologia, aproximacao=None, orcamento_conectividade=None):
+        self.topologia = topologia
+        self.aproximacao = aproximacao
+        self.orcamento_conectividade = orcamento_conectividade
+        self._valores = {}
+
+    @property
+    def G(self):
+        return self.topologia.grafo
+
+    def __getitem__(self, nome):
+        if nome not in self._valores:
+            funcao = REGISTRO_APROXIMADO.get(nome) if self.aproximacao else None
+            funcao = funcao or REGISTRO.get(nome)
+            if funcao is None:
+                raise KeyError(f"Métrica estrutural desconhecida: {nome}")
+            self._valores[nome] = funcao(self)
+        return self._valores[nome]
+
+    def __contains__(self, nome):
+        return nome in self._valores
+
+    def calcular(self, nomes):
+        """
+        Dicionário {nome: valor} só com as métricas pedidas.
+
+        Dicionários e listas são copiados, para que quem recebe o resultado
+        possa alterá-lo sem mexer nos valores memorizados.
+        """
+        return {nome: copy.copy(self[nome]) for nome in nomes}
+
+def metricas_de(rede, aproximacao=None, orcamento_conectividade=None):
+    """
+    MetricasEstruturais memorizadas por topologia (e parâmetros de aproximação e orçamento).
+
+    Uma Topologia é imutável, então chamadas repetidas com a mesma topologia
+    (varreduras, réplicas, o app) reaproveitam as métricas já calculadas. Um
+    networkx.Graph é convertido a cada chamada e não é memorizado.
+    """
+    if not isinstance(rede, Topologia):
+        return MetricasEstruturais(Topologia.de_grafo(rede), aproximacao, orcamento_conectividade)
+    if getattr(rede, '_metricas_estruturais', None) is None:
+        rede._metricas_estruturais = {}
+    chave = (tuple(sorted(aproximacao.items())) if aproximacao else None, orcamento_conectividade)
+    if chave not in rede._metricas_estruturais:
+        rede._metricas_estruturais[chave] = MetricasEstruturais(rede, aproximacao, orcamento_conectividade)
+    return rede._metricas_estruturais[chave]
+
+# --- Caminhos mínimos e componentes (intermediários) ---
+
+@metrica('_caminhos')
+def _caminhos(m):
+    # Uma BFS por nó alimenta intermediação (geral e por subconjunto), proximidade, diâmetro e distância média
+    topologia = m.topologia
+    eh_base = (topologia.tipos == TIPO_ESTACAO_BASE).tolist()
+    return percorrer_fontes(topologia.listas_de_vizinhos(), range(topologia.num_nos), eh_base)
+
+@metrica('_caminhos', aproximada=True)
+def _caminhos_aproximados(m):
+    topologia = m.topologia
+    eh_base = (topologia.tipos == TIPO_ESTACAO_BASE).tolist()
+    return estimar_caminhos(topologia.listas_de_vizinhos(), eh_base, **m.aproximacao)
+
+@metrica('erros_aproximacao', aproximada=True)
+def _erros_aproximacao(m):
+    # Limites de erro absoluto (com probabilidade 'confianca') das métricas estimadas
+    return m['_caminhos']['erros']
+
+@metrica('_componentes')
+def _componentes(m):
+    # (menor índice do componente de cada nó, {representante: tamanho})
+    return componentes_conexos(m.topologia.listas_de_vizinhos())
+
+@metrica('_blocos')
+def _blocos(m):
+    # Componentes biconexos (blocos da árvore de blocos e articulações) como conjuntos de índices densos
+    return blocos_biconexos(m.topologia.listas_de_vizinhos())
+
+@metrica('_indices_maior_componente')
+def _indices_maior_componente(m):
+    return maior_componente(m['_caminhos']['componente'], m['_caminhos']['alcancados'])
+
+@metrica('_adjacencia')
+def _adjacencia(m):
+    # Matriz esparsa das métricas espectrais e locais (None sem scipy: usa o networkx)
+    return metricas_esparsas.matriz_de_adjacencia(m.topologia) if metricas_esparsas.sparse is not None else None
+
+@metrica('_comunidades')
+def _comunidades(m):
+    # Algoritmo de Louvain
+    try:
+        import networkx.algorithms.community as nx_comm
+        return nx_comm.louvain_communities(m.G, seed=42)
+    except (ImportError, networkx.NetworkXError):
+        return None
+
+# --- Centralidades ---
+
+@metrica('centralidade_de_grau')
+def _centralidade_de_grau(m):
+    return m.topologia.para_dicionario(metricas_esparsas.centralidade_de_grau(m.topologia.graus))
+
+@metrica('centralidade_de_intermediacao')
+def _centralidade_de_intermediacao(m):
+    topologia = m.topologia
+    return topologia.para_dicionario(normalizar_intermediacao(m['_caminhos']['intermediacao'], topologia.num_nos))
+
+@metrica('betweenness_sensores_para_bases')
+def _betweenness_sensores_para_bases(m):
+    # Betweenness de todos os sensores para todas as estações base (padrão típico de RSSF)
+    topologia = m.topologia
+    return topologia.para_dicionario(
+        normalizar_intermediacao(m['_caminhos']['sensores_para_bases'], topologia.num_nos)
+    )
+
+@metrica('betweenness_bases_para_sensores')
+def _betweenness_bases_para_sensores(m):
+    # Betweenness de todas as estações base para todos os sensores (comando/controle)
+    topologia = m.topologia
+    return topologia.para_dicionario(
+        normalizar_intermediacao(m['_caminhos']['bases_para_sensores'], topologia.num_nos)
+    )
+
+@metrica('centralidade_de_proximidade')
+def _centralidade_de_proximidade(m):
+    caminhos = m['_caminhos']
+    return m.topologia.para_dicionario(
+        proximidade(caminhos['soma_distancias'], caminhos['alcancados'], m.topologia.num_nos)
+    )
+
+@metrica('centralidade_de_autovetor')
+def _centralidade_de_autovetor(m):
+    try:
+        if m['_adjacencia'] is None:
+            return networkx.eigenvector_centrality(m.G, max_iter=1000, tol=1e-05)
+        return m.topologia.para_dicionario(metricas_esparsas.autovetor(m['_adjacencia'], max_iter=1000, tol=1e-05))
+    except (networkx.PowerIterationFailedConvergence, networkx.NetworkXError):
+        return dict.fromkeys(m.topologia.rotulos, 0.0)
+
+@metrica('_triangulos')
+def _triangulos(m):
+    return metricas_esparsas.triangulos(m['_adjacencia'])
+
+@metrica('_agrupamento')
+def _agrupamento(m):
+    return metricas_esparsas.agrupamento(m['_triangulos'], m.topologia.graus)
+
+@metrica('centralidade_de_clique')
+def _centralidade_de_clique(m):
+    if m['_adjacencia'] is None:
+        return networkx.clustering(m.G)
+    return m.topologia.para_dicionario(m['_agrupamento'])
+
+@metrica('centralidade_de_pagerank')
+def _centralidade_de_pagerank(m):
+    if m['_adjacencia'] is None:
+        return networkx.pagerank(m.G)
+    return m.topologia.para_dicionario(metricas_esparsas.pagerank(m['_adjacencia']))
+
+# --- Métricas globais ---
+
+@metrica('ordem')
+def _ordem(m):
+    return m.topologia.num_nos  # Número de nós
+
+@metrica('tamanho')
+def _tamanho(m):
+    return m.topologia.num_arestas  # Número de arestas
+
+@metrica('coeficiente_clusterizacao')
+def _coeficiente_clusterizacao(m):
+    if m['_adjacencia'] is None:
+        return networkx.average_clustering(m.G)
+    return float(m['_agrupamento'].mean())
+
+@metrica('assortatividade')
+def _assortatividade(m):
+    return metricas_esparsas.assortatividade_de_grau(m.topologia)
+
+@metrica('modularidade')
+def _modularidade(m):
+    if m['_comunidades'] is None:
+        return 0.0
+    import networkx.algorithms.community as nx_comm
+    return nx_comm.modularity(m.G, m['_comunidades'])
+
+@metrica('numero_comunidades')
+def _numero_comunidades(m):
+    return len(m['_comunidades']) if m['_comunidades'] is not None else 0
+
+# --- Robustez e conectividade ---
+
+@metrica('is_connected')
+def _is_connected(m):
+    return m.topologia.num_nos > 0 and len(m['_componentes'][1]) == 1
+
+@metrica('_limites_conectividade_arestas')
+def _limites_conectividade_arestas(m):
+    if not m['is_connected']:
+        return 0, 0
+    if m['pontes']:
+        return 1, 1
+    return conectividade_de_arestas(m.topologia.listas_de_vizinhos(), 2, m.orcamento_conectividade)
+
+@metrica('_limites_conectividade_nos')
+def _limites_conectividade_nos(m):
+    if not m['is_connected']:
+        return 0, 0
+    if m['pontos_articulacao']:
+        return 1, 1
+    # κ ≤ λ: se a conectividade de arestas já foi calculada, serve de limite superior
+    superior = m['_limites_conectividade_arestas'][1] if '_limites_conectividade_arestas' in m else None
+    return conectividade_de_nos(m.topologia.listas_de_vizinhos(), 2, superior, m.orcamento_conectividade)
+
+@metrica('edge_connectivity')
+def _edge_connectivity(m):
+    # Número mínimo de arestas que precisam ser removidas para desconectar o grafo (limite inferior se o orçamento acabou)
+    return m['_limites_conectividade_arestas'][0]
+
+@metrica('node_connectivity')
+def _node_connectivity(m):
+    # Número mínimo de nós que precisam ser removidos para desconectar o grafo (limite inferior se o orçamento acabou)
+    return m['_limites_conectividade_nos'][0]
+
+@metrica('limites_conectividade')
+def _limites_conectividade(m):
+    # (inferior, superior) de cada conectividade; iguais quando o valor é exato
+    return {'edge_connectivity': m['_limites_conectividade_arestas'],
+            'node_connectivity': m['_limites_conectividade_nos']}
+
+@metrica('pontos_articulacao')
+def _pontos_articulacao(m):
+    # Nós críticos que desconectam a rede: os que estão em mais de um bloco (em ordem de índice)
+    if not m['is_connected']:
+        return []
+    contagem = np.zeros(m.topologia.num_nos, dtype=np.int64)
+    for bloco in m['_blocos']:
+        contagem[list(bloco)] += 1
+    return m.topologia.rotulos_de(np.flatnonzero(contagem >= 2))
+
+@metrica('numero_pontos_articulacao')
+def _numero_pontos_articulacao(m):
+    return len(m['pontos_articulacao'])
+
+@metrica('pontes')
+def _pontes(m):
+    # Arestas críticas que desconectam a rede: blocos de uma única aresta (em ordem de índice)
+    if not m['is_connected']:
+        return []
+    rotulos = m.topologia.rotulos
+    return [(rotulos[u], rotulos[v]) for u, v in sorted(sorted(bloco) for bloco in m['_blocos'] if len(bloco) == 2)]
+
+@metrica('numero_pontes')
+def _numero_pontes(m):
+    return len(m['pontes'])
+
+@metrica('diametro_rede')
+def _diametro_rede(m):
+    # Em grafos desconexos, diâmetro do maior componente
+    indices = m['_indices_maior_componente']
+    if not indices:
+        return float('inf')
+    excentricidade = m['_caminhos']['excentricidade']
+    return max(excentricidade[v] for v in indices)
+
+@metrica('diametro_rede', aproximada=True)
+def _diametro_rede_aproximado(m):
+    # Limite inferior (a excentricidade de um nó real); o superior está em erros_aproximacao
+    return m['_caminhos']['diametro'][0]
+
+@metrica('distancia_media')
+def _distancia_media(m):
+    indices = m['_indices_maior_componente']
+    if not indices:
+        return float('inf')
+    if len(indices) == 1:
+        return 0
+    soma_distancias = m['_caminhos']['soma_distancias']
+    return sum(soma_distancias[v] for v in indices) / (len(indices) * (len(indices) - 1))
+
+@metrica('distancia_media', aproximada=True)
+def _distancia_media_aproximada(m):
+    return m['_caminhos']['distancia_media']
+
+# Todas as métricas públicas, na ordem em que executar_simulacao as devolvia
+TODAS = tuple(nome for nome in REGISTRO if not nome.startswith('_'))
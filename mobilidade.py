@@ -0,0 +1,165 @@
+import copy
+import math
+
+import numpy as np
+
+from network_generator import _arestas_por_grade
+from topologia import TIPO_SENSOR
+
+class ModeloWaypointAleatorio:
+    """
+    Random Waypoint: cada nó sorteia um destino na área e uma velocidade, vai até
+    ele em linha reta, pausa por `pausa` unidades de tempo e sorteia outro destino.
+    """
+
+    def __init__(self, tam_area=100, velocidade_min=0.5, velocidade_max=2.0, pausa=0.0, intervalo=1.0, semente=None):
+        self.tam_area = tam_area
+        self.velocidade_min = velocidade_min
+        self.velocidade_max = velocidade_max
+        self.pausa = pausa
+        self.intervalo = intervalo
+        self.semente = semente
+
+    def iniciar(self, num_nos):
+        self.rng = np.random.default_rng(self.semente)
+        self.destinos = self.rng.uniform(0, self.tam_area, size=(num_nos, 2))
+        self.velocidades = self.rng.uniform(self.velocidade_min, self.velocidade_max, size=num_nos)
+        self.pausa_restante = np.zeros(num_nos)
+
+    def passo(self, posicoes, indices, dt):
+        """Move os nós `indices` por `dt` unidades de tempo, alterando `posicoes` no lugar."""
+        pausados = self.pausa_restante[indices] > 0
+        self.pausa_restante[indices[pausados]] -= dt
+        ativos = indices[~pausados]
+
+        delta = self.destinos[ativos] - posicoes[ativos]
+        distancia = np.hypot(delta[:, 0], delta[:, 1])
+        avanco = self.velocidades[ativos] * dt
+        chegou = distancia <= avanco
+
+        seguindo = ativos[~chegou]
+        fator = (avanco[~chegou] / distancia[~chegou])[:, None]
+        posicoes[seguindo] += delta[~chegou] * fator
+
+        chegaram = ativos[chegou]
+        if len(chegaram):
+            posicoes[chegaram] = self.destinos[chegaram]
+            self.destinos[chegaram] = self.rng.uniform(0, self.tam_area, size=(len(chegaram), 2))
+            self.velocidades[chegaram] = self.rng.uniform(self.velocidade_min, self.velocidade_max, size=len(chegaram))
+            self.pausa_restante[chegaram] = self.pausa
+
+class ModeloGaussMarkov:
+    """
+    Gauss-Markov: velocidade e direção evoluem como processos autorregressivos
+    com memória `alfa` (0 = movimento aleatório, 1 = movimento retilíneo). Perto
+    das bordas, a direção média aponta para o centro da área.
+    """
+
+    def __init__(self, tam_area=100, velocidade_media=1.0, desvio_velocidade=0.3, desvio_direcao=0.5,
+                 alfa=0.75, margem=None, intervalo=1.0, semente=None):
+        self.tam_area = tam_area
+        self.velocidade_media = velocidade_media
+        self.desvio_velocidade = desvio_velocidade
+        self.desvio_direcao = desvio_direcao
+        self.alfa = alfa
+        self.margem = tam_area * 0.1 if margem is None else margem
+        self.intervalo = intervalo
+        self.semente = semente
+
+    def iniciar(self, num_nos):
+        self.rng = np.random.default_rng(self.semente)
+        self.velocidades = np.full(num_nos, float(self.velocidade_media))
+        self.direcoes = self.rng.uniform(0, 2 * math.pi, size=num_nos)
+        self.direcoes_medias = self.direcoes.copy()
+
+    def passo(self, posicoes, indices, dt):
+        """Move os nós `indices` por `dt` unidades de tempo, alterando `posicoes` no lugar."""
+        alfa = self.alfa
+        ruido = math.sqrt(1 - alfa * alfa)
+        pos = posicoes[indices]
+
+        # Perto das bordas, a direção média passa a apontar para o centro da área
+        centro = self.tam_area / 2
+        perto_da_borda = ((pos < self.margem) | (pos > self.tam_area - self.margem)).any(axis=1)
+        self.direcoes_medias[indices[perto_da_borda]] = np.arctan2(
+            centro - pos[perto_da_borda, 1], centro - pos[perto_da_borda, 0]
+        )
+
+        self.velocidades[indices] = np.maximum(
+            alfa * self.velocidades[indices] + (1 - alfa) * self.velocidade_media
+            + ruido * self.rng.normal(0, self.desvio_velocidade, size=len(indices)),
+            0.0
+        )
+        self.direcoes[indices] = (
+            alfa * self.direcoes[indices] + (1 - alfa) * self.direcoes_medias[indices]
+            + ruido * self.rng.normal(0, self.desvio_direcao, size=len(indices))
+        )
+
+        velocidade = self.velocidades[indices] * dt
+        pos[:, 0] += velocidade * np.cos(self.direcoes[indices])
+        pos[:, 1] += velocidade * np.sin(self.direcoes[indices])
+        posicoes[indices] = np.clip(pos, 0, self.tam_area)
+
+class TopologiaDinamica:
+    """
+    Estado vivo da topologia durante uma simulação com nós móveis.
+
+    `vizinhos` é a mesma lista de listas usada pelo roteador. As listas são
+    substituídas (nunca alteradas no lugar), então um roteador que já está
+    percorrendo os vizinhos de um nó não é afetado no meio da iteração, e os
+    próximos roteadores já enxergam os enlaces novos.
+
+    O modelo de mobilidade é copiado (iniciar() guarda nele o estado da
+    execução), então a mesma instância pode ser usada em várias simulações.
+    """
+
+    def __init__(self, topologia, modelo, mover_estacoes_base=False):
+        if topologia.raio_comunicacao is None:
+            raise ValueError("A mobilidade requer uma topologia com raio_comunicacao (ex.: RSSF).")
+        self.raio = topologia.raio_comunicacao
+        self.posicoes = topologia.posicoes.copy()
+        self.vizinhos = list(topologia.listas_de_vizinhos())
+        self.moveis = np.arange(topologia.num_nos) if mover_estacoes_base else topologia.indices_do_tipo(TIPO_SENSOR)
+        # Enlaces atuais como chaves u * n + v (u < v), em ordem crescente
+        n = topologia.num_nos
+        origens = np.repeat(np.arange(n, dtype=np.int64), np.diff(topologia.indptr))
+        destinos = topologia.indices.astype(np.int64)
+        self.chaves = np.sort(origens[origens < destinos] * n + destinos[origens < destinos])
+        self.modelo = copy.copy(modelo)
+        self.modelo.iniciar(n)
+        self.enlaces_criados = 0
+        self.enlaces_desfeitos = 0
+
+    def passo(self, dt):
+        """
+        Move os nós móveis e atualiza só as listas dos nós cujos enlaces mudaram.
+
+        Os enlaces são recalculados de forma vetorizada pela grade espacial e
+        comparados com os anteriores; enlaces desfeitos são aplicados antes dos
+        criados, cada grupo em ordem crescente de (u, v).
+        """
+        self.modelo.passo(self.posicoes, self.moveis, dt)
+        n = len(self.vizinhos)
+        arestas = _arestas_por_grade(self.posicoes, self.raio)
+        chaves = arestas[:, 0] * n + arestas[:, 1]  # Já em ordem crescente (ordem lexicográfica)
+        desfeitos = np.setdiff1d(self.chaves, chaves, assume_unique=True)
+        criados = np.setdiff1d(chaves, self.chaves, assume_unique=True)
+        self.chaves = chaves
+        vizinhos = self.vizinhos
+        for chave in desfeitos.tolist():
+            u, v = divmod(chave, n)
+            vizinhos[u] = [w for w in vizinhos[u] if w != v]
+            vizinhos[v] = [w for w in vizinhos[v] if w != u]
+        for chave in criados.tolist():
+            u, v = divmod(chave, n)
+            vizinhos[u] = vizinhos[u] + [v]
+            vizinhos[v] = vizinhos[v] + [u]
+        self.enlaces_desfeitos += len(desfeitos)
+        self.enlaces_criados += len(criados)
+
+def processo_mobilidade(env, dinamica):
+    """Um processo SimPy que avança o modelo de mobilidade a cada `intervalo` unidades de tempo."""
+    intervalo = dinamica.modelo.intervalo
+    while True:
+        yield env.timeout(intervalo)
+        dinamica.passo(intervalo)
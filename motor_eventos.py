@@ -0,0 +1,85 @@
+import heapq
+
+import simpy
+
+# Prioridades, com a mesma semântica do SimPy: o início de um processo
+# (URGENTE) roda antes dos timeouts (NORMAL) marcados para o mesmo instante
+URGENTE = 0
+NORMAL = 1
+
+class MotorLeve:
+    """
+    Motor de eventos discretos mínimo, compatível com o subconjunto do SimPy
+    usado pela simulação: `now`, `timeout(atraso)`, `process(gerador)` e
+    `run(until=...)`.
+
+    Não há objetos Event: `timeout` devolve o próprio atraso, e cada entrada
+    da fila é uma tupla (instante, prioridade, sequência, processo). Um
+    processo é retomado com `next()` e o valor que ele produz é o atraso até
+    a próxima retomada. Também aceita callbacks simples via `agendar` e
+    `iniciar`; uma fila só de callbacks com argumentos simples pode ser
+    gravada com pickle (ver checkpoint.py).
+
+    A ordem dos eventos é a mesma do SimPy (instante, prioridade, ordem de
+    agendamento), então gerador_de_pacotes e roteador produzem resultados
+    idênticos nos dois motores.
+    """
+
+    def __init__(self, inicio=0):
+        self.now = inicio
+        self._fila = []
+        self._sequencia = 0
+        self.eventos_processados = 0
+
+    def timeout(self, atraso):
+        return atraso
+
+    def process(self, gerador):
+        """Inicia um processo (gerador) no instante atual, antes dos timeouts pendentes."""
+        heapq.heappush(self._fila, (self.now, URGENTE, self._sequencia, gerador))
+        self._sequencia += 1
+        return gerador
+
+    def agendar(self, atraso, callback, *argumentos):
+        """Agenda uma função comum para rodar daqui a `atraso` unidades de tempo."""
+        heapq.heappush(self._fila, (self.now + atraso, NORMAL, self._sequencia, (callback, argumentos)))
+        self._sequencia += 1
+
+    def iniciar(self, callback, *argumentos):
+        """Agenda uma função para o instante atual com a prioridade do início de um processo."""
+        heapq.heappush(self._fila, (self.now, URGENTE, self._sequencia, (callback, argumentos)))
+        self._sequencia += 1
+
+    def run(self, until=None):
+        fila = self._fila
+        heappop, heappush = heapq.heappop, heapq.heappush
+        limite = float('inf') if until is None else until
+        processados = 0
+        while fila and fila[0][0] < limite:
+            instante, _, _, alvo = heappop(fila)
+            self.now = instante
+            processados += 1
+            if type(alvo) is tuple:
+                callback, argumentos = alvo
+                callback(*argumentos)
+                continue
+            try:
+                atraso = next(alvo)
+            except StopIteration:
+                continue
+            heappush(fila, (instante + atraso, NORMAL, self._sequencia, alvo))
+            self._sequencia += 1
+        self.eventos_processados += processados
+        if until is not None:
+            self.now = until
+
+class AmbienteSimPyContador(simpy.Environment):
+    """simpy.Environment que conta os eventos processados, como MotorLeve.eventos_processados."""
+
+    def __init__(self, inicio=0):
+        super().__init__(inicio)
+        self.eventos_processados = 0
+
+    def step(self):
+        self.eventos_processados += 1
+        super().step()
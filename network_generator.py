@@ -1,18 +1,34 @@
 import networkx as nx
+import numpy as np
 import random
-import math
 
-def _adicionar_posicoes_aleatorias(G, tam_area=100):
+from topologia import Topologia, TIPO_ESTACAO_BASE
+
+def gerador_aleatorio(semente=None):
+    """
+    Normaliza o parâmetro `semente` aceito pelos geradores e pela simulação.
+
+    - None: usa o módulo `random` global (comportamento histórico)
+    - random.Random: usa a própria instância
+    - qualquer outro valor: cria um random.Random(semente) independente
+    """
+    if semente is None:
+        return random
+    if isinstance(semente, random.Random):
+        return semente
+    return random.Random(semente)
+
+def _adicionar_posicoes_aleatorias(G, tam_area=100, rng=random):
     """Adiciona posições 2D aleatórias a todos os nós de um grafo."""
     for no in G.nodes():
-        G.nodes[no]['pos'] = (random.uniform(0, tam_area), random.uniform(0, tam_area))
+        G.nodes[no]['pos'] = (rng.uniform(0, tam_area), rng.uniform(0, tam_area))
     return G
 
-def _designar_estacoes_base(G, num_estacoes_base=1):
+def _designar_estacoes_base(G, num_estacoes_base=1, rng=random):
     """Converte um número de nós aleatórios em estações base."""
     if num_estacoes_base > 0 and len(G.nodes()) >= num_estacoes_base:
         nos_candidatos = list(G.nodes())
-        nos_selecionados = random.sample(nos_candidatos, num_estacoes_base)
+        nos_selecionados = rng.sample(nos_candidatos, num_estacoes_base)
         for no in nos_selecionados:
             G.nodes[no]['type'] = 'base_station'
     # Define o tipo padrão para os outros nós
@@ -21,62 +37,128 @@ def _designar_estacoes_base(G, num_estacoes_base=1):
             G.nodes[no]['type'] = 'sensor'
     return G
 
-def criar_grafo_rssf(num_nos=100, tam_area=100, raio_comunicacao=15, num_estacoes_base=1):
+# Células da grade por eixo em _arestas_por_grade; (2^30 + 3)^2 cabe com folga em um int64
+_MAX_CELULAS_POR_EIXO = 2 ** 30
+
+def _arestas_por_grade(posicoes, raio):
     """
-    Cria um grafo de Rede de Sensores Sem Fio (RSSF) com base na proximidade.
+    Encontra todos os pares de nós a uma distância <= raio usando uma grade uniforme.
+
+    Cada nó é colocado em uma célula de lado `raio`, de modo que os vizinhos só
+    podem estar na própria célula ou nas 8 adjacentes. Percorremos apenas metade
+    desse estêncil (cada par de células uma única vez) e testamos as distâncias
+    de forma vetorizada. Retorna um array (m, 2) de índices com i < j, em ordem
+    lexicográfica — a mesma ordem em que o laço duplo original inseria as arestas.
     """
-    G = nx.Graph()
-    
-    # Adiciona as estações base em posições aleatórias
-    for i in range(num_estacoes_base):
-        pos = (random.uniform(0, tam_area), random.uniform(0, tam_area))
-        G.add_node(f'base_{i}', id=f'base_{i}', pos=pos, type='base_station', raio_comunicacao=raio_comunicacao)
-
-    # Adiciona os nós sensores
-    for i in range(num_nos):
-        pos = (random.uniform(0, tam_area), random.uniform(0, tam_area))
-        G.add_node(i, id=i, pos=pos, type='sensor', raio_comunicacao=raio_comunicacao)
-
-    # Adiciona as arestas com base no raio de comunicação
-    nos = list(G.nodes())
-    for i in range(len(nos)):
-        for j in range(i + 1, len(nos)):
-            no1 = nos[i]
-            no2 = nos[j]
-            dist = math.sqrt((G.nodes[no1]['pos'][0] - G.nodes[no2]['pos'][0])**2 + 
-                             (G.nodes[no1]['pos'][1] - G.nodes[no2]['pos'][1])**2)
-            if dist <= raio_comunicacao:
-                G.add_edge(no1, no2)
+    n = len(posicoes)
+    if n < 2 or raio < 0:
+        return np.empty((0, 2), dtype=np.int64)
 
-    return G
+    deslocadas = posicoes - posicoes.min(axis=0)
+    # A chave da célula (coluna * num_linhas + linha) é um int64: com um raio muito
+    # pequeno para a área, as células crescem (até 2^30 por eixo) para a chave não
+    # estourar. Células maiores que o raio só trazem mais pares candidatos.
+    tam_celula = max(raio if raio > 0 else 1.0, float(deslocadas.max()) / _MAX_CELULAS_POR_EIXO)
+    celulas = np.floor(deslocadas / tam_celula).astype(np.int64)
+    num_linhas = int(celulas[:, 1].max()) + 3  # Folga para os deslocamentos -1/+1
+
+    # Ordena os nós por célula para que cada célula ocupe um trecho contíguo
+    chaves = celulas[:, 0] * num_linhas + (celulas[:, 1] + 1)
+    ordem = np.argsort(chaves, kind='stable')
+    chaves_ordenadas = chaves[ordem]
+    pos_ordenadas = posicoes[ordem]
+
+    blocos = []
+    for dx, dy in ((0, 0), (0, 1), (1, -1), (1, 0), (1, 1)):
+        # Intervalo [inicio, fim) da célula vizinha para cada nó
+        chaves_vizinhas = chaves_ordenadas + dx * num_linhas + dy
+        inicio = np.searchsorted(chaves_ordenadas, chaves_vizinhas, side='left')
+        fim = np.searchsorted(chaves_ordenadas, chaves_vizinhas, side='right')
+        if dx == 0 and dy == 0:
+            # Na própria célula, só os pares (p, q) com q > p
+            inicio = np.maximum(inicio, np.arange(n) + 1)
+        contagens = np.maximum(fim - inicio, 0)
+        total = int(contagens.sum())
+        if total == 0:
+            continue
+
+        # Expande os intervalos em pares candidatos sem laço Python
+        p = np.repeat(np.arange(n), contagens)
+        deslocamento = np.arange(total) - np.repeat(np.cumsum(contagens) - contagens, contagens)
+        q = np.repeat(inicio, contagens) + deslocamento
 
-def criar_grafo_aleatorio(num_nos, p_conexao=0.1, tam_area=100, num_estacoes_base=1):
+        delta = pos_ordenadas[p] - pos_ordenadas[q]
+        dist = np.sqrt(delta[:, 0] * delta[:, 0] + delta[:, 1] * delta[:, 1])
+        dentro = dist <= raio
+        blocos.append(np.stack((ordem[p[dentro]], ordem[q[dentro]]), axis=1))
+
+    if not blocos:
+        return np.empty((0, 2), dtype=np.int64)
+    arestas = np.concatenate(blocos)
+    arestas.sort(axis=1)
+    return arestas[np.lexsort((arestas[:, 1], arestas[:, 0]))]
+
+def criar_topologia_rssf(num_nos=100, tam_area=100, raio_comunicacao=15, num_estacoes_base=1, semente=None):
+    """
+    Cria uma RSSF diretamente na representação compacta (Topologia), sem networkx.
+    """
+    rng = gerador_aleatorio(semente)
+    # Estações base primeiro, depois os sensores (mesma ordem de sorteio de sempre)
+    posicoes = np.array(
+        [(rng.uniform(0, tam_area), rng.uniform(0, tam_area)) for _ in range(num_estacoes_base + num_nos)],
+        dtype=float
+    ).reshape(-1, 2)
+    rotulos = [f'base_{i}' for i in range(num_estacoes_base)] + list(range(num_nos))
+    tipos = np.zeros(num_estacoes_base + num_nos, dtype=np.uint8)
+    tipos[:num_estacoes_base] = TIPO_ESTACAO_BASE
+
+    arestas = _arestas_por_grade(posicoes, raio_comunicacao)
+    return Topologia.de_arestas(posicoes, arestas, tipos, rotulos, raio_comunicacao)
+
+def criar_grafo_rssf(num_nos=100, tam_area=100, raio_comunicacao=15, num_estacoes_base=1, semente=None):
+    """
+    Cria um grafo de Rede de Sensores Sem Fio (RSSF) com base na proximidade.
+    """
+    return criar_topologia_rssf(num_nos, tam_area, raio_comunicacao, num_estacoes_base, semente).grafo
+
+def criar_grafo_aleatorio(num_nos, p_conexao=0.1, tam_area=100, num_estacoes_base=1, semente=None):
     """
     Cria um grafo aleatório (Erdős-Rényi) e designa estações base.
     """
-    G = nx.erdos_renyi_graph(n=num_nos, p=p_conexao)
-    G = _adicionar_posicoes_aleatorias(G, tam_area)
-    G = _designar_estacoes_base(G, num_estacoes_base)
+    rng = gerador_aleatorio(semente)
+    G = nx.erdos_renyi_graph(n=num_nos, p=p_conexao, seed=rng)
+    G = _adicionar_posicoes_aleatorias(G, tam_area, rng)
+    G = _designar_estacoes_base(G, num_estacoes_base, rng)
     return G
 
-def criar_grafo_barabasi_albert(num_nos, m_conexoes=2, tam_area=100, num_estacoes_base=1):
+def criar_grafo_barabasi_albert(num_nos, m_conexoes=2, tam_area=100, num_estacoes_base=1, semente=None):
     """
     Cria um grafo Barabási-Albert e designa estações base.
     """
     if num_nos <= m_conexoes:
         m_conexoes = num_nos - 1 if num_nos > 1 else 1
-    G = nx.barabasi_albert_graph(n=num_nos, m=m_conexoes)
-    G = _adicionar_posicoes_aleatorias(G, tam_area)
-    G = _designar_estacoes_base(G, num_estacoes_base)
+    rng = gerador_aleatorio(semente)
+    G = nx.barabasi_albert_graph(n=num_nos, m=m_conexoes, seed=rng)
+    G = _adicionar_posicoes_aleatorias(G, tam_area, rng)
+    G = _designar_estacoes_base(G, num_estacoes_base, rng)
     return G
 
-def criar_grafo_watts_strogatz(num_nos, k_vizinhos=4, p_reconectar=0.1, tam_area=100, num_estacoes_base=1):
+def criar_grafo_watts_strogatz(num_nos, k_vizinhos=4, p_reconectar=0.1, tam_area=100, num_estacoes_base=1, semente=None):
     """
     Cria um grafo Watts-Strogatz e designa estações base.
     """
     if num_nos <= k_vizinhos:
         k_vizinhos = num_nos - 1 if num_nos > 1 else 1
-    G = nx.watts_strogatz_graph(n=num_nos, k=k_vizinhos, p=p_reconectar)
-    G = _adicionar_posicoes_aleatorias(G, tam_area)
-    G = _designar_estacoes_base(G, num_estacoes_base)
-    return G
\ No newline at end of file
+    rng = gerador_aleatorio(semente)
+    G = nx.watts_strogatz_graph(n=num_nos, k=k_vizinhos, p=p_reconectar, seed=rng)
+    G = _adicionar_posicoes_aleatorias(G, tam_area, rng)
+    G = _designar_estacoes_base(G, num_estacoes_base, rng)
+    return G
+
+# Geradores disponíveis, pelo mesmo nome usado na interface
+GERADORES = {
+    'rssf': criar_grafo_rssf,
+    'aleatoria': criar_grafo_aleatorio,
+    'barabasi_albert': criar_grafo_barabasi_albert,
+    'watts_strogatz': criar_grafo_watts_strogatz,
+}
@@ -0,0 +1,146 @@
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+from motor_eventos import AmbienteSimPyContador, MotorLeve
+
+# Parâmetros padrão do perfil: 'memoria' liga o tracemalloc (pico de memória
+# por fase), que deixa a execução bem mais lenta
+PERFIL_PADRAO = {'memoria': False}
+
+def resolver_perfil(perfil):
+    """
+    Normaliza o parâmetro `perfil` de executar_simulacao.
+
+    None ou False desliga; True liga com PERFIL_PADRAO; um dicionário
+    sobrescreve PERFIL_PADRAO.
+    """
+    if not perfil:
+        return None
+    if perfil is True:
+        perfil = {}
+    return {**PERFIL_PADRAO, **perfil}
+
+class Perfil:
+    """
+    Instrumentação opcional de uma execução de executar_simulacao.
+
+    `fase(nome)` mede o tempo de relógio e a variação do número de blocos
+    alocados pelo Python (sys.getallocatedblocks) de um trecho; com
+    'memoria', também o pico de memória do trecho (tracemalloc). Os
+    contadores de eventos e processos vêm do motor instrumentado (ver
+    motor()), então os processos de geração e roteamento não mudam e a
+    execução sem perfil não paga nada.
+    """
+
+    def __init__(self, parametros):
+        self.memoria = parametros['memoria']
+        self.fases = {}
+        self.env = None
+        self._iniciou_tracemalloc = False
+        if self.memoria and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._iniciou_tracemalloc = True
+        self._inicio = time.perf_counter()
+
+    @contextmanager
+    def fase(self, nome, **detalhes):
+        """Mede o trecho do bloco `with` como a fase `nome` (tempos de fases repetidas se somam)."""
+        if self.memoria:
+            tracemalloc.reset_peak()
+            memoria_inicial = tracemalloc.get_traced_memory()[0]
+        blocos = sys.getallocatedblocks()
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            segundos = time.perf_counter() - inicio
+            medida = self.fases.setdefault(nome, {'segundos': 0.0, 'blocos_alocados': 0, **detalhes})
+            medida['segundos'] += segundos
+            medida['blocos_alocados'] += sys.getallocatedblocks() - blocos
+            if self.memoria:
+                pico = tracemalloc.get_traced_memory()[1] - memoria_inicial
+                medida['memoria_pico_bytes'] = max(medida.get('memoria_pico_bytes', 0), pico)
+
+    def motor(self, motor, metricas):
+        """Motor de eventos `motor` ('simpy' ou 'leve') que conta processos iniciados e pacotes em trânsito."""
+        fabrica = MotorLeveInstrumentado if motor == 'leve' else AmbienteSimPyInstrumentado
+        self.env = fabrica(metricas)
+        return self.env
+
+    def resumo(self):
+        """Seção 'perfil' das métricas: fases, totais e contadores do motor."""
+        resumo = {'segundos_total': time.perf_counter() - self._inicio, 'fases': self.fases}
+        if self.env is not None:
+            segundos = self.fases.get('eventos', {}).get('segundos', 0.0)
+            resumo['eventos'] = self.env.eventos_processados
+            resumo['eventos_por_segundo'] = self.env.eventos_processados / segundos if segundos else 0.0
+            resumo['processos'] = dict(self.env.processos)
+            resumo['pico_pacotes_em_transito'] = self.env.pico_em_transito
+        if self.memoria:
+            resumo['memoria_pico_bytes'] = max((fase.get('memoria_pico_bytes', 0) for fase in self.fases.values()),
+                                               default=0)
+            if self._iniciou_tracemalloc:
+                tracemalloc.stop()
+                self._iniciou_tracemalloc = False
+        return resumo
+
+def _contar_processo(env, nome):
+    # Geradores (gerador_de_pacotes, roteador...) e callbacks (_rotear...) pelo nome da função
+    processos = env.processos
+    processos[nome] = processos.get(nome, 0) + 1
+    # Cada pacote entra em trânsito logo antes de o seu primeiro roteador ser
+    # iniciado, então conferir aqui acha o pico exato
+    em_transito = env.metricas['pacotes_em_transito']
+    if em_transito > env.pico_em_transito:
+        env.pico_em_transito = em_transito
+
+class MotorLeveInstrumentado(MotorLeve):
+    """MotorLeve que conta os processos iniciados por tipo e o pico de pacotes em trânsito."""
+
+    def __init__(self, metricas, inicio=0):
+        super().__init__(inicio)
+        self.metricas = metricas
+        self.processos = {}
+        self.pico_em_transito = 0
+
+    def process(self, gerador):
+        _contar_processo(self, gerador.__name__)
+        return super().process(gerador)
+
+    def iniciar(self, callback, *argumentos):
+        _contar_processo(self, callback.__name__.lstrip('_'))
+        super().iniciar(callback, *argumentos)
+
+class AmbienteSimPyInstrumentado(AmbienteSimPyContador):
+    """AmbienteSimPyContador que conta os processos iniciados por tipo e o pico de pacotes em trânsito."""
+
+    def __init__(self, metricas, inicio=0):
+        super().__init__(inicio)
+        self.metricas = metricas
+        self.processos = {}
+        self.pico_em_transito = 0
+
+    def process(self, gerador):
+        _contar_processo(self, gerador.__name__)
+        return super().process(gerador)
+
+def formatar_perfil(resumo):
+    """Linhas de texto com a seção 'perfil' das métricas, as fases mais caras primeiro."""
+    linhas = [f"Tempo total: {resumo['segundos_total']:.3f}s"]
+    for nome, fase in sorted(resumo['fases'].items(), key=lambda item: item[1]['segundos'], reverse=True):
+        linha = f"  {nome}: {fase['segundos']:.4f}s, {fase['blocos_alocados']:+d} blocos"
+        if 'memoria_pico_bytes' in fase:
+            linha += f", pico {fase['memoria_pico_bytes'] / 1024:.1f} KiB"
+        if fase.get('memorizada'):
+            linha += " (memorizada)"
+        linhas.append(linha)
+    if 'eventos' in resumo:
+        linhas.append(f"Eventos: {resumo['eventos']} ({resumo['eventos_por_segundo']:,.0f}/s)")
+        processos = ', '.join(f"{nome}: {contagem}" for nome, contagem in resumo['processos'].items())
+        linhas.append(f"Processos iniciados: {processos}")
+        linhas.append(f"Pico de pacotes em trânsito: {resumo['pico_pacotes_em_transito']}")
+    if 'memoria_pico_bytes' in resumo:
+        linhas.append(f"Pico de memória: {resumo['memoria_pico_bytes'] / 1024:.1f} KiB")
+    return linhas
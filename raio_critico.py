@@ -0,0 +1,180 @@
+import math
+
+import networkx as nx
+import numpy as np
+
+from network_generator import _arestas_por_grade
+from topologia import Topologia
+
+def _posicoes_de(rede):
+    """Aceita uma Topologia, um grafo networkx com atributo 'pos' ou um array (n, 2)."""
+    if isinstance(rede, Topologia):
+        return rede.posicoes
+    if isinstance(rede, nx.Graph):
+        return Topologia.de_grafo(rede).posicoes
+    return np.asarray(rede, dtype=float).reshape(-1, 2)
+
+def _arestas_com_comprimento(posicoes, raio):
+    """Arestas do grafo de disco unitário de raio `raio`, ordenadas por comprimento."""
+    arestas = _arestas_por_grade(posicoes, raio)
+    delta = posicoes[arestas[:, 0]] - posicoes[arestas[:, 1]]
+    comprimentos = np.sqrt(delta[:, 0] * delta[:, 0] + delta[:, 1] * delta[:, 1])
+    ordem = np.argsort(comprimentos, kind='stable')
+    return arestas[ordem], comprimentos[ordem]
+
+def _raio_inicial(posicoes):
+    """Estimativa do raio crítico de um grafo geométrico aleatório, ~sqrt(A·ln n / (π n))."""
+    n = len(posicoes)
+    extensao = posicoes.max(axis=0) - posicoes.min(axis=0)
+    area = max(float(extensao[0] * extensao[1]), 1e-12)
+    return max(math.sqrt(area * math.log(max(n, 2)) / (math.pi * n)), 1e-9)
+
+def curva_componente_gigante(rede):
+    """
+    Varre os raios em ordem crescente com union-find (Kruskal) e registra cada fusão.
+
+    Só as arestas da árvore geradora mínima euclidiana mudam a estrutura de
+    componentes, então a curva é exata: para qualquer raio r, a fração do maior
+    componente é a do último ponto com raios[i] <= r. As arestas candidatas vêm
+    da grade espacial com raio crescente (+25%) até o grafo ficar conexo, processando a
+    cada rodada apenas as arestas novas.
+
+    Retorna (raios, fracoes), arrays com um ponto por fusão de componentes.
+    """
+    posicoes = _posicoes_de(rede)
+    n = len(posicoes)
+    if n == 0:
+        return np.empty(0), np.empty(0)
+
+    pai = list(range(n))
+    tamanho = [1] * n
+    maior = 1
+    componentes = n
+    raios, fracoes = [0.0], [1 / n]
+
+    def raiz(x):
+        while pai[x] != x:
+            pai[x] = pai[pai[x]]
+            x = pai[x]
+        return x
+
+    raio_anterior = -1.0
+    raio = _raio_inicial(posicoes)
+    while componentes > 1:
+        arestas, comprimentos = _arestas_com_comprimento(posicoes, raio)
+        novas = comprimentos > raio_anterior
+        for (u, v), comprimento in zip(arestas[novas].tolist(), comprimentos[novas].tolist()):
+            ru, rv = raiz(u), raiz(v)
+            if ru == rv:
+                continue
+            if tamanho[ru] < tamanho[rv]:
+                ru, rv = rv, ru
+            pai[rv] = ru
+            tamanho[ru] += tamanho[rv]
+            maior = max(maior, tamanho[ru])
+            componentes -= 1
+            raios.append(comprimento)
+            fracoes.append(maior / n)
+            if componentes == 1:
+                break
+        raio_anterior, raio = raio, raio * 1.25
+
+    return np.array(raios), np.array(fracoes)
+
+def _validar_fracao(fracao):
+    if not 0 < fracao <= 1:
+        raise ValueError("A fração do maior componente deve estar em (0, 1].")
+
+def raio_para_fracao_gigante(rede, fracao_alvo):
+    """Menor raio em que o maior componente contém pelo menos `fracao_alvo` dos nós."""
+    _validar_fracao(fracao_alvo)
+    raios, fracoes = curva_componente_gigante(rede)
+    return float(raios[np.searchsorted(fracoes, fracao_alvo - 1e-12)])
+
+def raio_de_conectividade(rede):
+    """Menor raio que torna a rede conexa (a maior aresta da árvore geradora mínima)."""
+    raios, _ = curva_componente_gigante(rede)
+    return float(raios[-1]) if len(raios) else 0.0
+
+def _raio_grau_minimo(posicoes, k):
+    """Menor raio em que todo nó tem pelo menos k vizinhos (distância ao k-ésimo vizinho mais próximo)."""
+    n = len(posicoes)
+    raio = _raio_inicial(posicoes)
+    while True:
+        arestas, comprimentos = _arestas_com_comprimento(posicoes, raio)
+        nos = np.concatenate((arestas[:, 0], arestas[:, 1]))
+        distancias = np.concatenate((comprimentos, comprimentos))
+        graus = np.bincount(nos, minlength=n)
+        if graus.min() >= k:
+            ordem = np.lexsort((distancias, nos))
+            inicio = np.concatenate(([0], np.cumsum(graus)[:-1]))
+            return float(distancias[ordem][inicio + k - 1].max())
+        raio *= 2
+
+def raio_k_conectividade(rede, k):
+    """
+    Menor raio em que a rede é k-conexa (resiste à remoção de quaisquer k-1 nós).
+
+    O grau mínimo >= k e a conectividade são condições necessárias, então a busca
+    começa no maior desses dois limites inferiores (em grafos geométricos
+    aleatórios ele quase sempre já é a resposta). Daí em diante, faz uma busca
+    exponencial seguida de binária sobre os comprimentos de aresta candidatos.
+    """
+    posicoes = _posicoes_de(rede)
+    n = len(posicoes)
+    if k < 1 or n <= k:
+        raise ValueError("k deve estar entre 1 e o número de nós - 1.")
+    if k == 1:
+        return raio_de_conectividade(posicoes)
+    if (posicoes == posicoes[0]).all():
+        return 0.0  # Todos no mesmo ponto: o grafo de raio 0 já é completo
+
+    def k_conexa(raio):
+        G = nx.Graph()
+        G.add_nodes_from(range(n))
+        G.add_edges_from(_arestas_por_grade(posicoes, raio).tolist())
+        return nx.node_connectivity(G) >= k
+
+    limite_inferior = max(raio_de_conectividade(posicoes), _raio_grau_minimo(posicoes, k))
+    if k_conexa(limite_inferior):
+        return limite_inferior
+
+    # Candidatos: comprimentos distintos acima do limite inferior, buscados em janelas crescentes
+    # (a partir de um raio positivo, para a janela crescer mesmo com limite inferior 0)
+    raio = max(limite_inferior * 2, _raio_inicial(posicoes))
+    while True:
+        _, comprimentos = _arestas_com_comprimento(posicoes, raio)
+        candidatos = np.unique(comprimentos[comprimentos > limite_inferior])
+        if len(candidatos) and k_conexa(candidatos[-1]):
+            baixo, alto = 0, len(candidatos) - 1
+            while baixo < alto:
+                meio = (baixo + alto) // 2
+                if k_conexa(candidatos[meio]):
+                    alto = meio
+                else:
+                    baixo = meio + 1
+            return float(candidatos[baixo])
+        limite_inferior, raio = raio, raio * 2
+
+def resolver_raio_critico(rede, fracao_gigante=None, k=None):
+    """
+    Calcula, para posições fixas, os raios críticos de uma implantação em uma única varredura.
+
+    Retorna um dicionário com o raio mínimo para conectividade, a curva
+    raio × fração do maior componente e, se pedidos, o raio para atingir
+    `fracao_gigante` e o raio para k-conectividade.
+    """
+    if fracao_gigante is not None:
+        _validar_fracao(fracao_gigante)
+    posicoes = _posicoes_de(rede)
+    raios, fracoes = curva_componente_gigante(posicoes)
+    resultado = {
+        'raio_conectividade': float(raios[-1]) if len(raios) else 0.0,
+        'curva_raios': raios,
+        'curva_fracao_gigante': fracoes,
+    }
+    if fracao_gigante is not None:
+        resultado['raio_fracao_gigante'] = float(raios[np.searchsorted(fracoes, fracao_gigante - 1e-12)])
+    if k is not None:
+        resultado['raio_k_conectividade'] = raio_k_conectividade(posicoes, k)
+    return resultado
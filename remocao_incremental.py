@@ -0,0 +1,104 @@
+import numpy as np
+
+from caminhos_minimos import bfs_distancias, blocos_biconexos, componentes_conexos, percorrer_fontes
+from metricas_estruturais import MetricasEstruturais
+from topologia import TIPO_ESTACAO_BASE
+
+def remover_no(topologia, rotulo):
+    """
+    Topologia sem o nó `rotulo`, com as métricas estruturais já calculadas atualizadas incrementalmente.
+
+    Só o componente conexo que continha o nó (caminhos mínimos e componentes),
+    os blocos biconexos que o continham (articulações e pontes) e os seus
+    vizinhos (triângulos) são recalculados; o resto é reaproveitado. As demais
+    métricas são calculadas sob demanda na nova topologia, como de costume.
+    """
+    i = topologia.indice_por_rotulo[rotulo]
+    nova = topologia.sem_no(i)
+    mapa = np.arange(topologia.num_nos) - (np.arange(topologia.num_nos) > i)
+    mapa[i] = -1
+    vizinhos = topologia.listas_de_vizinhos()
+    triangulos_perdidos = {}
+    vizinhos_i = set(vizinhos[i])
+    for u in vizinhos_i:
+        triangulos_perdidos[u] = len(vizinhos_i.intersection(vizinhos[u]))
+    _propagar(topologia, nova, mapa.tolist(), i, lambda bloco: i in bloco, triangulos_perdidos)
+    return nova
+
+def remover_aresta(topologia, rotulo_u, rotulo_v):
+    """Topologia sem a aresta entre `rotulo_u` e `rotulo_v`, com as métricas atualizadas como em remover_no."""
+    u = topologia.indice_por_rotulo[rotulo_u]
+    v = topologia.indice_por_rotulo[rotulo_v]
+    nova = topologia.sem_aresta(u, v)
+    vizinhos = topologia.listas_de_vizinhos()
+    comuns = set(vizinhos[u]).intersection(vizinhos[v])
+    triangulos_perdidos = dict.fromkeys(comuns, 1)
+    triangulos_perdidos[u] = triangulos_perdidos[v] = len(comuns)
+    _propagar(topologia, nova, list(range(topologia.num_nos)), u, lambda bloco: u in bloco and v in bloco,
+              triangulos_perdidos)
+    return nova
+
+def _propagar(topologia, nova, mapa, semente, bloco_afetado, triangulos_perdidos):
+    """
+    Semeia, na memória de métricas de `nova`, as métricas intermediárias de
+    `topologia` atualizadas para a remoção.
+
+    `mapa` leva cada índice antigo ao novo (-1 para o nó removido), `semente`
+    é um nó antigo do componente afetado, `bloco_afetado` diz se um bloco
+    biconexo antigo foi alterado e `triangulos_perdidos` é {nó antigo:
+    triângulos a menos}.
+    """
+    if not topologia._metricas_estruturais:
+        return
+    # Componente afetado, em índices novos e ordem crescente
+    _, visitados = bfs_distancias(topologia.listas_de_vizinhos(), semente)
+    afetados = sorted(mapa[v] for v in visitados if mapa[v] >= 0)
+    mantidos = [v for v in range(topologia.num_nos) if mapa[v] >= 0]
+    conjunto_afetados = set(afetados)
+
+    nova._metricas_estruturais = {}
+    for chave, anterior in topologia._metricas_estruturais.items():
+        atual = MetricasEstruturais(nova, anterior.aproximacao, anterior.orcamento_conectividade)
+        nova._metricas_estruturais[chave] = atual
+
+        if '_componentes' in anterior:
+            componente_anterior, tamanhos_anterior = anterior['_componentes']
+            componente, tamanhos = componentes_conexos(nova.listas_de_vizinhos(), afetados)
+            representante_afetado = componente_anterior[semente]
+            for v in mantidos:
+                if mapa[v] not in conjunto_afetados:
+                    componente[mapa[v]] = mapa[componente_anterior[v]]
+            for representante, tamanho in tamanhos_anterior.items():
+                if representante != representante_afetado:
+                    tamanhos[mapa[representante]] = tamanho
+            atual._valores['_componentes'] = (componente, tamanhos)
+
+        if '_caminhos' in anterior and anterior.aproximacao is None:
+            # Só as fontes do componente afetado alcançam os seus nós: o resto não muda
+            eh_base = (nova.tipos == TIPO_ESTACAO_BASE).tolist()
+            parcial = percorrer_fontes(nova.listas_de_vizinhos(), afetados, eh_base)
+            caminhos = {}
+            for nome, valores in anterior['_caminhos'].items():
+                novos = [valores[v] for v in mantidos]
+                if nome == 'componente':
+                    novos = [mapa[c] if c >= 0 else c for c in novos]
+                for w in afetados:
+                    novos[w] = parcial[nome][w]
+                caminhos[nome] = novos
+            atual._valores['_caminhos'] = caminhos
+
+        if '_blocos' in anterior:
+            blocos = []
+            for bloco in anterior['_blocos']:
+                if bloco_afetado(bloco):
+                    blocos.extend(blocos_biconexos(nova.listas_de_vizinhos(),
+                                                   sorted(mapa[v] for v in bloco if mapa[v] >= 0)))
+                else:
+                    blocos.append(frozenset(mapa[v] for v in bloco))
+            atual._valores['_blocos'] = blocos
+
+        if '_triangulos' in anterior:
+            triangulos = anterior['_triangulos'][mantidos]
+            for v, perdidos in triangulos_perdidos.items():
+                triangulos[mapa[v]] -= perdidos
+            atual._valores['_triangulos'] = triangulos
@@ -0,0 +1,134 @@
+import math
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from statistics import NormalDist
+
+from cache_resultados import executar_cenario
+from ensemble import sementes_das_replicas
+
+try:
+    from scipy import stats
+except ImportError:  # scipy é opcional: usa uma expansão do quantil normal
+    stats = None
+
+def _media_ou_nan(valores):
+    return sum(valores) / len(valores) if valores else float('nan')
+
+# Métricas escalares que podem ser agregadas entre réplicas
+METRICAS_DE_REPLICA = {
+    'taxa_de_entrega': lambda m: m['pacotes_entregues'] / m['pacotes_gerados'] if m['pacotes_gerados'] else float('nan'),
+    'latencia_media': lambda m: m['latencias'].resumo()['media'],
+    'latencia_p95': lambda m: m['latencias'].quantil(0.95),
+    'saltos_medios': lambda m: m['contagens_de_saltos'].resumo()['media'],
+    'pacotes_gerados': lambda m: m['pacotes_gerados'],
+    'pacotes_entregues': lambda m: m['pacotes_entregues'],
+    'vida_util': lambda m: m.get('vida_util', float('nan')),
+}
+
+def quantil_t(probabilidade, graus_de_liberdade):
+    """Quantil da distribuição t de Student (scipy se disponível, senão expansão de Cornish-Fisher)."""
+    if stats is not None:
+        return float(stats.t.ppf(probabilidade, graus_de_liberdade))
+    z = NormalDist().inv_cdf(probabilidade)
+    v = graus_de_liberdade
+    return (z + (z ** 3 + z) / (4 * v)
+            + (5 * z ** 5 + 16 * z ** 3 + 3 * z) / (96 * v ** 2)
+            + (3 * z ** 7 + 19 * z ** 5 + 17 * z ** 3 - 15 * z) / (384 * v ** 3))
+
+def intervalo_de_confianca(amostras, confianca=0.95):
+    """
+    Média, desvio padrão amostral e meia-largura do intervalo t de Student.
+
+    Valores NaN (ex.: latência de uma réplica sem entregas) são ignorados.
+    Com menos de duas amostras válidas a meia-largura é infinita.
+    """
+    validas = [x for x in amostras if not math.isnan(x)]
+    n = len(validas)
+    media = _media_ou_nan(validas)
+    if n < 2:
+        return {'media': media, 'desvio': float('nan'), 'meia_largura': float('inf'),
+                'intervalo': (float('-inf'), float('inf')), 'n': n}
+    desvio = math.sqrt(sum((x - media) ** 2 for x in validas) / (n - 1))
+    meia_largura = quantil_t(0.5 + confianca / 2, n - 1) * desvio / math.sqrt(n)
+    return {'media': media, 'desvio': desvio, 'meia_largura': meia_largura,
+            'intervalo': (media - meia_largura, media + meia_largura), 'n': n}
+
+def _executar_replica(tipo_rede, params, tempo_simulacao, semente, nomes, opcoes):
+    """Executa uma réplica em um processo trabalhador e devolve só as métricas escalares pedidas."""
+    # As métricas de réplica são todas da fase de pacotes, salvo pedido explícito
+    opcoes = {'metricas_estruturais': (), **opcoes}
+    _, metricas = executar_cenario(tipo_rede, params, tempo_simulacao, semente, **opcoes)
+    return {nome: float(METRICAS_DE_REPLICA[nome](metricas)) for nome in nomes}
+
+def _precisao_atingida(resumo, tolerancia, tolerancia_relativa):
+    for estatisticas in resumo.values():
+        limite = tolerancia * abs(estatisticas['media']) if tolerancia_relativa else tolerancia
+        if not estatisticas['meia_largura'] <= limite:
+            return False
+    return True
+
+def executar_replicacoes(tipo_rede, params, tempo_simulacao, metricas=('taxa_de_entrega', 'latencia_media'),
+                         tolerancia=None, tolerancia_relativa=False, confianca=0.95, min_replicas=5,
+                         max_replicas=100, semente=0, processos=None, **opcoes):
+    """
+    Executa réplicas independentes de um cenário em paralelo e agrega média e intervalo de confiança.
+
+    A réplica i usa a i-ésima semente derivada de `semente` (ver
+    ensemble.sementes_das_replicas), que gera tanto a topologia quanto o tráfego.
+    `opcoes` são repassadas a executar_simulacao (ex.: protocolo, motor).
+
+    Com `tolerancia`, novas réplicas deixam de ser lançadas assim que a
+    meia-largura do intervalo de todas as `metricas` fica abaixo dela (ou de
+    `tolerancia * |média|`, se `tolerancia_relativa`), a partir de
+    `min_replicas`. A agregação usa sempre o prefixo contíguo de réplicas
+    0..n-1, então o resultado não depende do número de processos.
+
+    Retorna um dicionário com 'replicas', 'parada_antecipada', 'amostras'
+    (por métrica) e 'resumo' (média, desvio, meia_largura, intervalo, n).
+    """
+    for nome in metricas:
+        if nome not in METRICAS_DE_REPLICA:
+            raise ValueError(f"Métrica de réplica desconhecida: {nome}")
+    min_replicas = min(max(min_replicas, 2), max_replicas)
+    sementes = sementes_das_replicas(semente, max_replicas)
+    paralelas = processos or os.cpu_count() or 1
+
+    resultados = {}
+    prefixo = 0
+    parada_antecipada = False
+    with ProcessPoolExecutor(max_workers=processos) as executor:
+        pendentes = {}
+        proxima = 0
+        while True:
+            # Mantém no máximo `paralelas` réplicas em andamento
+            while proxima < max_replicas and len(pendentes) < paralelas:
+                futuro = executor.submit(_executar_replica, tipo_rede, params, tempo_simulacao,
+                                         sementes[proxima], tuple(metricas), opcoes)
+                pendentes[futuro] = proxima
+                proxima += 1
+            if not pendentes:
+                break
+            concluidos, _ = wait(pendentes, return_when=FIRST_COMPLETED)
+            for futuro in concluidos:
+                resultados[pendentes.pop(futuro)] = futuro.result()
+
+            # Testa a parada a cada tamanho de prefixo, como numa execução sequencial
+            while prefixo in resultados:
+                prefixo += 1
+                if tolerancia is None or prefixo < min_replicas:
+                    continue
+                resumo = {
+                    nome: intervalo_de_confianca([resultados[i][nome] for i in range(prefixo)], confianca)
+                    for nome in metricas
+                }
+                if _precisao_atingida(resumo, tolerancia, tolerancia_relativa):
+                    parada_antecipada = prefixo < max_replicas
+                    break
+            if parada_antecipada:
+                for futuro in pendentes:
+                    futuro.cancel()
+                break
+
+    amostras = {nome: [resultados[i][nome] for i in range(prefixo)] for nome in metricas}
+    resumo = {nome: intervalo_de_confianca(valores, confianca) for nome, valores in amostras.items()}
+    return {'replicas': prefixo, 'parada_antecipada': parada_antecipada, 'amostras': amostras, 'resumo': resumo}
@@ -0,0 +1,85 @@
+from collections import deque
+
+# Protocolos de roteamento disponíveis na simulação
+PROTOCOLOS = {
+    'inundacao': 'Inundação (Flooding)',
+    'caminho_minimo': 'Caminho Mínimo',
+    'gradiente': 'Gradiente (Estação Base Mais Próxima)',
+    'multicaminho': 'Múltiplos Caminhos',
+}
+
+def bfs(vizinhos, fontes):
+    """
+    BFS a partir de uma ou mais fontes sobre listas de vizinhos.
+
+    Retorna (distancia, pai, raiz): distância em saltos até a fonte mais
+    próxima (-1 se inalcançável), o nó que descobriu cada nó e a fonte de
+    origem da árvore a que cada nó pertence.
+    """
+    n = len(vizinhos)
+    distancia = [-1] * n
+    pai = [-1] * n
+    raiz = [-1] * n
+    fila = deque()
+    for fonte in fontes:
+        if distancia[fonte] == -1:
+            distancia[fonte] = 0
+            raiz[fonte] = fonte
+            fila.append(fonte)
+    while fila:
+        u = fila.popleft()
+        proxima = distancia[u] + 1
+        for v in vizinhos[u]:
+            if distancia[v] == -1:
+                distancia[v] = proxima
+                pai[v] = u
+                raiz[v] = raiz[u]
+                fila.append(v)
+    return distancia, pai, raiz
+
+class TabelaDeRoteamento:
+    """
+    Tabelas de próximo salto pré-calculadas uma vez por topologia.
+
+    `proximos[destino][no]` é a lista de próximos saltos de `no` rumo à
+    estação base `destino` (vazia se não há caminho). Assim o custo por pacote
+    é proporcional ao tamanho do caminho, e não ao número de arestas.
+
+    - caminho_minimo: um único próximo salto, pela árvore BFS de cada base
+    - multicaminho: até `max_caminhos` vizinhos que estão um salto mais perto da
+      base; as cópias podem se reencontrar, então há supressão de duplicatas
+    - gradiente: o pacote desce o gradiente de saltos até a base mais próxima
+      (BFS com múltiplas fontes), ignorando o destino sorteado
+    """
+
+    def __init__(self, protocolo, vizinhos, estacoes_base, max_caminhos=2):
+        if protocolo not in PROTOCOLOS or protocolo == 'inundacao':
+            raise ValueError(f"Protocolo sem tabela de roteamento: {protocolo}")
+        self.protocolo = protocolo
+        self.multicaminho = protocolo == 'multicaminho'
+        self.raiz = None
+        self.proximos = {}
+
+        if protocolo == 'gradiente':
+            _, pai, self.raiz = bfs(vizinhos, estacoes_base)
+            proximos = [[p] if p != -1 else [] for p in pai]
+            for base in estacoes_base:
+                self.proximos[base] = proximos
+            return
+
+        for base in estacoes_base:
+            distancia, pai, _ = bfs(vizinhos, [base])
+            if self.multicaminho:
+                self.proximos[base] = [
+                    [v for v in vizinhos[u] if distancia[v] == distancia[u] - 1][:max_caminhos]
+                    if distancia[u] > 0 else []
+                    for u in range(len(vizinhos))
+                ]
+            else:
+                self.proximos[base] = [[p] if p != -1 else [] for p in pai]
+
+    def destino(self, origem, destino_sorteado):
+        """Estação base que o pacote de fato vai procurar."""
+        if self.raiz is not None and self.raiz[origem] != -1:
+            return self.raiz[origem]
+        return destino_sorteado
@@ -1,168 +1,510 @@
 
+import math
 import networkx
+import os
 import simpy
 import random
-import copy
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 
-# Estado global para a simulação
-metricas = {}
-pacotes_encaminhados_por_no = {}
+from checkpoint import assinatura_do_cenario, carregar_checkpoint, resolver_checkpoint, salvar_checkpoint
+from energia import EstadoDeEnergia
+from estatisticas import EstatisticasIncrementais
+from inundacao_analitica import executar_inundacao_analitica
+from metricas_aproximadas import resolver_aproximacao
+from metricas_estruturais import TODAS, metricas_de
+from mobilidade import TopologiaDinamica, processo_mobilidade
+from motor_eventos import AmbienteSimPyContador, MotorLeve
+from network_generator import gerador_aleatorio
+from perfil import Perfil, resolver_perfil
+from roteamento import PROTOCOLOS, TabelaDeRoteamento
+from telemetria import Telemetria, resolver_telemetria
+from topologia import Topologia, TIPO_ESTACAO_BASE, TIPO_SENSOR
+
+# Motores de eventos disponíveis: ambos oferecem now/timeout/process/run
+MOTORES = {
+    'simpy': simpy.Environment,
+    'leve': MotorLeve,
+}
+
+class ContextoSimulacao:
+    """
+    Todo o estado de uma execução, passado aos processos de geração e roteamento.
+
+    Não há estado global: cada chamada de executar_simulacao cria o seu próprio
+    contexto, então várias simulações podem rodar no mesmo processo (threads,
+    sessões do Streamlit) sem interferir umas nas outras.
+    """
+    __slots__ = ('env', 'metricas', 'vizinhos', 'estacoes_base', 'rng', 'tabela', 'energia')
+
+    def __init__(self, env, metricas, vizinhos, estacoes_base, rng=random, tabela=None, energia=None):
+        self.env = env
+        self.metricas = metricas
+        self.vizinhos = vizinhos
+        self.estacoes_base = estacoes_base
+        self.rng = rng
+        self.tabela = tabela
+        self.energia = energia
 
 class Pacote:
-    def __init__(self, id_pacote, origem, destino, tempo_de_criacao):
+    """
+    Dados de um pacote, compartilhados por todas as cópias da inundação.
+
+    O id é um inteiro sequencial e o estado por salto (contagem de saltos) é
+    passado ao roteador como argumento, então nenhum objeto é copiado por vizinho.
+
+    A supressão de duplicatas usa um bitset de nós visitados por pacote
+    (`visitados`). `ativos` conta os roteadores ainda em execução para este
+    pacote; quando chega a zero, a inundação terminou e o bitset é liberado.
+    Com `num_nos=None` (roteamento por caminho único) não há bitset.
+    """
+    __slots__ = ('id', 'origem', 'destino', 'tempo_de_criacao', 'visitados', 'ativos')
+
+    def __init__(self, id_pacote, origem, destino, tempo_de_criacao, num_nos):
         self.id = id_pacote
         self.origem = origem
         self.destino = destino
         self.tempo_de_criacao = tempo_de_criacao
-        self.contagem_de_saltos = 0
+        self.visitados = bytearray((num_nos + 7) >> 3) if num_nos is not None else None
+        self.ativos = 1
+
+def _registrar_bitset(metricas, pacote):
+    if pacote.visitados is None:
+        return
+    tamanho = sys.getsizeof(pacote.visitados)
+    metricas['memoria_dedup_bytes'] += tamanho
+    if metricas['memoria_dedup_bytes'] > metricas['memoria_dedup_pico_bytes']:
+        metricas['memoria_dedup_pico_bytes'] = metricas['memoria_dedup_bytes']
 
-def gerador_de_pacotes(env: simpy.Environment, no: int, G: networkx.Graph, estacoes_base: list):
-    """Um processo SimPy para um sensor gerar pacotes para uma estação base aleatória."""
+def _encerrar_copia(metricas, pacote):
+    """Marca o fim de um roteador; o último a terminar libera o bitset do pacote."""
+    pacote.ativos -= 1
+    if pacote.ativos == 0:
+        metricas['pacotes_em_transito'] -= 1
+        if pacote.visitados is not None:
+            metricas['memoria_dedup_bytes'] -= sys.getsizeof(pacote.visitados)
+            pacote.visitados = None
+
+def gerador_de_pacotes(contexto: ContextoSimulacao, no: int):
+    """
+    Um processo SimPy para um sensor gerar pacotes para uma estação base aleatória.
+
+    `contexto.env` pode ser qualquer motor de MOTORES (simpy.Environment ou MotorLeve).
+    Sem `contexto.tabela` o pacote é inundado; com ela, segue as tabelas de próximo salto.
+    Com `contexto.energia`, um sensor morto para de gerar pacotes.
+    """
+    env, metricas, rng, tabela = contexto.env, contexto.metricas, contexto.rng, contexto.tabela
+    estacoes_base, energia = contexto.estacoes_base, contexto.energia
     while True:
-        yield env.timeout(random.expovariate(1.0 / 10)) # Intervalo médio de 10s
+        yield env.timeout(rng.expovariate(1.0 / 10)) # Intervalo médio de 10s
+        if energia is not None and not energia.vivos[no]:
+            return
         metricas['pacotes_gerados'] += 1
-        destino_aleatorio = random.choice(estacoes_base)
+        destino_aleatorio = rng.choice(estacoes_base)
+        if tabela is not None:
+            destino_aleatorio = tabela.destino(no, destino_aleatorio)
         pacote = Pacote(
-            id_pacote=f'{no}-{metricas["pacotes_gerados"]}',
+            id_pacote=metricas['pacotes_gerados'],
             origem=no,
             destino=destino_aleatorio,
-            tempo_de_criacao=env.now
+            tempo_de_criacao=env.now,
+            num_nos=len(contexto.vizinhos) if tabela is None or tabela.multicaminho else None
         )
-        env.process(roteador(env, no, pacote, G))
+        _registrar_bitset(metricas, pacote)
+        metricas['pacotes_em_transito'] += 1
+        if tabela is None:
+            env.process(roteador(contexto, no, pacote))
+        else:
+            env.process(roteador_por_tabela(contexto, no, pacote, tabela.proximos[pacote.destino]))
+
+def roteador(contexto: ContextoSimulacao, no: int, pacote: Pacote, saltos: int = 0):
+    """
+    Um processo SimPy que implementa a lógica de roteamento por inundação.
 
-def roteador(env: simpy.Environment, no: int, pacote: Pacote, G: networkx.Graph):
-    """Um processo SimPy que implementa a lógica de roteamento por inundação."""
-    if pacote.id in pacotes_encaminhados_por_no.get(no, set()):
+    `no` é o índice denso do nó e `contexto.vizinhos[no]` sua lista de vizinhos
+    (ver Topologia). `saltos` é o número de saltos percorridos por esta cópia do pacote.
+    """
+    metricas = contexto.metricas
+    visitados = pacote.visitados
+    mascara = 1 << (no & 7)
+    if visitados[no >> 3] & mascara:
+        _encerrar_copia(metricas, pacote)
         return
 
-    pacotes_encaminhados_por_no.setdefault(no, set()).add(pacote.id)
+    visitados[no >> 3] |= mascara
 
+    env = contexto.env
     if no == pacote.destino:
         metricas['pacotes_entregues'] += 1
-        metricas['latencias'].append(env.now - pacote.tempo_de_criacao)
-        metricas['contagens_de_saltos'].append(pacote.contagem_de_saltos)
+        metricas['latencias'].adicionar(env.now - pacote.tempo_de_criacao)
+        metricas['contagens_de_saltos'].adicionar(saltos)
+        _encerrar_copia(metricas, pacote)
         return
 
-    metricas['contagens_de_encaminhamento'][no] = metricas['contagens_de_encaminhamento'].get(no, 0) + 1
+    metricas['contagens_de_encaminhamento'][no] += 1
 
-    for vizinho in G.neighbors(no):
+    energia = contexto.energia
+    saltos += 1
+    for vizinho in contexto.vizinhos[no]:
         yield env.timeout(1) # Latência de transmissão
-        novo_pacote = copy.copy(pacote)
-        novo_pacote.contagem_de_saltos += 1
-        env.process(roteador(env, vizinho, novo_pacote, G))
+        if energia is not None and not energia.enviar(no, vizinho):
+            if not energia.vivos[no]:
+                break  # A bateria acabou: o nó para de transmitir
+            continue
+        pacote.ativos += 1
+        env.process(roteador(contexto, vizinho, pacote, saltos))
+    _encerrar_copia(metricas, pacote)
 
-def executar_simulacao(G: networkx.Graph, tempo_simulacao: int):
-    """Configura e executa o ambiente SimPy."""
-    global metricas, pacotes_encaminhados_por_no
-    metricas = {
-        'pacotes_gerados': 0, 'pacotes_entregues': 0, 'latencias': [],
-        'contagens_de_saltos': [], 'contagens_de_encaminhamento': {},
-        'centralidade_de_grau': {}, 'centralidade_de_intermediacao': {},
-        'centralidade_de_proximidade': {}, 'centralidade_de_autovetor': {},
-        'centralidade_de_clique': {}, 'centralidade_de_pagerank': {},
-        'diametro_rede': 0, 'is_connected': True
-    }
-    pacotes_encaminhados_por_no = {}
-
-    # Calcular métricas estruturais do grafo (sempre)
-    metricas['centralidade_de_grau'] = networkx.degree_centrality(G)
-    metricas['centralidade_de_intermediacao'] = networkx.betweenness_centrality(G)
-    
-    # Calcular betweenness centrality para padrões específicos de comunicação
-    estacoes_base = [n for n, d in G.nodes(data=True) if d.get('type') == 'base_station']
-    sensores = [n for n, d in G.nodes(data=True) if d.get('type') != 'base_station']
-    
-    # Betweenness centrality de todos os sensores para todas as estações base (padrão típico de RSSF)
-    if estacoes_base and sensores:
-        metricas['betweenness_sensores_para_bases'] = networkx.betweenness_centrality_subset(
-            G, sources=sensores, targets=estacoes_base, normalized=True
-        )
-        
-        # Betweenness centrality de todas as estações base para todos os sensores (comando/controle)
-        metricas['betweenness_bases_para_sensores'] = networkx.betweenness_centrality_subset(
-            G, sources=estacoes_base, targets=sensores, normalized=True
-        )
+def roteador_por_tabela(contexto: ContextoSimulacao, no: int, pacote: Pacote, proximos: list, saltos: int = 0):
+    """
+    Um processo SimPy que encaminha o pacote só para os próximos saltos da tabela.
+
+    `proximos[no]` são os próximos saltos de `no` rumo ao destino do pacote (ver
+    roteamento.py); o custo por pacote é proporcional ao caminho, não às arestas.
+    Se a tabela não tem próximo salto (destino inalcançável), o pacote é descartado.
+    """
+    metricas = contexto.metricas
+    visitados = pacote.visitados
+    if visitados is not None:
+        # Múltiplos caminhos podem se reencontrar: mesma supressão da inundação
+        mascara = 1 << (no & 7)
+        if visitados[no >> 3] & mascara:
+            _encerrar_copia(metricas, pacote)
+            return
+        visitados[no >> 3] |= mascara
+
+    env = contexto.env
+    if no == pacote.destino:
+        metricas['pacotes_entregues'] += 1
+        metricas['latencias'].adicionar(env.now - pacote.tempo_de_criacao)
+        metricas['contagens_de_saltos'].adicionar(saltos)
+        _encerrar_copia(metricas, pacote)
+        return
+
+    if proximos[no]:
+        metricas['contagens_de_encaminhamento'][no] += 1
+
+    energia = contexto.energia
+    saltos += 1
+    for vizinho in proximos[no]:
+        yield env.timeout(1) # Latência de transmissão
+        if energia is not None and not energia.enviar(no, vizinho):
+            if not energia.vivos[no]:
+                break
+            continue
+        pacote.ativos += 1
+        env.process(roteador_por_tabela(contexto, vizinho, pacote, proximos, saltos))
+    _encerrar_copia(metricas, pacote)
+
+# Versões serializáveis dos processos, para o motor leve com checkpoint.
+# Geradores não podem ser gravados com pickle; aqui cada retomada de um processo
+# é uma função agendada com argumentos simples (MotorLeve.agendar/iniciar), na
+# mesma ordem de agendamento dos geradores acima, então o resultado é idêntico.
+
+def _iniciar_gerador(contexto, no):
+    """Início de gerador_de_pacotes: sorteia a espera até o primeiro pacote."""
+    contexto.env.agendar(contexto.rng.expovariate(1.0 / 10), _gerar_pacote, contexto, no)
+
+def _gerar_pacote(contexto, no):
+    """Uma retomada de gerador_de_pacotes: cria o pacote, inicia o roteamento e agenda o próximo."""
+    env, metricas, rng, tabela = contexto.env, contexto.metricas, contexto.rng, contexto.tabela
+    if contexto.energia is not None and not contexto.energia.vivos[no]:
+        return
+    metricas['pacotes_gerados'] += 1
+    destino_aleatorio = rng.choice(contexto.estacoes_base)
+    if tabela is not None:
+        destino_aleatorio = tabela.destino(no, destino_aleatorio)
+    pacote = Pacote(metricas['pacotes_gerados'], no, destino_aleatorio, env.now,
+                    len(contexto.vizinhos) if tabela is None or tabela.multicaminho else None)
+    _registrar_bitset(metricas, pacote)
+    metricas['pacotes_em_transito'] += 1
+    if tabela is None:
+        env.iniciar(_rotear, contexto, no, pacote, 0)
     else:
-        # Se não há estações base ou sensores, usar valores zerados
-        metricas['betweenness_sensores_para_bases'] = {node: 0.0 for node in G.nodes()}
-        metricas['betweenness_bases_para_sensores'] = {node: 0.0 for node in G.nodes()}
-    
-    metricas['centralidade_de_proximidade'] = networkx.closeness_centrality(G)
-    try:
-        metricas['centralidade_de_autovetor'] = networkx.eigenvector_centrality(G, max_iter=1000, tol=1e-05)
-    except (networkx.PowerIterationFailedConvergence, networkx.NetworkXError):
-        metricas['centralidade_de_autovetor'] = {node: 0.0 for node in G.nodes()}
-    metricas['centralidade_de_clique'] = networkx.clustering(G)
-    metricas['centralidade_de_pagerank'] = networkx.pagerank(G)
-
-    # Novas métricas de rede
-    metricas['ordem'] = G.number_of_nodes()  # Número de nós
-    metricas['tamanho'] = G.number_of_edges()  # Número de arestas
-    metricas['coeficiente_clusterizacao'] = networkx.average_clustering(G)
-    metricas['assortatividade'] = networkx.degree_assortativity_coefficient(G)
-    
-    # Calcular modularidade usando algoritmo de Louvain
-    try:
-        import networkx.algorithms.community as nx_comm
-        communities = nx_comm.louvain_communities(G, seed=42)
-        metricas['modularidade'] = nx_comm.modularity(G, communities)
-        metricas['numero_comunidades'] = len(communities)
-    except (ImportError, networkx.NetworkXError):
-        metricas['modularidade'] = 0.0
-        metricas['numero_comunidades'] = 0
-
-    # Métricas de robustez e conectividade
-    if networkx.is_connected(G):
-        # Edge connectivity: número mínimo de arestas que precisam ser removidas para desconectar o grafo
-        metricas['edge_connectivity'] = networkx.edge_connectivity(G)
-        
-        # Node connectivity: número mínimo de nós que precisam ser removidos para desconectar o grafo
-        try:
-            metricas['node_connectivity'] = networkx.node_connectivity(G)
-        except networkx.NetworkXError:
-            metricas['node_connectivity'] = 0
-        
-        # Identificar pontos de articulação (nós críticos que desconectam a rede)
-        pontos_articulacao = list(networkx.articulation_points(G))
-        metricas['pontos_articulacao'] = pontos_articulacao
-        metricas['numero_pontos_articulacao'] = len(pontos_articulacao)
-        
-        # Identificar pontes (arestas críticas que desconectam a rede)
-        pontes = list(networkx.bridges(G))
-        metricas['pontes'] = pontes
-        metricas['numero_pontes'] = len(pontes)
-        
+        env.iniciar(_rotear_por_tabela, contexto, no, pacote, tabela.proximos[pacote.destino], 0)
+    env.agendar(rng.expovariate(1.0 / 10), _gerar_pacote, contexto, no)
+
+def _rotear(contexto, no, pacote, saltos):
+    """Início de roteador (inundação)."""
+    metricas = contexto.metricas
+    visitados = pacote.visitados
+    mascara = 1 << (no & 7)
+    if visitados[no >> 3] & mascara:
+        _encerrar_copia(metricas, pacote)
+        return
+    visitados[no >> 3] |= mascara
+    if no == pacote.destino:
+        _entregar(contexto, pacote, saltos)
+        return
+    metricas['contagens_de_encaminhamento'][no] += 1
+    destinos = contexto.vizinhos[no]
+    if destinos:
+        contexto.env.agendar(1, _transmitir, contexto, no, pacote, saltos + 1, destinos, 0, _rotear)
     else:
-        metricas['edge_connectivity'] = 0
-        metricas['node_connectivity'] = 0
-        metricas['pontos_articulacao'] = []
-        metricas['numero_pontos_articulacao'] = 0
-        metricas['pontes'] = []
-        metricas['numero_pontes'] = 0
-
-    if networkx.is_connected(G):
-        metricas['diametro_rede'] = networkx.diameter(G)
-        metricas['distancia_media'] = networkx.average_shortest_path_length(G)
+        _encerrar_copia(metricas, pacote)
+
+def _rotear_por_tabela(contexto, no, pacote, proximos, saltos):
+    """Início de roteador_por_tabela."""
+    metricas = contexto.metricas
+    visitados = pacote.visitados
+    if visitados is not None:
+        mascara = 1 << (no & 7)
+        if visitados[no >> 3] & mascara:
+            _encerrar_copia(metricas, pacote)
+            return
+        visitados[no >> 3] |= mascara
+    if no == pacote.destino:
+        _entregar(contexto, pacote, saltos)
+        return
+    destinos = proximos[no]
+    if destinos:
+        metricas['contagens_de_encaminhamento'][no] += 1
+        contexto.env.agendar(1, _transmitir, contexto, no, pacote, saltos + 1, destinos, 0,
+                             _rotear_por_tabela, proximos)
     else:
-        metricas['is_connected'] = False
-        componentes = list(networkx.connected_components(G))
-        if componentes:
-            maior_componente = G.subgraph(max(componentes, key=len))
-            metricas['diametro_rede'] = networkx.diameter(maior_componente)
-            metricas['distancia_media'] = networkx.average_shortest_path_length(maior_componente)
-        else:
-            metricas['diametro_rede'] = float('inf')
-            metricas['distancia_media'] = float('inf')
+        _encerrar_copia(metricas, pacote)
+
+def _entregar(contexto, pacote, saltos):
+    metricas = contexto.metricas
+    metricas['pacotes_entregues'] += 1
+    metricas['latencias'].adicionar(contexto.env.now - pacote.tempo_de_criacao)
+    metricas['contagens_de_saltos'].adicionar(saltos)
+    _encerrar_copia(metricas, pacote)
+
+def _transmitir(contexto, no, pacote, saltos, destinos, indice, rotear, *extras):
+    """Fim da transmissão para `destinos[indice]`: inicia a cópia lá e agenda a próxima transmissão."""
+    energia = contexto.energia
+    if energia is not None and not energia.enviar(no, destinos[indice]):
+        if not energia.vivos[no]:
+            _encerrar_copia(contexto.metricas, pacote)
+            return
+    else:
+        pacote.ativos += 1
+        contexto.env.iniciar(rotear, contexto, destinos[indice], pacote, *extras, saltos)
+    if indice + 1 < len(destinos):
+        contexto.env.agendar(1, _transmitir, contexto, no, pacote, saltos, destinos, indice + 1, rotear, *extras)
+    else:
+        _encerrar_copia(contexto.metricas, pacote)
+
+def executar_simulacao(G, tempo_simulacao: int, mobilidade=None, semente=None, modo='eventos', motor='simpy',
+                       protocolo='inundacao', metricas_estruturais=None, aproximacao=None,
+                       orcamento_conectividade=None, telemetria=None, energia=None, checkpoint=None,
+                       perfil=None):
+    """
+    Configura e executa a simulação de pacotes e calcula as métricas estruturais.
+
+    Métricas por nó usam os ids originais; 'latencias' e 'contagens_de_saltos'
+    são EstatisticasIncrementais (ver estatisticas.py).
+
+    - `G`: networkx.Graph ou Topologia
+    - `mobilidade`: modelo de mobilidade.py; None para topologia estática
+    - `semente`: ver network_generator.gerador_aleatorio (mesma semente, mesmo resultado)
+    - `modo`: 'eventos' ou 'analitico' (ver inundacao_analitica.py, mesmo resultado)
+    - `motor`: chave de MOTORES ('simpy' ou 'leve', ver motor_eventos.py)
+    - `protocolo`: chave de roteamento.PROTOCOLOS
+    - `metricas_estruturais`: nomes de metricas_estruturais.REGISTRO; None todas, () nenhuma
+    - `aproximacao`: ver metricas_aproximadas.resolver_aproximacao
+    - `orcamento_conectividade`: segundos por conectividade (ver conectividade.py)
+    - `telemetria`: ver telemetria.resolver_telemetria
+    - `energia`: energia.ModeloDeEnergia; None desliga
+    - `checkpoint`: ver checkpoint.resolver_checkpoint (motor 'leve', semente fixa, sem mobilidade)
+    - `perfil`: ver perfil.resolver_perfil
+    """
+    if modo not in ('eventos', 'analitico'):
+        raise ValueError(f"Modo de simulação desconhecido: {modo}")
+    if motor not in MOTORES:
+        raise ValueError(f"Motor de eventos desconhecido: {motor}")
+    if protocolo not in PROTOCOLOS:
+        raise ValueError(f"Protocolo de roteamento desconhecido: {protocolo}")
+    if modo == 'analitico' and mobilidade is not None:
+        raise ValueError("O modo analítico não suporta mobilidade (a topologia precisa ser estática).")
+    if modo == 'analitico' and protocolo != 'inundacao':
+        raise ValueError("O modo analítico só reproduz o roteamento por inundação.")
+    if protocolo != 'inundacao' and mobilidade is not None:
+        raise ValueError("Os protocolos por tabela exigem topologia estática (sem mobilidade).")
+    telemetria = resolver_telemetria(telemetria)
+    if modo == 'analitico' and telemetria is not None:
+        raise ValueError("A telemetria exige o modo 'eventos' (o modo analítico não tem relógio de eventos).")
+    if modo == 'analitico' and energia is not None:
+        raise ValueError("O modo analítico não suporta o modelo de energia (nós que morrem mudam as entregas).")
+    perfil = resolver_perfil(perfil)
+    perfil = None if perfil is None else Perfil(perfil)
+    fase = nullcontext if perfil is None else perfil.fase
+    checkpoint = resolver_checkpoint(checkpoint)
+    if checkpoint is not None:
+        if modo != 'eventos' or motor != 'leve':
+            raise ValueError("O checkpoint exige o modo 'eventos' com o motor 'leve' (processos do SimPy não são serializáveis).")
+        if mobilidade is not None:
+            raise ValueError("O checkpoint não suporta mobilidade.")
+        if semente is None or isinstance(semente, random.Random):
+            raise ValueError("O checkpoint exige uma semente fixa (não None nem random.Random) para poder retomar.")
+
+    metricas = {
+        'pacotes_gerados': 0, 'pacotes_entregues': 0, 'latencias': EstatisticasIncrementais(),
+        'contagens_de_saltos': EstatisticasIncrementais(discreta=True), 'contagens_de_encaminhamento': {},
+        'memoria_dedup_bytes': 0, 'memoria_dedup_pico_bytes': 0, 'pacotes_em_transito': 0,
+        'protocolo': protocolo
+    }
+
+    with fase('topologia'):
+        topologia = G if isinstance(G, Topologia) else Topologia.de_grafo(G)
+
+    # Métricas estruturais: só as pedidas, memorizadas por topologia
+    nomes = TODAS if metricas_estruturais is None else metricas_estruturais
+    aproximacao = resolver_aproximacao(aproximacao, topologia.num_nos)
+    if aproximacao and nomes:
+        nomes = (*nomes, 'erros_aproximacao')
+    estruturais = metricas_de(topologia, aproximacao, orcamento_conectividade)
+    if perfil is None:
+        metricas.update(estruturais.calcular(nomes))
+    else:
+        # Uma fase por métrica; intermediários compartilhados contam para a primeira que os pede
+        for nome in nomes:
+            with perfil.fase(f'metrica:{nome}', memorizada=nome in estruturais):
+                metricas.update(estruturais.calcular((nome,)))
+
+    assinatura = None
+    if checkpoint is not None:
+        assinatura = assinatura_do_cenario(
+            topologia, tempo_simulacao=tempo_simulacao, semente=semente, protocolo=protocolo,
+            telemetria=telemetria, energia=energia, intervalo=checkpoint['intervalo'])
 
-    # Encontra todas as estações base
-    estacoes_base = [n for n, d in G.nodes(data=True) if d.get('type') == 'base_station']
+    # Encontra todas as estações base (índices densos)
+    estacoes_base = topologia.indices_do_tipo(TIPO_ESTACAO_BASE).tolist()
 
     # Executa a simulação de pacotes apenas se houver estações base
     if estacoes_base and tempo_simulacao > 0:
-        env = simpy.Environment()
-        for id_no, dados in G.nodes(data=True):
-            if dados.get('type') != 'base_station':
-                env.process(gerador_de_pacotes(env, id_no, G, estacoes_base))
-        env.run(until=tempo_simulacao)
+        vizinhos = topologia.listas_de_vizinhos()
+        metricas['contagens_de_encaminhamento'] = [0] * topologia.num_nos
+        rng = gerador_aleatorio(semente)
+        sensores = topologia.indices_do_tipo(TIPO_SENSOR).tolist()
+        if modo == 'analitico':
+            with fase('analitico'):
+                metricas['contagens_de_encaminhamento'] = executar_inundacao_analitica(
+                    vizinhos, sensores, estacoes_base, tempo_simulacao, rng, metricas
+                ).tolist()
+        else:
+            tabela = None
+            if protocolo != 'inundacao':
+                with fase('tabela_de_roteamento'):
+                    tabela = TabelaDeRoteamento(protocolo, vizinhos, estacoes_base)
+            if perfil is not None:
+                env = perfil.motor(motor, metricas)
+            elif telemetria is not None and motor == 'simpy':
+                env = AmbienteSimPyContador()  # Com telemetria, o SimPy também precisa contar os eventos
+            else:
+                env = MOTORES[motor]()
+            contexto = ContextoSimulacao(env, metricas, vizinhos, estacoes_base, rng, tabela)
+            with fase('eventos'):
+                metricas = _executar_eventos(contexto, topologia, sensores, tempo_simulacao, mobilidade, telemetria,
+                                             energia, checkpoint, assinatura, perfil)
+        metricas['contagens_de_encaminhamento'] = {
+            topologia.rotulos[no]: contagem
+            for no, contagem in enumerate(metricas['contagens_de_encaminhamento']) if contagem
+        }
+
+    if perfil is not None:
+        metricas['perfil'] = perfil.resumo()
+    return metricas
+
+def _executar_eventos(contexto, topologia, sensores, tempo_simulacao, mobilidade, telemetria=None, energia=None,
+                      checkpoint=None, assinatura=None, perfil=None):
+    """
+    Executa a simulação de pacotes por eventos discretos no motor `contexto.env`.
+
+    Com `telemetria`, o motor roda janela a janela (run(until=...) repetido não
+    altera a ordem dos eventos) e cada janela é amostrada ao terminar. No modo
+    de vida útil do modelo de `energia`, o motor também para a cada
+    intervalo de verificação e encerra assim que o critério é atingido.
+
+    Com `checkpoint`, os processos são os callbacks serializáveis e todo o
+    estado (relógio, fila de eventos, gerador aleatório, bitsets de
+    deduplicação, energia, telemetria e métricas) é gravado a cada intervalo
+    de checkpoint; se o arquivo já existe, a execução continua dele. Devolve
+    o dicionário de métricas (ao retomar, o que estava no checkpoint).
+    """
+    estado = None
+    if checkpoint is not None:
+        estado = carregar_checkpoint(checkpoint['arquivo'], assinatura)
+    if estado is None:
+        estado = _preparar_eventos(contexto, topologia, sensores, tempo_simulacao, mobilidade, telemetria, energia,
+                                   checkpoint)
+    else:
+        if estado['amostragem'] is not None:
+            estado['amostragem'].retomar()
+        if perfil is not None:
+            perfil.env = estado['contexto'].env  # Os contadores do motor continuam os do checkpoint
+
+    contexto, amostragem, dinamica = estado['contexto'], estado['amostragem'], estado['dinamica']
+    env, paradas = contexto.env, estado['paradas']
+    while estado['proxima'] < len(paradas):
+        fim = paradas[estado['proxima']]
+        estado['proxima'] += 1
+        env.run(until=fim)
+        esgotada = contexto.energia is not None and contexto.energia.esgotada
+        if amostragem is not None and (fim in estado['fins_de_janela'] or esgotada):
+            amostragem.amostrar()
+        if esgotada:
+            break
+        if fim in estado['checkpoints']:
+            salvar_checkpoint(checkpoint['arquivo'], assinatura, estado)
 
+    metricas = contexto.metricas
+    if amostragem is not None:
+        metricas['telemetria'] = amostragem.fechar()
+    if contexto.energia is not None:
+        metricas.update(contexto.energia.resumo(topologia.rotulos))
+        metricas['tempo_simulado'] = env.now
+    if dinamica is not None:
+        metricas['enlaces_criados'] = dinamica.enlaces_criados
+        metricas['enlaces_desfeitos'] = dinamica.enlaces_desfeitos
+    if checkpoint is not None and os.path.exists(checkpoint['arquivo']):
+        os.remove(checkpoint['arquivo'])  # Execução concluída: o checkpoint não serve mais
     return metricas
+
+def _preparar_eventos(contexto, topologia, sensores, tempo_simulacao, mobilidade, telemetria, energia, checkpoint):
+    """Estado inicial de _executar_eventos: processos agendados e instantes de parada do motor."""
+    env = contexto.env
+    dinamica = None
+    if mobilidade is not None:
+        dinamica = TopologiaDinamica(topologia, mobilidade)
+        contexto.vizinhos = dinamica.vizinhos
+    if energia is not None:
+        contexto.energia = EstadoDeEnergia(energia, topologia, env, None if dinamica is None else dinamica.posicoes)
+    for id_no in sensores:
+        if checkpoint is None:
+            env.process(gerador_de_pacotes(contexto, id_no))
+        else:
+            env.iniciar(_iniciar_gerador, contexto, id_no)
+    if mobilidade is not None:
+        env.process(processo_mobilidade(env, dinamica))
+
+    amostragem = None if telemetria is None else Telemetria(telemetria, contexto.metricas, env, topologia.rotulos)
+    janelas = [tempo_simulacao] if amostragem is None else amostragem.instantes(tempo_simulacao)
+    paradas = set(janelas)
+    if contexto.energia is not None and contexto.energia.limite_de_mortes is not None:
+        paradas.update(_multiplos(energia.intervalo_de_verificacao, tempo_simulacao))
+    checkpoints = set()
+    if checkpoint is not None:
+        checkpoints.update(_multiplos(checkpoint['intervalo'], tempo_simulacao))
+        paradas.update(checkpoints)
+    return {'contexto': contexto, 'amostragem': amostragem, 'dinamica': dinamica, 'paradas': sorted(paradas),
+            'fins_de_janela': set(janelas), 'checkpoints': checkpoints, 'proxima': 0}
+
+def _multiplos(passo, tempo_simulacao):
+    """Múltiplos de `passo` estritamente entre 0 e `tempo_simulacao`."""
+    return [passo * k for k in range(1, math.ceil(tempo_simulacao / passo))]
+
+def executar_simulacoes_concorrentes(cenarios, max_threads=None):
+    """
+    Executa várias simulações independentes ao mesmo tempo no mesmo processo.
+
+    `cenarios` é uma lista de dicionários com os argumentos de executar_simulacao
+    (ex.: {'G': topologia, 'tempo_simulacao': 100, 'semente': 1}). Retorna a lista
+    de métricas na mesma ordem, um dicionário separado por cenário. Como cada
+    execução tem o seu próprio ContextoSimulacao, as threads não compartilham estado.
+    """
+    with ThreadPoolExecutor(max_workers=max_threads) as executor:
+        futuros = [executor.submit(executar_simulacao, **cenario) for cenario in cenarios]
+        return [futuro.result() for futuro in futuros]
@@ -0,0 +1,168 @@
+import os
+import time
+
+import numpy as np
+
+# Parâmetros padrão da telemetria (o diretório de saída é obrigatório)
+TELEMETRIA_PADRAO = {'intervalo': 10.0, 'linhas_por_bloco': 65536}
+
+def resolver_telemetria(telemetria):
+    """
+    Normaliza o parâmetro `telemetria` de executar_simulacao.
+
+    None desliga; um caminho (str) grava nesse diretório com os parâmetros
+    padrão; um dicionário com 'diretorio' sobrescreve TELEMETRIA_PADRAO.
+    """
+    if telemetria is None:
+        return None
+    if isinstance(telemetria, (str, os.PathLike)):
+        telemetria = {'diretorio': telemetria}
+    if 'diretorio' not in telemetria:
+        raise ValueError("A telemetria precisa de um 'diretorio' de saída.")
+    parametros = {**TELEMETRIA_PADRAO, **telemetria}
+    if parametros['intervalo'] <= 0:
+        raise ValueError("O intervalo da telemetria deve ser positivo.")
+    return parametros
+
+class EscritorColunar:
+    """
+    Grava linhas em blocos colunares `<nome>_NNNNN.npz` (um array por coluna).
+
+    As linhas ficam em um buffer de no máximo `linhas_por_bloco` linhas; ao
+    encher, o bloco é gravado em um arquivo temporário e renomeado, então
+    nunca há blocos pela metade em disco e a memória não cresce com a duração
+    da execução.
+    """
+
+    def __init__(self, diretorio, nome, linhas_por_bloco=TELEMETRIA_PADRAO['linhas_por_bloco']):
+        self.diretorio = diretorio
+        self.nome = nome
+        self.linhas_por_bloco = linhas_por_bloco
+        self.blocos = 0
+        self._buffer = {}
+        self._linhas = 0
+        os.makedirs(diretorio, exist_ok=True)
+
+    def adicionar(self, **colunas):
+        """Acrescenta linhas: cada coluna é um escalar (uma linha) ou um array (várias)."""
+        linhas = 0
+        for nome, valores in colunas.items():
+            valores = np.atleast_1d(valores)
+            self._buffer.setdefault(nome, []).append(valores)
+            linhas = len(valores)
+        self._linhas += linhas
+        if self._linhas >= self.linhas_por_bloco:
+            self.descarregar()
+
+    def descarregar(self):
+        """Grava as linhas do buffer como um novo bloco (nada se o buffer está vazio)."""
+        if not self._linhas:
+            return
+        caminho = os.path.join(self.diretorio, f'{self.nome}_{self.blocos:05d}.npz')
+        temporario = caminho + '.tmp.npz'
+        np.savez(temporario, **{nome: np.concatenate(partes) for nome, partes in self._buffer.items()})
+        os.replace(temporario, caminho)
+        self.blocos += 1
+        self._buffer = {}
+        self._linhas = 0
+
+    def fechar(self):
+        self.descarregar()
+
+def ler_blocos(diretorio, nome):
+    """Concatena os blocos `<nome>_NNNNN.npz` de `diretorio` em {coluna: array}."""
+    arquivos = sorted(arquivo for arquivo in os.listdir(diretorio)
+                      if arquivo.startswith(nome + '_') and arquivo.endswith('.npz') and '.tmp' not in arquivo)
+    partes = {}
+    for arquivo in arquivos:
+        with np.load(os.path.join(diretorio, arquivo)) as bloco:
+            for coluna in bloco.files:
+                partes.setdefault(coluna, []).append(bloco[coluna])
+    return {coluna: np.concatenate(valores) for coluna, valores in partes.items()}
+
+def carregar_telemetria(diretorio):
+    """
+    Lê a telemetria gravada por executar_simulacao: {'janelas': colunas globais
+    por janela, 'nos': colunas (janela, no, encaminhamentos) por nó, 'rotulos':
+    rótulo original de cada índice de nó}.
+    """
+    with np.load(os.path.join(diretorio, 'rotulos.npz')) as arquivo:
+        rotulos = arquivo['rotulos']
+    return {'janelas': ler_blocos(diretorio, 'janelas'), 'nos': ler_blocos(diretorio, 'nos'), 'rotulos': rotulos}
+
+class Telemetria:
+    """
+    Amostragem da simulação por janelas de tempo simulado.
+
+    A cada `intervalo` unidades de tempo, amostrar() grava os contadores da
+    janela que terminou: pacotes gerados e entregues, pacotes em trânsito no
+    fim da janela, eventos processados (e o tempo de relógio gasto) e
+    encaminhamentos, no total e por nó (só os nós com encaminhamentos na
+    janela). Nada se acumula em memória além de um bloco de cada escritor.
+    """
+
+    def __init__(self, parametros, metricas, env, rotulos):
+        self.intervalo = parametros['intervalo']
+        self.metricas = metricas
+        self.env = env
+        self.janela = 0
+        self.segundos_escrita = 0.0
+        diretorio = parametros['diretorio']
+        self.janelas = EscritorColunar(diretorio, 'janelas', parametros['linhas_por_bloco'])
+        self.nos = EscritorColunar(diretorio, 'nos', parametros['linhas_por_bloco'])
+        rotulos = np.asarray(rotulos)
+        if rotulos.dtype == object:
+            rotulos = rotulos.astype(str)
+        np.savez(os.path.join(diretorio, 'rotulos.npz'), rotulos=rotulos)
+        self._inicio = env.now
+        self._gerados = metricas['pacotes_gerados']
+        self._entregues = metricas['pacotes_entregues']
+        self._eventos = env.eventos_processados
+        self._encaminhamentos = np.array(metricas['contagens_de_encaminhamento'], dtype=np.int64)
+        self._relogio = time.perf_counter()
+
+    def instantes(self, tempo_simulacao):
+        """Fins das janelas até `tempo_simulacao` (a última pode ser mais curta)."""
+        fins = np.arange(self._inicio + self.intervalo, tempo_simulacao, self.intervalo).tolist()
+        return fins + [tempo_simulacao]
+
+    def amostrar(self):
+        """Grava os contadores da janela que termina em env.now."""
+        agora = time.perf_counter()
+        metricas = self.metricas
+        encaminhamentos = np.array(metricas['contagens_de_encaminhamento'], dtype=np.int64)
+        delta = encaminhamentos - self._encaminhamentos
+        ativos = np.flatnonzero(delta)
+        self.janelas.adicionar(
+            janela=self.janela, inicio=self._inicio, fim=self.env.now,
+            pacotes_gerados=metricas['pacotes_gerados'] - self._gerados,
+            pacotes_entregues=metricas['pacotes_entregues'] - self._entregues,
+            pacotes_em_transito=metricas['pacotes_em_transito'],
+            eventos=self.env.eventos_processados - self._eventos,
+            segundos=agora - self._relogio,
+            encaminhamentos=int(delta.sum()),
+        )
+        if len(ativos):
+            self.nos.adicionar(janela=np.full(len(ativos), self.janela, dtype=np.int32),
+                               no=ativos.astype(np.int32), encaminhamentos=delta[ativos])
+        self.janela += 1
+        self._inicio = self.env.now
+        self._gerados = metricas['pacotes_gerados']
+        self._entregues = metricas['pacotes_entregues']
+        self._eventos = self.env.eventos_processados
+        self._encaminhamentos = encaminhamentos
+        self._relogio = time.perf_counter()
+        self.segundos_escrita += self._relogio - agora
+
+    def retomar(self):
+        """Reinicia a medição de tempo de relógio ao continuar de um checkpoint."""
+        self._relogio = time.perf_counter()
+
+    def fechar(self):
+        """Grava os blocos pendentes e devolve o resumo da telemetria para as métricas."""
+        inicio = time.perf_counter()
+        self.janelas.fechar()
+        self.nos.fechar()
+        self.segundos_escrita += time.perf_counter() - inicio
+        return {'diretorio': self.janelas.diretorio, 'janelas': self.janela,
+                'blocos': self.janelas.blocos + self.nos.blocos, 'segundos_escrita': self.segundos_escrita}
@@ -0,0 +1,189 @@
+import json
+
+import networkx as nx
+import numpy as np
+
+# Códigos do array `tipos`
+TIPO_SENSOR = 0
+TIPO_ESTACAO_BASE = 1
+
+_TIPO_PARA_CODIGO = {'sensor': TIPO_SENSOR, 'base_station': TIPO_ESTACAO_BASE}
+_CODIGO_PARA_TIPO = {codigo: nome for nome, codigo in _TIPO_PARA_CODIGO.items()}
+
+class Topologia:
+    """
+    Representação compacta de uma rede com ids densos 0..n-1.
+
+    - `posicoes`: array (n, 2) de floats
+    - `indptr`/`indices`: adjacência em formato CSR (vizinhos de i em indices[indptr[i]:indptr[i+1]])
+    - `tipos`: array de bytes com TIPO_SENSOR / TIPO_ESTACAO_BASE
+    - `rotulos`: ids originais (ex.: 'base_0', 3), na ordem dos índices densos
+
+    A ordem dos vizinhos em cada linha é preservada, pois define a ordem de
+    inundação do roteador. O grafo networkx só é montado quando `grafo` é
+    acessado (para algoritmos que só existem no networkx).
+    """
+
+    def __init__(self, posicoes, indptr, indices, tipos, rotulos, raio_comunicacao=None, grafo=None):
+        self.posicoes = np.asarray(posicoes, dtype=np.float64).reshape(-1, 2)
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int32)
+        self.tipos = np.asarray(tipos, dtype=np.uint8)
+        self.rotulos = list(rotulos)
+        self.raio_comunicacao = raio_comunicacao
+        self._grafo = grafo
+        self._indice_por_rotulo = None
+        self._vizinhos = None
+        self._metricas_estruturais = None  # Ver metricas_estruturais.metricas_de
+
+    @classmethod
+    def de_arestas(cls, posicoes, arestas, tipos, rotulos, raio_comunicacao=None):
+        """
+        Cria a topologia a partir de uma lista de arestas (m, 2) de índices densos.
+
+        Cada linha do CSR recebe os vizinhos na ordem em que aparecem nas arestas,
+        o mesmo comportamento de `nx.Graph.add_edges_from`.
+        """
+        n = len(rotulos)
+        arestas = np.asarray(arestas, dtype=np.int64).reshape(-1, 2)
+        origem = np.concatenate((arestas[:, 0], arestas[:, 1]))
+        destino = np.concatenate((arestas[:, 1], arestas[:, 0]))
+        # A posição de cada meia-aresta na lista intercalada (u->v, v->u, ...) é a ordem de inserção
+        ordem_insercao = np.concatenate((np.arange(len(arestas)) * 2, np.arange(len(arestas)) * 2 + 1))
+        ordem = np.lexsort((ordem_insercao, origem))
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(origem, minlength=n), out=indptr[1:])
+        return cls(posicoes, indptr, destino[ordem], tipos, rotulos, raio_comunicacao)
+
+    @classmethod
+    def de_grafo(cls, G):
+        """Converte um grafo networkx, preservando a ordem dos nós e dos vizinhos."""
+        rotulos = list(G.nodes())
+        indice = {rotulo: i for i, rotulo in enumerate(rotulos)}
+        n = len(rotulos)
+        posicoes = np.zeros((n, 2), dtype=np.float64)
+        tipos = np.zeros(n, dtype=np.uint8)
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        indices = []
+        raio = None
+        for i, (rotulo, vizinhos) in enumerate(G.adjacency()):
+            dados = G.nodes[rotulo]
+            if 'pos' in dados:
+                posicoes[i] = dados['pos']
+            tipos[i] = _TIPO_PARA_CODIGO.get(dados.get('type'), TIPO_SENSOR)
+            raio = dados.get('raio_comunicacao', raio)
+            indices.extend(indice[v] for v in vizinhos)
+            indptr[i + 1] = len(indices)
+        topologia = cls(posicoes, indptr, indices, tipos, rotulos, raio, grafo=G)
+        topologia._indice_por_rotulo = indice
+        return topologia
+
+    def __getstate__(self):
+        # O grafo networkx, as listas de vizinhos e as métricas são derivados; não vale a pena serializá-los
+        estado = self.__dict__.copy()
+        estado.update(_grafo=None, _indice_por_rotulo=None, _vizinhos=None, _metricas_estruturais=None)
+        return estado
+
+    def salvar(self, caminho):
+        """Grava a topologia em um arquivo .npz (sem pickle)."""
+        np.savez(
+            caminho,
+            posicoes=self.posicoes, indptr=self.indptr, indices=self.indices, tipos=self.tipos,
+            rotulos=np.array(json.dumps(self.rotulos)),
+            raio_comunicacao=np.array(json.dumps(self.raio_comunicacao))
+        )
+
+    @classmethod
+    def carregar(cls, caminho):
+        """Lê uma topologia gravada com `salvar`."""
+        with np.load(caminho, allow_pickle=False) as dados:
+            return cls(
+                dados['posicoes'], dados['indptr'], dados['indices'], dados['tipos'],
+                json.loads(str(dados['rotulos'])), json.loads(str(dados['raio_comunicacao']))
+            )
+
+    @property
+    def num_nos(self):
+        return len(self.rotulos)
+
+    @property
+    def num_arestas(self):
+        return len(self.indices) // 2
+
+    @property
+    def graus(self):
+        return np.diff(self.indptr)
+
+    @property
+    def indice_por_rotulo(self):
+        """Dicionário rótulo original -> índice denso (montado sob demanda)."""
+        if self._indice_por_rotulo is None:
+            self._indice_por_rotulo = {rotulo: i for i, rotulo in enumerate(self.rotulos)}
+        return self._indice_por_rotulo
+
+    def vizinhos(self, i):
+        return self.indices[self.indptr[i]:self.indptr[i + 1]]
+
+    def listas_de_vizinhos(self):
+        """Vizinhos de cada nó como listas de ints Python, para os laços quentes da simulação."""
+        if self._vizinhos is None:
+            indices = self.indices.tolist()
+            limites = self.indptr.tolist()
+            self._vizinhos = [indices[limites[i]:limites[i + 1]] for i in range(self.num_nos)]
+        return self._vizinhos
+
+    def arestas(self):
+        """Array (m, 2) com cada aresta uma única vez (u < v), em ordem de linha do CSR."""
+        origem = np.repeat(np.arange(self.num_nos, dtype=np.int32), self.graus)
+        mascara = origem < self.indices
+        return np.stack((origem[mascara], self.indices[mascara]), axis=1)
+
+    def sem_no(self, i):
+        """Nova topologia sem o nó de índice `i`; os demais mantêm a ordem (como `G.remove_node`)."""
+        manter = np.ones(self.num_nos, dtype=bool)
+        manter[i] = False
+        mapa = np.cumsum(manter) - 1
+        origem = np.repeat(np.arange(self.num_nos), self.graus)
+        mascara = manter[origem] & manter[self.indices]
+        indptr = np.zeros(self.num_nos, dtype=np.int64)
+        np.cumsum(np.bincount(mapa[origem[mascara]], minlength=self.num_nos - 1), out=indptr[1:])
+        rotulos = self.rotulos[:i] + self.rotulos[i + 1:]
+        return Topologia(self.posicoes[manter], indptr, mapa[self.indices[mascara]], self.tipos[manter], rotulos,
+                         self.raio_comunicacao)
+
+    def sem_aresta(self, u, v):
+        """Nova topologia sem a aresta entre os índices `u` e `v` (como `G.remove_edge`)."""
+        origem = np.repeat(np.arange(self.num_nos), self.graus)
+        removida = ((origem == u) & (self.indices == v)) | ((origem == v) & (self.indices == u))
+        if not removida.any():
+            raise ValueError(f"Aresta inexistente: {self.rotulos[u]} - {self.rotulos[v]}")
+        indptr = np.zeros(self.num_nos + 1, dtype=np.int64)
+        np.cumsum(np.bincount(origem[~removida], minlength=self.num_nos), out=indptr[1:])
+        return Topologia(self.posicoes, indptr, self.indices[~removida], self.tipos, self.rotulos,
+                         self.raio_comunicacao)
+
+    def indices_do_tipo(self, tipo):
+        return np.flatnonzero(self.tipos == tipo)
+
+    def rotulos_de(self, indices):
+        return [self.rotulos[i] for i in indices]
+
+    def para_dicionario(self, valores):
+        """Converte um array por nó em um dicionário {rótulo: valor}, como o networkx retorna."""
+        return dict(zip(self.rotulos, np.asarray(valores).tolist()))
+
+    @property
+    def grafo(self):
+        """Grafo networkx equivalente, construído apenas no primeiro acesso."""
+        if self._grafo is None:
+            G = nx.Graph()
+            for i, rotulo in enumerate(self.rotulos):
+                dados = {'id': rotulo, 'pos': tuple(self.posicoes[i].tolist()),
+                         'type': _CODIGO_PARA_TIPO[int(self.tipos[i])]}
+                if self.raio_comunicacao is not None:
+                    dados['raio_comunicacao'] = self.raio_comunicacao
+                G.add_node(rotulo, **dados)
+            rotulos = self.rotulos
+            G.add_edges_from((rotulos[u], rotulos[v]) for u, v in self.arestas().tolist())
+            self._grafo = G
+        return self._grafo
@@ -0,0 +1,154 @@
+import hashlib
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from cache_resultados import chave_do_cenario, executar_cenario
+from network_generator import GERADORES
+from replicacao import METRICAS_DE_REPLICA
+from telemetria import resolver_telemetria
+
+# Parâmetros da varredura que vão para executar_simulacao; os demais vão para o gerador
+PARAMETROS_DA_SIMULACAO = ('tempo_simulacao', 'protocolo', 'modo', 'motor', 'metricas_estruturais', 'aproximacao',
+                            'orcamento_conectividade', 'telemetria', 'energia')
+
+def pontos_em_grade(espaco):
+    """
+    Produto cartesiano de um espaço {parâmetro: lista de valores}.
+
+    A ordem dos pontos é determinística (a ordem das chaves e dos valores).
+    """
+    nomes = list(espaco)
+    return [dict(zip(nomes, valores)) for valores in itertools.product(*(espaco[nome] for nome in nomes))]
+
+def pontos_hipercubo_latino(espaco, num_pontos, semente=0):
+    """
+    Amostragem por hipercubo latino de um espaço {parâmetro: (mínimo, máximo)}.
+
+    Cada intervalo é dividido em `num_pontos` estratos e cada estrato é usado
+    exatamente uma vez por parâmetro. Se mínimo e máximo são inteiros, o
+    parâmetro é sorteado entre os inteiros do intervalo fechado.
+    """
+    rng = np.random.default_rng(semente)
+    colunas = {}
+    for nome, (minimo, maximo) in espaco.items():
+        u = (rng.permutation(num_pontos) + rng.random(num_pontos)) / num_pontos
+        if isinstance(minimo, int) and isinstance(maximo, int):
+            colunas[nome] = np.minimum(minimo + np.floor(u * (maximo - minimo + 1)), maximo).astype(int).tolist()
+        else:
+            colunas[nome] = (minimo + u * (maximo - minimo)).tolist()
+    return [{nome: colunas[nome][i] for nome in espaco} for i in range(num_pontos)]
+
+def _semente_do_ponto(semente, ponto):
+    """Semente do ponto derivada do seu conteúdo, estável mesmo se a lista de pontos mudar."""
+    resumo = hashlib.sha256(json.dumps(ponto, sort_keys=True).encode('utf-8')).digest()
+    sequencia = np.random.SeedSequence([semente, int.from_bytes(resumo[:8], 'little')])
+    return int(sequencia.generate_state(1, dtype=np.uint64)[0])
+
+def _separar_parametros(base, ponto):
+    params = {**base, **ponto}
+    opcoes = {nome: params.pop(nome) for nome in PARAMETROS_DA_SIMULACAO if nome in params}
+    tempo_simulacao = opcoes.pop('tempo_simulacao', 100)
+    return params, tempo_simulacao, opcoes
+
+def resumo_escalar(metricas):
+    """Métricas escalares de uma execução (as métricas por nó e as listas ficam de fora)."""
+    resumo = {nome: funcao(metricas) for nome, funcao in METRICAS_DE_REPLICA.items()}
+    for nome, valor in metricas.items():
+        if isinstance(valor, (bool, int, float, str)):
+            resumo[nome] = valor
+    return resumo
+
+def _executar_ponto(tipo_rede, params, tempo_simulacao, semente, opcoes):
+    """Executa um ponto da varredura em um processo trabalhador."""
+    _, metricas = executar_cenario(tipo_rede, params, tempo_simulacao, semente, **opcoes)
+    return resumo_escalar(metricas)
+
+def carregar_resultados(arquivo):
+    """Lê os pontos concluídos de um arquivo JSONL, ignorando linhas incompletas."""
+    registros = []
+    if not os.path.exists(arquivo):
+        return registros
+    with open(arquivo, encoding='utf-8') as entrada:
+        for linha in entrada:
+            try:
+                registros.append(json.loads(linha))
+            except json.JSONDecodeError:
+                continue  # Escrita interrompida no meio da linha
+    return registros
+
+def _descartar_linha_incompleta(arquivo):
+    """Corta o final do arquivo após a última quebra de linha (resto de uma escrita interrompida)."""
+    if not os.path.exists(arquivo):
+        return
+    with open(arquivo, 'rb+') as entrada:
+        conteudo = entrada.read()
+        if conteudo and not conteudo.endswith(b'\n'):
+            entrada.truncate(conteudo.rfind(b'\n') + 1)
+
+def executar_varredura(tipo_rede, base, pontos, arquivo, semente=0, processos=None, relatorio=print):
+    """
+    Executa uma varredura de parâmetros em paralelo, gravando cada ponto ao terminar.
+
+    `base` tem os parâmetros fixos do gerador (e opcionalmente tempo_simulacao,
+    protocolo, modo, motor, metricas_estruturais, aproximacao, orcamento_conectividade ou energia) e `pontos` é uma lista de dicionários que os
+    sobrescrevem (ver pontos_em_grade e pontos_hipercubo_latino). Com
+    'telemetria' em `base`, cada ponto grava a sua em um subdiretório com o
+    nome da chave do cenário (a telemetria não entra na chave).
+
+    Cada ponto concluído vira uma linha do arquivo JSONL `arquivo` com o ponto,
+    a semente, a chave do cenário e o resumo escalar das métricas. Ao rodar de
+    novo com o mesmo arquivo, os pontos já gravados são pulados, então uma
+    varredura interrompida continua de onde parou (a chave inclui a versão do
+    código, então pontos gravados por outra versão são refeitos). `relatorio` recebe uma linha
+    de progresso (vazão e tempo estimado restante) a cada ponto.
+
+    Retorna a lista de registros de todos os pontos, na ordem de `pontos`.
+    """
+    if tipo_rede not in GERADORES:
+        raise ValueError(f"Tipo de rede desconhecido: {tipo_rede}")
+
+    tarefas = []
+    for ponto in pontos:
+        params, tempo_simulacao, opcoes = _separar_parametros(base, ponto)
+        telemetria = resolver_telemetria(opcoes.pop('telemetria', None))
+        semente_ponto = _semente_do_ponto(semente, ponto)
+        chave = chave_do_cenario(tipo_rede, params, semente_ponto, tempo_simulacao, opcoes)
+        if telemetria is not None:
+            opcoes['telemetria'] = {**telemetria, 'diretorio': os.path.join(telemetria['diretorio'], chave)}
+        tarefas.append((chave, ponto, params, tempo_simulacao, semente_ponto, opcoes))
+
+    concluidos = {registro['chave']: registro for registro in carregar_resultados(arquivo)}
+    pendentes = [tarefa for tarefa in tarefas if tarefa[0] not in concluidos]
+    total = len(pendentes)
+    if relatorio and len(tarefas) > total:
+        relatorio(f"Retomando: {len(tarefas) - total} de {len(tarefas)} pontos já concluídos")
+
+    if pendentes:
+        _descartar_linha_incompleta(arquivo)
+        inicio = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=processos) as executor, \
+                open(arquivo, 'a', encoding='utf-8') as saida:
+            futuros = {
+                executor.submit(_executar_ponto, tipo_rede, params, tempo_simulacao, semente_ponto, opcoes):
+                    (chave, ponto, semente_ponto)
+                for chave, ponto, params, tempo_simulacao, semente_ponto, opcoes in pendentes
+            }
+            for feitos, futuro in enumerate(as_completed(futuros), start=1):
+                chave, ponto, semente_ponto = futuros[futuro]
+                registro = {'chave': chave, 'ponto': ponto, 'semente': semente_ponto, 'resultado': futuro.result()}
+                saida.write(json.dumps(registro, default=repr) + '\n')
+                saida.flush()
+                os.fsync(saida.fileno())
+                concluidos[chave] = registro
+                if relatorio:
+                    decorrido = time.perf_counter() - inicio
+                    vazao = feitos / decorrido
+                    restante = (total - feitos) / vazao
+                    relatorio(f"[{feitos}/{total}] {vazao:.2f} pontos/s, ETA {restante:.0f}s")
+
+    return [concluidos[tarefa[0]] for tarefa in tarefas]
@@ -3,21 +3,28 @@ import plotly.express as px
 from plotly.subplots import make_subplots
 import networkx as nx
 import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
 
+from topologia import Topologia, TIPO_ESTACAO_BASE
+
+def _coordenadas_das_arestas(topologia):
+    """Monta as listas x/y das arestas (separadas por None) direto dos arrays da topologia."""
+    arestas = topologia.arestas()
+    edge_x = np.full(3 * len(arestas), None, dtype=object)
+    edge_y = np.full(3 * len(arestas), None, dtype=object)
+    edge_x[0::3] = topologia.posicoes[arestas[:, 0], 0].tolist()
+    edge_x[1::3] = topologia.posicoes[arestas[:, 1], 0].tolist()
+    edge_y[0::3] = topologia.posicoes[arestas[:, 0], 1].tolist()
+    edge_y[1::3] = topologia.posicoes[arestas[:, 1], 1].tolist()
+    return edge_x.tolist(), edge_y.tolist()
+
 def plotar_rede(G):
     """
     Cria e retorna uma figura Plotly interativa da topologia da rede.
     """
-    pos = nx.get_node_attributes(G, 'pos')
-    
-    edge_x = []
-    edge_y = []
-    for edge in G.edges():
-        x0, y0 = pos[edge[0]]
-        x1, y1 = pos[edge[1]]
-        edge_x.extend([x0, x1, None])
-        edge_y.extend([y0, y1, None])
+    topologia = G if isinstance(G, Topologia) else Topologia.de_grafo(G)
+    edge_x, edge_y = _coordenadas_das_arestas(topologia)
 
     edge_trace = go.Scatter(
         x=edge_x, y=edge_y,
@@ -31,28 +38,25 @@ def plotar_rede(G):
     sensor_adjacencies = []
     base_adjacencies = []
 
-    # Obter adjacências para calcular tamanho dos nós
-    node_adjacencies_dict = {}
-    for node, adjacencies in G.adjacency():
-        node_adjacencies_dict[node] = len(adjacencies)
+    graus = topologia.graus.tolist()
+    posicoes = topologia.posicoes.tolist()
+    tipos = topologia.tipos.tolist()
 
-    for node in G.nodes():
-        x, y = pos[node]
-        node_info = f"ID: {node}<br>"
-        node_info += f"Tipo: {G.nodes[node].get('type', 'sensor')}"
+    for i, node in enumerate(topologia.rotulos):
+        x, y = posicoes[i]
         
-        if G.nodes[node].get('type') == 'base_station':
+        if tipos[i] == TIPO_ESTACAO_BASE:
             base_x.append(x)
             base_y.append(y)
-            base_text.append(node_info)
+            base_text.append(f"ID: {node}<br>Tipo: base_station")
             base_customdata.append(node)
-            base_adjacencies.append(node_adjacencies_dict[node])
+            base_adjacencies.append(graus[i])
         else:
             sensor_x.append(x)
             sensor_y.append(y)
-            sensor_text.append(node_info)
+            sensor_text.append(f"ID: {node}<br>Tipo: sensor")
             sensor_customdata.append(node)
-            sensor_adjacencies.append(node_adjacencies_dict[node])
+            sensor_adjacencies.append(graus[i])
 
     # Trace para sensores
     sensor_trace = go.Scatter(
@@ -126,7 +130,8 @@ def plotar_metricas(metrics):
 
     # Gráfico de Latência
     if metrics.get('latencias'):
-        axes[0].hist(metrics['latencias'], bins=20, color='skyblue')
+        valores, contagens = metrics['latencias'].histograma()
+        axes[0].hist(valores, weights=contagens, bins=20, color='skyblue')
         axes[0].set_title("Distribuição de Latência")
         axes[0].set_xlabel("Latência")
         axes[0].set_ylabel("Frequência")
@@ -136,7 +141,8 @@ def plotar_metricas(metrics):
 
     # Gráfico de Saltos
     if metrics.get('contagens_de_saltos'):
-        axes[1].hist(metrics['contagens_de_saltos'], bins=10, color='lightgreen')
+        valores, contagens = metrics['contagens_de_saltos'].histograma()
+        axes[1].hist(valores, weights=contagens, bins=10, color='lightgreen')
         axes[1].set_title("Distribuição de Saltos")
         axes[1].set_xlabel("Número de Saltos")
         axes[1].set_ylabel("Frequência")
@@ -177,28 +183,20 @@ def plotar_metricas_interativo(metrics):
         specs=[[{"type": "histogram"}, {"type": "histogram"}, {"type": "bar"}]]
     )
     
-    # Gráfico de Latência - limitado a 1000 pontos para performance
+    # Gráfico de Latência - a partir do histograma já acumulado (um ponto por compartimento)
     if metrics.get('latencias'):
-        latencias = metrics['latencias']
-        if len(latencias) > 1000:
-            import random
-            latencias = random.sample(latencias, 1000)
-        
+        valores, contagens = metrics['latencias'].histograma()
         fig.add_trace(
-            go.Histogram(x=latencias, name='Latência', 
+            go.Histogram(x=valores, y=contagens, histfunc='sum', name='Latência',
                         marker_color='skyblue', showlegend=False, nbinsx=20),
             row=1, col=1
         )
     
-    # Gráfico de Saltos - limitado a 1000 pontos
+    # Gráfico de Saltos
     if metrics.get('contagens_de_saltos'):
-        saltos = metrics['contagens_de_saltos']
-        if len(saltos) > 1000:
-            import random
-            saltos = random.sample(saltos, 1000)
-            
+        valores, contagens = metrics['contagens_de_saltos'].histograma()
         fig.add_trace(
-            go.Histogram(x=saltos, name='Saltos',
+            go.Histogram(x=valores, y=contagens, histfunc='sum', name='Saltos',
                         marker_color='lightgreen', showlegend=False, nbinsx=15),
             row=1, col=2
         )
@@ -336,29 +334,26 @@ def plotar_rede_com_pontos_criticos(G, metricas):
     """
     Cria uma visualização otimizada da rede destacando pontos de articulação.
     """
-    pos = nx.get_node_attributes(G, 'pos')
+    topologia = G if isinstance(G, Topologia) else Topologia.de_grafo(G)
     pontos_articulacao = set(metricas.get('pontos_articulacao', []))
     
     # Arestas - simplificadas
-    edge_x = []
-    edge_y = []
-    for edge in G.edges():
-        x0, y0 = pos[edge[0]]
-        x1, y1 = pos[edge[1]]
-        edge_x.extend([x0, x1, None])
-        edge_y.extend([y0, y1, None])
+    edge_x, edge_y = _coordenadas_das_arestas(topologia)
 
     # Separar nós em apenas 3 categorias para simplificar
     normal_x, normal_y, normal_text = [], [], []
     base_x, base_y, base_text = [], [], []
     critico_x, critico_y, critico_text = [], [], []
 
-    for node in G.nodes():
-        x, y = pos[node]
-        grau = G.degree(node)
-        node_info = f"ID: {node}<br>Grau: {grau}"
+    graus = topologia.graus.tolist()
+    posicoes = topologia.posicoes.tolist()
+    tipos = topologia.tipos.tolist()
+
+    for i, node in enumerate(topologia.rotulos):
+        x, y = posicoes[i]
+        node_info = f"ID: {node}<br>Grau: {graus[i]}"
         
-        is_base = G.nodes[node].get('type') == 'base_station'
+        is_base = tipos[i] == TIPO_ESTACAO_BASE
         is_critical = node in pontos_articulacao
         
         if is_critical: